@@ -14,9 +14,17 @@
 
 from . import exceptions
 from .supertokens import Supertokens
-from .recipe import session
 from typing import List, Union, Literal, Callable
 from .supertokens import SupertokensConfig, InputAppInfo, AppInfo
+from .delivery_queue import DeliveryConfig, SQLiteDeliverySpool
+from .json_codec import JSONCodec, JSONCodecName
+from .bulkhead import BulkheadConfig
+from .retry_policy import TimeoutConfig, RetryConfig, core_deadline
+from .hedging import HedgingConfig
+from .host_discovery import HostProvider, StaticHostProvider, DNSHostProvider, FileHostProvider
+from .sharding import ShardingConfig, ShardRouter, HashShardRouter, MappedShardRouter, core_shard_key
+from .instrumentation import Instrumentation, CoreCall, PrometheusInstrumentation, OpenTelemetryInstrumentation
+from .rate_limit import RateLimitConfig, RateLimitRule, RateLimitStore, InMemoryRateLimitStore, SQLiteRateLimitStore
 from .recipe_module import RecipeModule
 
 
@@ -25,9 +33,21 @@ def init(app_info: InputAppInfo,
          supertokens_config: SupertokensConfig,
          recipe_list: List[Callable[[AppInfo], RecipeModule]],
          mode: Union[Literal['asgi', 'wsgi'], None] = None,
-         telemetry: Union[bool, None] = None):
-    return Supertokens.init(app_info, framework, supertokens_config, recipe_list, mode, telemetry)
+         telemetry: Union[bool, None] = None,
+         delivery: Union[DeliveryConfig, None] = None,
+         json_codec: Union[JSONCodec, JSONCodecName, None] = None,
+         rate_limit: Union[RateLimitConfig, None] = None):
+    return Supertokens.init(app_info, framework, supertokens_config, recipe_list, mode, telemetry, delivery,
+                            json_codec, rate_limit)
 
 
 def get_all_cors_headers():
     return Supertokens.get_instance().get_all_cors_headers()
+
+
+def __getattr__(name):
+    # recipes are imported on first use instead of with the package
+    if name == 'session':
+        from .recipe import session
+        return session
+    raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
@@ -12,12 +12,14 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 from supertokens_python import Supertokens
-from typing import Union, List
+from typing import Union, List, AsyncIterator, IO, Dict, Callable
 try:
     from typing import Literal
 except ImportError:
     from typing_extensions import Literal
-from supertokens_python.types import UsersResponse
+from supertokens_python.types import UsersResponse, User
+from supertokens_python.pagination import DEFAULT_BUFFER_SIZE
+from supertokens_python.batch import BatchResult, DEFAULT_BATCH_CONCURRENCY
 
 
 async def get_users_oldest_first(limit: Union[int, None] = None, pagination_token: Union[str, None] = None,
@@ -30,9 +32,41 @@ async def get_users_newest_first(limit: Union[int, None] = None, pagination_toke
     return await Supertokens.get_instance().get_users('DESC', limit, pagination_token, include_recipe_ids)
 
 
+def iter_users(time_joined_order: Literal['ASC', 'DESC'] = 'ASC', page_size: Union[int, None] = None,
+               include_recipe_ids: List[str] = None, buffer_size: int = DEFAULT_BUFFER_SIZE) -> AsyncIterator[User]:
+    return Supertokens.get_instance().iter_users(time_joined_order, page_size, include_recipe_ids, buffer_size)
+
+
+async def export_users(output: Union[str, IO[str]], export_format: Literal['ndjson', 'csv'] = 'ndjson',
+                       time_joined_order: Literal['ASC', 'DESC'] = 'ASC', page_size: Union[int, None] = None,
+                       include_recipe_ids: List[str] = None, pagination_token: Union[str, None] = None,
+                       resume_file: Union[str, None] = None, compress: Union[bool, None] = None) -> int:
+    from supertokens_python import export
+    return await export.export_users(output, export_format, time_joined_order, page_size, include_recipe_ids,
+                                     pagination_token, resume_file, compress)
+
+
+async def import_users(input_file: Union[str, IO[str]], input_format: Union[Literal['ndjson', 'csv'], None] = None,
+                       results: Union[str, IO[str], None] = None, checkpoint_file: Union[str, None] = None,
+                       concurrency: int = 10, requests_per_second: Union[float, None] = None,
+                       default_recipe_id: Union[str, None] = None) -> Dict[str, int]:
+    from supertokens_python import bulk_import
+    return await bulk_import.import_users(input_file, input_format, results, checkpoint_file, concurrency,
+                                          requests_per_second, default_recipe_id)
+
+
 async def get_user_count(include_recipe_ids: List[str] = None) -> int:
     return await Supertokens.get_instance().get_user_count(include_recipe_ids)
 
 
 async def delete_user(user_id: str) -> None:
     return await Supertokens.get_instance().delete_user(user_id)
+
+
+async def delete_users(user_ids: List[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                       on_progress: Union[Callable[[int, int], None], None] = None) -> BatchResult:
+    return await Supertokens.get_instance().delete_users(user_ids, concurrency, on_progress)
+
+
+async def shutdown() -> None:
+    return await Supertokens.get_instance().shutdown()
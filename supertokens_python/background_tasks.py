@@ -0,0 +1,184 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import asyncio
+import atexit
+from concurrent.futures import Future, wait as wait_for_futures
+from threading import Thread, Lock
+from typing import Awaitable, Callable, Dict, Set, Union
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+from weakref import WeakKeyDictionary
+
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_SHUTDOWN_TIMEOUT_SECONDS = 5
+
+
+class BackgroundTaskSupervisor:
+    """
+    Runs fire-and-forget coroutines (telemetry, handshake prefetch, ...) off the
+    request / startup path.
+
+    In 'asgi' mode (or without a mode) work scheduled from inside a running event
+    loop goes on that loop. Otherwise, and always in 'wsgi' mode, where the running
+    loop is the one of a `sync()` call that stops with the request, it is handed to
+    a daemon thread that owns its own loop. In
+    both cases the supervisor keeps a strong reference to every scheduled task
+    until it finishes, so tasks cannot be garbage collected mid-flight, and at
+    most `max_concurrency` of them run at the same time per loop.
+    """
+    __instance = None
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        # task -> the loop it runs on
+        self.__tasks: Dict[asyncio.Task, asyncio.AbstractEventLoop] = {}
+        self.__futures: Set[Future] = set()
+        self.__semaphores = WeakKeyDictionary()
+        self.__lock = Lock()
+        self.__loop: Union[asyncio.AbstractEventLoop, None] = None
+        self.__thread: Union[Thread, None] = None
+        self.__closed = False
+
+    @staticmethod
+    def get_instance() -> BackgroundTaskSupervisor:
+        if BackgroundTaskSupervisor.__instance is None:
+            BackgroundTaskSupervisor.__instance = BackgroundTaskSupervisor()
+            atexit.register(BackgroundTaskSupervisor.__instance.drain)
+        return BackgroundTaskSupervisor.__instance
+
+    @staticmethod
+    def reset():
+        instance = BackgroundTaskSupervisor.__instance
+        BackgroundTaskSupervisor.__instance = None
+        if instance is not None:
+            atexit.unregister(instance.drain)
+            instance.drain(0)
+
+    def pending_count(self) -> int:
+        return len(self.__tasks) + len(self.__futures)
+
+    def schedule(self, func: Callable[[], Awaitable],
+                 mode: Union[Literal['asgi', 'wsgi'], None] = None) -> Union[asyncio.Task, Future, None]:
+        """
+        Returns the task (or, on the background thread, the future) running `func`, or None
+        if the supervisor is shut down and `func` will not run.
+        """
+        if self.__closed:
+            return None
+        loop = None
+        if mode != 'wsgi':
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+
+        if loop is not None:
+            task = loop.create_task(self.__run(func))
+            self.__tasks[task] = loop
+            task.add_done_callback(self.__discard_task)
+            return task
+        future = asyncio.run_coroutine_threadsafe(self.__run(func), self.get_thread_loop())
+        with self.__lock:
+            self.__futures.add(future)
+        future.add_done_callback(self.__discard_future)
+        return future
+
+    async def shutdown(self, timeout: Union[float, None] = DEFAULT_SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        """
+        Waits (up to `timeout` seconds) for the tasks scheduled on the current
+        loop and on the background thread, then cancels whatever is left.
+        """
+        loop = asyncio.get_running_loop()
+        tasks = [task for task, task_loop in list(self.__tasks.items()) if task_loop is loop and not task.done()]
+        if len(tasks) != 0:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+        await loop.run_in_executor(None, self.drain, timeout)
+
+    def drain(self, timeout: Union[float, None] = DEFAULT_SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        """
+        Synchronous counterpart of `shutdown` for the background thread. It is
+        also registered with `atexit` so that WSGI apps flush pending work.
+        """
+        self.__closed = True
+        with self.__lock:
+            futures = list(self.__futures)
+            loop = self.__loop
+            thread = self.__thread
+            self.__loop = None
+            self.__thread = None
+
+        if len(futures) != 0:
+            _, pending = wait_for_futures(futures, timeout=timeout)
+            for future in pending:
+                future.cancel()
+
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout)
+
+    async def __run(self, func: Callable[[], Awaitable]):
+        async with self.__get_semaphore(asyncio.get_running_loop()):
+            try:
+                await func()
+            except Exception:
+                pass
+
+    def __get_semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        semaphore = self.__semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self.__semaphores[loop] = semaphore
+        return semaphore
+
+    def get_thread_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Returns the loop of the background thread, starting the thread if needed.
+        Other long running SDK components (e.g. the delivery queue) run on it too.
+        """
+        with self.__lock:
+            if self.__loop is None:
+                loop = asyncio.new_event_loop()
+                thread = Thread(target=self.__run_thread_loop, args=(loop,),
+                                name='supertokens-background-tasks', daemon=True)
+                self.__loop = loop
+                self.__thread = thread
+                thread.start()
+            return self.__loop
+
+    @staticmethod
+    def __run_thread_loop(loop: asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        finally:
+            loop.close()
+
+    def __discard_task(self, task: asyncio.Task):
+        self.__tasks.pop(task, None)
+
+    def __discard_future(self, future: Future):
+        with self.__lock:
+            self.__futures.discard(future)
@@ -0,0 +1,59 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Union
+
+DEFAULT_BATCH_CONCURRENCY = 10
+
+
+class BatchResult:
+    """
+    Outcome of a batch operation: `results` maps every item that succeeded to what
+    the single-item operation returned, and `errors` maps every item that failed to
+    the exception it raised.
+    """
+
+    def __init__(self, results: Dict[Hashable, Any], errors: Dict[Hashable, Exception]):
+        self.results = results
+        self.errors = errors
+        self.is_ok = len(errors) == 0
+
+
+async def run_batch(items: Iterable[Hashable], func: Callable[[Any], Awaitable[Any]],
+                    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                    on_progress: Union[Callable[[int, int], None], None] = None) -> BatchResult:
+    """
+    Calls `func` once for every distinct item, with at most `concurrency` calls in
+    flight. A failing item does not stop the others. `on_progress(done, total)` is
+    called after every item.
+    """
+    pending = list(dict.fromkeys(items))
+    total = len(pending)
+    results = {}
+    errors = {}
+    iterator = iter(pending)
+
+    async def worker():
+        for item in iterator:
+            try:
+                results[item] = await func(item)
+            except Exception as e:
+                errors[item] = e
+            if on_progress is not None:
+                on_progress(len(results) + len(errors), total)
+
+    await asyncio.gather(*[worker() for _ in range(min(max(concurrency, 1), total))])
+    return BatchResult(results, errors)
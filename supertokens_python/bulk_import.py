@@ -0,0 +1,379 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""
+Imports users into the emailpassword, thirdparty and passwordless recipes from an
+NDJSON or CSV file, using the same columns as `supertokens_python.export` (plus a
+`password` column for emailpassword users and an `emailVerified` column for
+thirdparty users):
+
+    from supertokens_python.syncio import import_users
+
+    init(...)
+    import_users('users.csv.gz', results='import-results.ndjson', checkpoint_file='import.checkpoint',
+                 concurrency=20, requests_per_second=500)
+
+Records are read one at a time, validated with the initialised recipes' own
+validators, deduplicated, and sent to the core with at most `concurrency`
+requests in flight.
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import gzip
+import json
+import os
+from time import monotonic
+from abc import ABC, abstractmethod
+from typing import IO, Any, Dict, Iterator, Set, Tuple, Union
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+from supertokens_python.exceptions import raise_general_exception
+from supertokens_python.supertokens import Supertokens
+
+DEFAULT_CONCURRENCY = 10
+DEFAULT_CHECKPOINT_INTERVAL = 1000
+
+STATUS_OK = 'OK'
+STATUS_ALREADY_EXISTS = 'ALREADY_EXISTS'
+STATUS_DUPLICATE = 'DUPLICATE'
+STATUS_INVALID = 'INVALID'
+STATUS_ERROR = 'ERROR'
+
+STATUSES = [STATUS_OK, STATUS_ALREADY_EXISTS, STATUS_DUPLICATE, STATUS_INVALID, STATUS_ERROR]
+# fields copied from the record to the results log, so that failed records can be found again
+RESULT_FIELDS = ['recipeId', 'email', 'phoneNumber', 'thirdPartyId', 'thirdPartyUserId']
+
+ImportRecord = Dict[str, Any]
+
+
+class RateLimiter:
+    """
+    Spaces out calls to `acquire` so that at most `rate` of them return per second.
+    """
+
+    def __init__(self, rate: Union[float, None]):
+        self.interval = 0 if rate is None or rate <= 0 else 1 / rate
+        self.__next = 0.0
+
+    async def acquire(self):
+        if self.interval == 0:
+            return
+        now = monotonic()
+        wait = self.__next - now
+        self.__next = max(self.__next, now) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def read_records(input_file: Union[str, IO[str]],
+                 input_format: Union[Literal['ndjson', 'csv'], None] = None) -> Iterator[ImportRecord]:
+    """
+    Yields one dict per record. Lines that are not valid JSON are yielded as a
+    string with the parse error so that they keep their position in the file.
+    """
+    if isinstance(input_file, str):
+        if input_format is None:
+            input_format = 'csv' if input_file.endswith(('.csv', '.csv.gz')) else 'ndjson'
+        f = gzip.open(input_file, 'rt', encoding='utf-8', newline='') if input_file.endswith('.gz') else \
+            open(input_file, encoding='utf-8', newline='')
+    else:
+        f = input_file
+        if input_format is None:
+            input_format = 'ndjson'
+
+    try:
+        if input_format == 'csv':
+            for row in csv.DictReader(f):
+                yield {key: value for key, value in row.items() if value is not None and value != ''}
+        else:
+            for line in f:
+                line = line.strip()
+                if line == '':
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield 'Invalid JSON: ' + str(e)
+    finally:
+        if f is not input_file:
+            f.close()
+
+
+def is_true(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', '1', 'yes')
+    return value is True
+
+
+class RecipeImporter(ABC):
+    def __init__(self, recipe):
+        self.recipe = recipe
+
+    @abstractmethod
+    async def prepare(self, record: ImportRecord) -> Tuple[Union[str, None], Union[str, None]]:
+        """
+        Normalises the record in place and returns (the key used to find duplicates,
+        None) if it is valid, or (None, the validation error) otherwise.
+        """
+        pass
+
+    @abstractmethod
+    async def import_user(self, record: ImportRecord) -> Tuple[str, Union[str, None], Union[str, None]]:
+        """
+        Creates the user in the core and returns (status, user id, error).
+        """
+        pass
+
+
+class EmailPasswordImporter(RecipeImporter):
+    def __init__(self, recipe):
+        super().__init__(recipe)
+        # the combined thirdpartyemailpassword recipe keeps the config in its embedded emailpassword recipe
+        email_password_recipe = getattr(recipe, 'email_password_recipe', recipe)
+        validators = {field.id: field.validate for field in email_password_recipe.config.sign_up_feature.form_fields}
+        self.validate_email = validators['email']
+        self.validate_password = validators['password']
+
+    async def prepare(self, record: ImportRecord):
+        email = record.get('email')
+        password = record.get('password')
+        if not isinstance(email, str) or not isinstance(password, str):
+            return None, 'email and password are required'
+        email = email.strip()
+        record['email'] = email
+        error = await self.validate_email(email)
+        if error is None:
+            error = await self.validate_password(password)
+        if error is not None:
+            return None, error
+        return 'emailpassword\n' + email, None
+
+    async def import_user(self, record: ImportRecord):
+        result = await self.recipe.recipe_implementation.sign_up(record['email'], record['password'])
+        if not result.is_ok:
+            return STATUS_ALREADY_EXISTS, None, None
+        return STATUS_OK, result.user.user_id, None
+
+
+class ThirdPartyImporter(RecipeImporter):
+    async def prepare(self, record: ImportRecord):
+        third_party_id = record.get('thirdPartyId')
+        third_party_user_id = record.get('thirdPartyUserId')
+        email = record.get('email')
+        if not isinstance(third_party_id, str) or not isinstance(third_party_user_id, str) or \
+                not isinstance(email, str):
+            return None, 'thirdPartyId, thirdPartyUserId and email are required'
+        record['email'] = email.strip()
+        return 'thirdparty\n' + third_party_id + '\n' + third_party_user_id, None
+
+    async def import_user(self, record: ImportRecord):
+        result = await self.recipe.recipe_implementation.sign_in_up(record['thirdPartyId'],
+                                                                    record['thirdPartyUserId'], record['email'],
+                                                                    is_true(record.get('emailVerified')))
+        if not result.is_ok:
+            return STATUS_INVALID, None, result.error
+        if not result.created_new_user:
+            return STATUS_ALREADY_EXISTS, result.user.user_id, None
+        return STATUS_OK, result.user.user_id, None
+
+
+class PasswordlessImporter(RecipeImporter):
+    def __init__(self, recipe):
+        super().__init__(recipe)
+        self.validate_email = getattr(recipe.config.contact_config, 'validate_email_address', None)
+        self.validate_phone_number = getattr(recipe.config.contact_config, 'validate_phone_number', None)
+
+    async def prepare(self, record: ImportRecord):
+        from supertokens_python.recipe.passwordless.utils import normalise_phone_number
+        email = record.get('email')
+        phone_number = record.get('phoneNumber')
+        if (email is None) == (phone_number is None):
+            return None, 'Please provide exactly one of email or phoneNumber'
+
+        if email is not None:
+            if self.validate_email is None:
+                return None, 'The passwordless recipe is not configured to use emails'
+            email = record['email'] = email.strip()
+            error = await self.validate_email(email)
+            key = 'passwordless\nemail\n' + email
+        else:
+            if self.validate_phone_number is None:
+                return None, 'The passwordless recipe is not configured to use phone numbers'
+            error = await self.validate_phone_number(phone_number)
+            phone_number = record['phoneNumber'] = normalise_phone_number(phone_number)
+            key = 'passwordless\nphone\n' + phone_number
+        if error is not None:
+            return None, error
+        return key, None
+
+    async def import_user(self, record: ImportRecord):
+        recipe_implementation = self.recipe.recipe_implementation
+        code = await recipe_implementation.create_code(email=record.get('email'),
+                                                       phone_number=record.get('phoneNumber'))
+        result = await recipe_implementation.consume_code(code.pre_auth_session_id, link_code=code.link_code)
+        if not result.is_ok:
+            return STATUS_ERROR, None, result.status
+        if not result.created_new_user:
+            return STATUS_ALREADY_EXISTS, result.user.user_id, None
+        return STATUS_OK, result.user.user_id, None
+
+
+# recipeId in the record -> (recipes that can import it, importer)
+IMPORTERS = {
+    'emailpassword': (['emailpassword', 'thirdpartyemailpassword'], EmailPasswordImporter),
+    'thirdparty': (['thirdparty', 'thirdpartyemailpassword'], ThirdPartyImporter),
+    'passwordless': (['passwordless'], PasswordlessImporter),
+}
+
+
+def get_importer(recipe_id: str) -> Union[RecipeImporter, None]:
+    if recipe_id not in IMPORTERS:
+        return None
+    recipe_ids, importer = IMPORTERS[recipe_id]
+    for recipe in Supertokens.get_instance().recipe_modules:
+        if recipe.get_recipe_id() in recipe_ids:
+            return importer(recipe)
+    return None
+
+
+async def import_users(input_file: Union[str, IO[str]], input_format: Union[Literal['ndjson', 'csv'], None] = None,
+                       results: Union[str, IO[str], None] = None, checkpoint_file: Union[str, None] = None,
+                       concurrency: int = DEFAULT_CONCURRENCY, requests_per_second: Union[float, None] = None,
+                       default_recipe_id: Union[str, None] = None,
+                       checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL) -> Dict[str, int]:
+    """
+    Imports the users in `input_file` (a path or a text file-like object, gzipped if the
+    path ends in .gz) and returns how many records ended with each status. Records
+    without a recipeId use `default_recipe_id`.
+
+    Every record gets a line in `results` (a path or a text file-like object) with its
+    position in the input, status, user id and error. Passwords are never logged.
+
+    If `checkpoint_file` is given, the number of leading records that are done is saved to
+    it every `checkpoint_interval` records, and an import started with the same checkpoint
+    file skips them (appending to `results`). Records that were in flight when the import
+    stopped are sent again, and come back as ALREADY_EXISTS if they had made it to the core.
+    The checkpoint file is removed once the import completes.
+    """
+    if concurrency < 1:
+        raise_general_exception('concurrency must be at least 1')
+
+    start = 0
+    if checkpoint_file is not None and os.path.exists(checkpoint_file):
+        with open(checkpoint_file) as f:
+            start = int(f.read().strip() or 0)
+
+    output = results
+    if isinstance(results, str):
+        output = open(results, 'a' if start > 0 else 'w', encoding='utf-8')
+
+    counts = {status: 0 for status in STATUSES}
+    importers: Dict[str, Union[RecipeImporter, None]] = {}
+    seen: Set[str] = set()
+    semaphore = asyncio.Semaphore(concurrency)
+    rate_limiter = RateLimiter(requests_per_second)
+    tasks: Set[asyncio.Task] = set()
+    finished: Set[int] = set()
+    done = start
+    saved = start
+
+    def save_checkpoint():
+        nonlocal saved
+        if output is not None:
+            output.flush()
+        with open(checkpoint_file, 'w') as checkpoint:
+            checkpoint.write(str(done))
+        saved = done
+
+    def add_result(index: int, record: ImportRecord, status: str, user_id: Union[str, None] = None,
+                   error: Union[str, None] = None):
+        nonlocal done
+        counts[status] += 1
+        if output is not None:
+            result = {'index': index, 'status': status}
+            result.update((field, record[field]) for field in RESULT_FIELDS if record.get(field) is not None)
+            if user_id is not None:
+                result['userId'] = user_id
+            if error is not None:
+                result['error'] = error
+            output.write(json.dumps(result, separators=(',', ':')) + '\n')
+
+        finished.add(index)
+        while done in finished:
+            finished.remove(done)
+            done += 1
+        if checkpoint_file is not None and done - saved >= checkpoint_interval:
+            save_checkpoint()
+
+    async def send(index: int, record: ImportRecord, importer: RecipeImporter):
+        try:
+            status, user_id, error = await importer.import_user(record)
+        except Exception as e:
+            status, user_id, error = STATUS_ERROR, None, str(e)
+        finally:
+            semaphore.release()
+        add_result(index, record, status, user_id, error)
+
+    completed = False
+    try:
+        for index, record in enumerate(read_records(input_file, input_format)):
+            if index < start:
+                continue
+            if not isinstance(record, dict):
+                add_result(index, {}, STATUS_INVALID, error=record if isinstance(record, str) else 'Not an object')
+                continue
+
+            recipe_id = record.get('recipeId', default_recipe_id)
+            if recipe_id not in importers:
+                importers[recipe_id] = get_importer(recipe_id)
+            importer = importers[recipe_id]
+            if importer is None:
+                add_result(index, record, STATUS_INVALID,
+                           error='No initialised recipe can import users of recipe ' + str(recipe_id))
+                continue
+
+            key, error = await importer.prepare(record)
+            if error is not None:
+                add_result(index, record, STATUS_INVALID, error=error)
+            elif key in seen:
+                add_result(index, record, STATUS_DUPLICATE)
+            else:
+                seen.add(key)
+                await semaphore.acquire()
+                await rate_limiter.acquire()
+                task = asyncio.get_running_loop().create_task(send(index, record, importer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+        if len(tasks) != 0:
+            await asyncio.gather(*tasks)
+        completed = True
+    finally:
+        for task in list(tasks):
+            task.cancel()
+        if checkpoint_file is not None and not completed:
+            save_checkpoint()
+        if output is not results:
+            output.close()
+        elif output is not None:
+            output.flush()
+
+    if checkpoint_file is not None and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    return counts
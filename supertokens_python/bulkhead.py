@@ -0,0 +1,208 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from threading import Lock
+from typing import Dict, List, Union
+
+from .constants import USER_COUNT, USER_DELETE, USERS, TELEMETRY
+from .exceptions import CoreOverloadedError
+
+PRIORITY_CRITICAL = 0
+PRIORITY_DEFAULT = 1
+PRIORITY_BULK = 2
+
+DEFAULT_PATH_PRIORITIES = {
+    '/recipe/session/verify': PRIORITY_CRITICAL,
+    '/recipe/session/refresh': PRIORITY_CRITICAL,
+    '/recipe/handshake': PRIORITY_CRITICAL,
+    '/recipe/users': PRIORITY_BULK,
+    '/recipe/users/count': PRIORITY_BULK,
+    USERS: PRIORITY_BULK,
+    USER_COUNT: PRIORITY_BULK,
+    USER_DELETE: PRIORITY_BULK,
+    TELEMETRY: PRIORITY_BULK
+}
+
+DEFAULT_INITIAL_LIMIT = 20
+DEFAULT_MIN_LIMIT = 2
+DEFAULT_MAX_LIMIT = 100
+DEFAULT_MAX_QUEUE_SIZE = 100
+DEFAULT_QUEUE_TIMEOUT_SECONDS = 5
+DEFAULT_LATENCY_THRESHOLD_SECONDS = 1
+DEFAULT_BACKOFF_RATIO = 0.9
+
+
+class BulkheadConfig:
+    """
+    Limits the requests this process has in flight to the core. Requests over the limit
+    wait in a queue of at most `max_queue_size`, in the order of their priority: session
+    verification / refresh first, user listings, deletions and other bulk operations last
+    (see DEFAULT_PATH_PRIORITIES, which `priorities` extends by core path). When the queue
+    is full, a request either takes the place of a queued request of lower priority or
+    fails with CoreOverloadedError right away, as does a request that waited for
+    `queue_timeout_seconds`.
+
+    If `adaptive` is set, the limit starts at `initial_limit` and follows the latency of
+    the core (AIMD): it grows by one per limit's worth of requests answered within
+    `latency_threshold_seconds` and is multiplied by `backoff_ratio` for each slower one,
+    staying between `min_limit` and `max_limit`.
+    """
+
+    def __init__(self, initial_limit: int = DEFAULT_INITIAL_LIMIT,
+                 min_limit: int = DEFAULT_MIN_LIMIT,
+                 max_limit: int = DEFAULT_MAX_LIMIT,
+                 max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+                 queue_timeout_seconds: Union[float, None] = DEFAULT_QUEUE_TIMEOUT_SECONDS,
+                 adaptive: bool = True,
+                 latency_threshold_seconds: float = DEFAULT_LATENCY_THRESHOLD_SECONDS,
+                 backoff_ratio: float = DEFAULT_BACKOFF_RATIO,
+                 priorities: Union[Dict[str, int], None] = None):
+        if not 0 < min_limit <= initial_limit <= max_limit:
+            raise Exception('the limits must be positive and min_limit <= initial_limit <= max_limit')
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue_size = max_queue_size
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.adaptive = adaptive
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self.backoff_ratio = backoff_ratio
+        self.priorities = {} if priorities is None else priorities
+
+
+class _Waiter:
+    __slots__ = ('loop', 'future', 'granted')
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+
+
+def _wake(waiter: _Waiter, error: Union[Exception, None]):
+    if waiter.future.done():
+        return
+    if error is None:
+        waiter.future.set_result(None)
+    else:
+        waiter.future.set_exception(error)
+
+
+class Bulkhead:
+    """
+    The limiter of a process. It is shared by the event loops of the process (e.g. the
+    threads running syncio functions), so its state is guarded by a lock and waiters are
+    woken up on their own loop.
+    """
+
+    def __init__(self, config: BulkheadConfig):
+        self.config = config
+        self.limit = float(config.initial_limit)
+        self.in_flight = 0
+        self.__priorities = {**DEFAULT_PATH_PRIORITIES, **config.priorities}
+        self.__queues: List[deque] = [deque() for _ in range(max(PRIORITY_BULK, *self.__priorities.values()) + 1)]
+        self.__queued = 0
+        self.__lock = Lock()
+
+    def get_priority(self, path: str) -> int:
+        return self.__priorities.get(path, PRIORITY_DEFAULT)
+
+    def queued_count(self) -> int:
+        return self.__queued
+
+    async def acquire(self, priority: int = PRIORITY_DEFAULT, timeout: Union[float, None] = None) -> None:
+        # timeout shortens queue_timeout_seconds, e.g. to the remaining budget of the request
+        if timeout is None or (self.config.queue_timeout_seconds is not None and
+                               self.config.queue_timeout_seconds < timeout):
+            timeout = self.config.queue_timeout_seconds
+        evicted = None
+        with self.__lock:
+            if self.__queued == 0 and self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return
+            if self.__queued >= self.config.max_queue_size:
+                evicted = self.__evict_lower_than(priority)
+                if evicted is None:
+                    raise CoreOverloadedError('Too many requests to the SuperTokens core are queued in this process')
+            waiter = _Waiter(asyncio.get_running_loop())
+            self.__queues[priority].append(waiter)
+            self.__queued += 1
+        if evicted is not None:
+            evicted.loop.call_soon_threadsafe(_wake, evicted, CoreOverloadedError(
+                'Request to the SuperTokens core was shed for a request of higher priority'))
+
+        try:
+            if timeout is None:
+                await waiter.future
+            else:
+                await asyncio.wait_for(waiter.future, max(timeout, 0))
+        except CoreOverloadedError:
+            raise
+        except asyncio.TimeoutError:
+            self.__abandon(priority, waiter)
+            raise CoreOverloadedError('Timed out waiting to send a request to the SuperTokens core') from None
+        except BaseException:
+            self.__abandon(priority, waiter)
+            raise
+
+    def release(self, latency_seconds: Union[float, None] = None) -> None:
+        with self.__lock:
+            if self.config.adaptive and latency_seconds is not None:
+                if latency_seconds > self.config.latency_threshold_seconds:
+                    self.limit = max(self.config.min_limit, self.limit * self.config.backoff_ratio)
+                else:
+                    self.limit = min(self.config.max_limit, self.limit + 1 / self.limit)
+            self.in_flight -= 1
+            granted = self.__grant()
+        for waiter in granted:
+            waiter.loop.call_soon_threadsafe(_wake, waiter, None)
+
+    def __grant(self) -> List[_Waiter]:
+        # called with the lock held
+        granted = []
+        for queue in self.__queues:
+            while len(queue) != 0 and self.in_flight < int(self.limit):
+                waiter = queue.popleft()
+                waiter.granted = True
+                self.__queued -= 1
+                self.in_flight += 1
+                granted.append(waiter)
+        return granted
+
+    def __evict_lower_than(self, priority: int) -> Union[_Waiter, None]:
+        # called with the lock held: the newest waiter of the lowest priority makes room
+        for queued_priority in range(len(self.__queues) - 1, priority, -1):
+            queue = self.__queues[queued_priority]
+            if len(queue) != 0:
+                self.__queued -= 1
+                return queue.pop()
+        return None
+
+    def __abandon(self, priority: int, waiter: _Waiter) -> None:
+        with self.__lock:
+            if waiter.granted:
+                granted = True
+            else:
+                granted = False
+                try:
+                    self.__queues[priority].remove(waiter)
+                    self.__queued -= 1
+                except ValueError:
+                    pass
+        if granted:
+            # the slot was handed over while the waiter gave up, so it is passed on
+            self.release()
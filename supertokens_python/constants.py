@@ -17,6 +17,7 @@ TELEMETRY = '/telemetry'
 USER_COUNT = '/users/count'
 USER_DELETE = '/user/remove'
 USERS = '/users'
+HELLO = '/hello'
 TELEMETRY_SUPERTOKENS_API_URL = 'https://api.supertokens.io/0/st/telemetry'
 TELEMETRY_SUPERTOKENS_API_VERSION = '2'
 ERROR_MESSAGE_KEY = 'message'
@@ -0,0 +1,160 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import asyncio
+from threading import Lock, Thread, current_thread
+from typing import Dict, Iterable, List
+
+from httpcore import AsyncConnectionPool
+from httpx import AsyncClient
+
+from .exceptions import raise_general_exception
+
+UNIX_SOCKET_SCHEME = 'unix://'
+# requests sent over a unix socket still need an http URL, the socket decides where they go
+UNIX_SOCKET_BASE_URL = 'http://localhost'
+
+
+def is_unix_socket(host: str) -> bool:
+    return host.startswith(UNIX_SOCKET_SCHEME)
+
+
+def get_unix_socket_path(host: str) -> str:
+    return host[len(UNIX_SOCKET_SCHEME):]
+
+
+def _close_later(loop: asyncio.AbstractEventLoop, client: AsyncClient, delay_seconds: float):
+    loop.call_later(delay_seconds, lambda: loop.create_task(client.aclose()))
+
+
+def _close_clients(loop: asyncio.AbstractEventLoop, clients: List[AsyncClient]):
+    # runs on an executor thread, once no thread can run `loop` anymore
+    async def close():
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception:
+                # the connections opened from a closed loop can only be dropped
+                pass
+
+    if not loop.is_closed():
+        loop.run_until_complete(close())
+        return
+    closing_loop = asyncio.new_event_loop()
+    try:
+        closing_loop.run_until_complete(close())
+    finally:
+        closing_loop.close()
+
+
+class CoreTransports:
+    """
+    Keeps one AsyncClient per core host and event loop, so that connections to the core
+    are pooled across requests instead of being opened for each of them. A client is bound
+    to the loop it was created on (syncio functions on other threads get their own). The
+    clients of loops that are closed, or whose thread has exited (e.g. the `sync()` loop of
+    a finished WSGI request thread), are closed when a client is next created for a new loop.
+
+    Hosts given as `unix:///path/to/core.sock` are reached over that unix domain socket.
+    With `http2`, HTTP/2 is negotiated with https hosts (this needs the h2 package, e.g.
+    `pip install httpx[http2]`), so concurrent requests share a connection.
+    """
+
+    def __init__(self, http2: bool = False):
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                raise_general_exception('http2 is enabled but the h2 package is not installed')
+        self.http2 = http2
+        self.__clients: Dict[asyncio.AbstractEventLoop, Dict[str, AsyncClient]] = {}
+        # loop -> the thread that created its clients
+        self.__threads: Dict[asyncio.AbstractEventLoop, Thread] = {}
+        self.__lock = Lock()
+
+    def get_client(self, host: str) -> AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self.__lock:
+            clients = self.__clients.get(loop)
+            if clients is None:
+                self.__close_unused_loops(loop)
+                clients = {}
+                self.__clients[loop] = clients
+                self.__threads[loop] = current_thread()
+            client = clients.get(host)
+            if client is None:
+                client = self.__create_client(host)
+                clients[host] = client
+            return client
+
+    def loop_count(self) -> int:
+        return len(self.__clients)
+
+    @staticmethod
+    def get_url(host: str, path: str) -> str:
+        if is_unix_socket(host):
+            return UNIX_SOCKET_BASE_URL + path
+        return host + path
+
+    def drain(self, hosts: Iterable[str], delay_seconds: float) -> None:
+        """
+        Closes the clients of `hosts` on every loop after `delay_seconds`, so that the
+        requests already sent to them can finish.
+        """
+        hosts = set(hosts)
+        with self.__lock:
+            for loop, clients in self.__clients.items():
+                for host in hosts & clients.keys():
+                    client = clients.pop(host)
+                    if not loop.is_closed():
+                        loop.call_soon_threadsafe(_close_later, loop, client, delay_seconds)
+
+    async def warm_up(self, hosts: Iterable[str], path: str, timeout: float) -> None:
+        """
+        Opens a connection to each of `hosts` from the running loop, ignoring errors.
+        """
+        async def warm_up(host: str):
+            try:
+                await self.get_client(host).get(self.get_url(host, path), timeout=timeout)
+            except Exception:
+                pass
+
+        await asyncio.gather(*[warm_up(host) for host in hosts])
+
+    async def close(self) -> None:
+        """
+        Closes the connections opened from the running loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self.__lock:
+            clients = self.__clients.pop(loop, {})
+            self.__threads.pop(loop, None)
+        for client in clients.values():
+            await client.aclose()
+
+    def __close_unused_loops(self, running_loop: asyncio.AbstractEventLoop):
+        # called with the lock held, from `running_loop`
+        for loop in list(self.__clients):
+            if not loop.is_closed() and self.__threads[loop].is_alive():
+                continue
+            clients = list(self.__clients.pop(loop).values())
+            del self.__threads[loop]
+            if len(clients) != 0:
+                running_loop.run_in_executor(None, _close_clients, loop, clients)
+
+    def __create_client(self, host: str) -> AsyncClient:
+        if is_unix_socket(host):
+            return AsyncClient(transport=AsyncConnectionPool(uds=get_unix_socket_path(host), http2=self.http2))
+        return AsyncClient(http2=self.http2)
@@ -0,0 +1,374 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import asyncio
+import atexit
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from os import environ
+from threading import Lock, Event
+from typing import Awaitable, Callable, Dict, List, Union
+
+from supertokens_python.background_tasks import BackgroundTaskSupervisor
+from supertokens_python.exceptions import raise_general_exception
+
+DEFAULT_MAX_QUEUE_SIZE = 1000
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_INITIAL_BACKOFF_SECONDS = 1
+DEFAULT_MAX_BACKOFF_SECONDS = 60
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_SHUTDOWN_TIMEOUT_SECONDS = 5
+
+SendFunction = Callable[[dict], Awaitable[None]]
+SendBatchFunction = Callable[[List[dict]], Awaitable[None]]
+OnFailureFunction = Callable[[str, dict, Exception], Awaitable[None]]
+
+
+class DeliveryJob:
+    def __init__(self, kind: str, payload: dict, attempts: int = 0, job_id: Union[int, None] = None):
+        self.kind = kind
+        self.payload = payload
+        self.attempts = attempts
+        self.job_id = job_id
+
+
+class DeliverySpool(ABC):
+    """
+    Durable storage for queued deliveries, so that emails / text messages that were
+    accepted but not sent yet survive a restart of the process. Its methods block, so
+    the delivery queue calls them from the default executor.
+
+    The payloads hold password reset / email verification links and passwordless codes
+    until they are sent; SQLiteDeliverySpool stores them in plaintext, so keep its file
+    readable only by the app.
+    """
+
+    @abstractmethod
+    def add(self, job: DeliveryJob) -> int:
+        pass
+
+    @abstractmethod
+    def update(self, job: DeliveryJob) -> None:
+        pass
+
+    @abstractmethod
+    def remove(self, job: DeliveryJob) -> None:
+        pass
+
+    @abstractmethod
+    def get_pending(self) -> List[DeliveryJob]:
+        pass
+
+
+class SQLiteDeliverySpool(DeliverySpool):
+    def __init__(self, path: str):
+        self.path = path
+        self.__lock = Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.__connection.execute('CREATE TABLE IF NOT EXISTS supertokens_delivery_jobs ('
+                                  'id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, '
+                                  'payload TEXT NOT NULL, attempts INTEGER NOT NULL)')
+
+    def add(self, job: DeliveryJob) -> int:
+        with self.__lock:
+            cursor = self.__connection.execute(
+                'INSERT INTO supertokens_delivery_jobs (kind, payload, attempts) VALUES (?, ?, ?)',
+                (job.kind, json.dumps(job.payload), job.attempts))
+            return cursor.lastrowid
+
+    def update(self, job: DeliveryJob) -> None:
+        with self.__lock:
+            self.__connection.execute('UPDATE supertokens_delivery_jobs SET attempts = ? WHERE id = ?',
+                                      (job.attempts, job.job_id))
+
+    def remove(self, job: DeliveryJob) -> None:
+        with self.__lock:
+            self.__connection.execute('DELETE FROM supertokens_delivery_jobs WHERE id = ?', (job.job_id,))
+
+    def get_pending(self) -> List[DeliveryJob]:
+        with self.__lock:
+            rows = self.__connection.execute(
+                'SELECT id, kind, payload, attempts FROM supertokens_delivery_jobs ORDER BY id').fetchall()
+        return [DeliveryJob(kind, json.loads(payload), attempts, job_id) for job_id, kind, payload, attempts in rows]
+
+
+class DeliveryConfig:
+    """
+    Enables the delivery queue: recipe emails / text messages are queued and sent by
+    `workers` background workers, so that the APIs that trigger them (password reset,
+    email verification, passwordless codes) return without waiting for the provider.
+
+    Failed sends are retried `max_retries` times with exponential back-off. If a
+    function is given in `send_batch` for a kind of delivery (e.g. PASSWORD_RESET_EMAIL)
+    up to `batch_size` queued deliveries of that kind are handed to it at once. If the
+    queue is full, the delivery is sent inline instead.
+
+    Deliveries that still fail after `max_retries` retries are dropped (and removed
+    from the spool); `on_failure` is called with their kind, payload and last error.
+    """
+
+    def __init__(self,
+                 max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+                 workers: int = DEFAULT_WORKERS,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 initial_backoff_seconds: float = DEFAULT_INITIAL_BACKOFF_SECONDS,
+                 max_backoff_seconds: float = DEFAULT_MAX_BACKOFF_SECONDS,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 send_batch: Union[Dict[str, SendBatchFunction], None] = None,
+                 spool: Union[DeliverySpool, None] = None,
+                 on_failure: Union[OnFailureFunction, None] = None):
+        self.max_queue_size = max_queue_size
+        self.workers = workers
+        self.max_retries = max_retries
+        self.initial_backoff_seconds = initial_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.batch_size = batch_size
+        self.send_batch = {} if send_batch is None else send_batch
+        self.spool = spool
+        self.on_failure = on_failure
+
+
+class DeliveryQueue:
+    __instance = None
+
+    def __init__(self, config: DeliveryConfig):
+        self.config = config
+        self.__senders: Dict[str, SendFunction] = {}
+        self.__waiting_for_sender: Dict[str, List[DeliveryJob]] = {}
+        self.__lock = Lock()
+        self.__size = 0
+        self.__idle = Event()
+        self.__idle.set()
+        self.__loop: Union[asyncio.AbstractEventLoop, None] = None
+        self.__queue: Union[asyncio.Queue, None] = None
+        self.__workers: List[asyncio.Task] = []
+        self.__retries: Dict[int, asyncio.TimerHandle] = {}
+        self.__starting = False
+        self.__started = Event()
+        self.__closed = False
+
+    @staticmethod
+    def init(config: DeliveryConfig) -> DeliveryQueue:
+        if DeliveryQueue.__instance is not None:
+            raise_general_exception('Delivery queue has already been initialised. Please check your code for bugs.')
+        DeliveryQueue.__instance = DeliveryQueue(config)
+        # the workers run on the supervisor's loop: registering after it makes atexit
+        # drain the queue before that loop is stopped
+        BackgroundTaskSupervisor.get_instance()
+        atexit.register(DeliveryQueue.__instance.drain)
+        return DeliveryQueue.__instance
+
+    @staticmethod
+    def get_instance() -> Union[DeliveryQueue, None]:
+        return DeliveryQueue.__instance
+
+    @staticmethod
+    def reset():
+        if ('SUPERTOKENS_ENV' not in environ) or (
+                environ['SUPERTOKENS_ENV'] != 'testing'):
+            raise_general_exception('calling testing function in non testing env')
+        instance = DeliveryQueue.__instance
+        DeliveryQueue.__instance = None
+        if instance is not None:
+            atexit.unregister(instance.drain)
+            instance.drain(0)
+
+    def register(self, kind: str, send: SendFunction) -> None:
+        with self.__lock:
+            self.__senders[kind] = send
+            waiting = self.__waiting_for_sender.pop(kind, [])
+        for job in waiting:
+            self.__put(job)
+
+    def start(self) -> None:
+        """
+        Starts the workers and re-queues the deliveries left in the spool by a previous run.
+        """
+        with self.__lock:
+            starting = self.__starting
+            self.__starting = True
+        if starting:
+            self.__started.wait()
+            return
+
+        loop = BackgroundTaskSupervisor.get_instance().get_thread_loop()
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        # the queue has to exist before the loop is published, or `__put` could use it
+        # too early
+        if running_loop is loop:
+            self.__create_workers(loop)
+        else:
+            asyncio.run_coroutine_threadsafe(self.__start_workers(), loop).result()
+        with self.__lock:
+            self.__loop = loop
+        self.__started.set()
+
+        if self.config.spool is not None:
+            for job in self.config.spool.get_pending():
+                with self.__lock:
+                    self.__size += 1
+                    self.__idle.clear()
+                self.__put(job)
+
+    def enqueue(self, kind: str, payload: dict) -> bool:
+        """
+        Queues a delivery. Returns False (and queues nothing) if the queue is full or
+        closed, in which case the caller is expected to send it inline. It can block on
+        the spool, so coroutines should use `submit` instead.
+        """
+        with self.__lock:
+            if self.__closed or kind not in self.__senders or self.__size >= self.config.max_queue_size:
+                return False
+            self.__size += 1
+            self.__idle.clear()
+        if not self.__started.is_set():
+            self.start()
+
+        job = DeliveryJob(kind, payload)
+        if self.config.spool is not None:
+            job.job_id = self.config.spool.add(job)
+        self.__put(job)
+        return True
+
+    async def submit(self, kind: str, payload: dict) -> bool:
+        """
+        Same as `enqueue`, run on the default executor so that the spool (and starting the
+        workers) does not block the event loop.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.enqueue, kind, payload)
+
+    def pending_count(self) -> int:
+        return self.__size
+
+    def drain(self, timeout: Union[float, None] = DEFAULT_SHUTDOWN_TIMEOUT_SECONDS) -> bool:
+        """
+        Stops accepting deliveries and waits (up to `timeout` seconds) for the queued ones
+        to be sent. Deliveries still queued after that stay in the spool, if there is one.
+        Returns True if the queue was emptied.
+        """
+        with self.__lock:
+            self.__closed = True
+            loop = self.__loop
+            self.__loop = None
+        emptied = self.__idle.wait(timeout) if loop is not None else self.__size == 0
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self.__stop_workers)
+            except RuntimeError:
+                # the supervisor's loop has already been closed
+                pass
+        return emptied
+
+    async def shutdown(self, timeout: Union[float, None] = DEFAULT_SHUTDOWN_TIMEOUT_SECONDS) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(None, self.drain, timeout)
+
+    def __put(self, job: DeliveryJob) -> None:
+        with self.__lock:
+            if job.kind not in self.__senders:
+                self.__waiting_for_sender.setdefault(job.kind, []).append(job)
+                return
+            loop = self.__loop
+            if loop is None or self.__closed:
+                return
+            loop.call_soon_threadsafe(self.__queue.put_nowait, job)
+
+    async def __start_workers(self):
+        self.__create_workers(asyncio.get_running_loop())
+
+    def __create_workers(self, loop: asyncio.AbstractEventLoop):
+        self.__queue = asyncio.Queue()
+        self.__workers = [loop.create_task(self.__work()) for _ in range(max(self.config.workers, 1))]
+
+    def __stop_workers(self):
+        for worker in self.__workers:
+            worker.cancel()
+        for retry in self.__retries.values():
+            retry.cancel()
+        self.__workers = []
+        self.__retries.clear()
+
+    async def __work(self):
+        # a job of another kind that ended a batch; it is sent next, so that deliveries
+        # keep their order
+        held: Union[DeliveryJob, None] = None
+        while True:
+            if held is not None:
+                jobs = [held]
+                held = None
+            else:
+                jobs = [await self.__queue.get()]
+            send_batch = self.config.send_batch.get(jobs[0].kind)
+            if send_batch is not None:
+                while len(jobs) < self.config.batch_size and not self.__queue.empty():
+                    job = self.__queue.get_nowait()
+                    if job.kind != jobs[0].kind:
+                        held = job
+                        break
+                    jobs.append(job)
+                try:
+                    await send_batch([job.payload for job in jobs])
+                    for job in jobs:
+                        await self.__done(job)
+                except Exception as e:
+                    for job in jobs:
+                        await self.__retry(job, e)
+            else:
+                try:
+                    await self.__senders[jobs[0].kind](jobs[0].payload)
+                    await self.__done(jobs[0])
+                except Exception as e:
+                    await self.__retry(jobs[0], e)
+
+    async def __retry(self, job: DeliveryJob, error: Exception):
+        job.attempts += 1
+        if job.attempts > self.config.max_retries:
+            await self.__done(job)
+            if self.config.on_failure is not None:
+                try:
+                    await self.config.on_failure(job.kind, job.payload, error)
+                except Exception:
+                    pass
+            return
+        if self.config.spool is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.config.spool.update, job)
+        backoff = min(self.config.initial_backoff_seconds * (2 ** (job.attempts - 1)), self.config.max_backoff_seconds)
+        self.__retries[id(job)] = asyncio.get_running_loop().call_later(backoff, self.__requeue, job)
+
+    def __requeue(self, job: DeliveryJob):
+        self.__retries.pop(id(job), None)
+        self.__queue.put_nowait(job)
+
+    async def __done(self, job: DeliveryJob):
+        if self.config.spool is not None and job.job_id is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.config.spool.remove, job)
+        with self.__lock:
+            self.__size -= 1
+            if self.__size == 0:
+                self.__idle.set()
+
+
+async def deliver(kind: str, payload: dict, send: SendFunction) -> None:
+    """
+    Queues the delivery if the delivery queue is enabled (and not full), otherwise sends
+    it right away. `send` must be the function registered for `kind`.
+    """
+    delivery_queue = DeliveryQueue.get_instance()
+    if delivery_queue is None or not await delivery_queue.submit(kind, payload):
+        await send(payload)
@@ -39,3 +39,19 @@ class GeneralError(SuperTokensError):
 
 class BadInputError(SuperTokensError):
     pass
+
+
+class CoreTimeoutError(GeneralError):
+    """
+    Raised when a request to the core (with its retries) did not complete within its
+    timeout or deadline.
+    """
+    pass
+
+
+class CoreOverloadedError(GeneralError):
+    """
+    Raised without calling the core when this process already has as many requests to
+    the core in flight and queued as it is allowed to.
+    """
+    pass
@@ -0,0 +1,190 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+"""
+Streams every user from the core to an NDJSON or CSV file, one page at a time, so
+memory use does not grow with the number of users.
+
+    python -m supertokens_python.export --connection-uri http://localhost:3567 \\
+        --output users.csv.gz --format csv --resume-file users.resume
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import gzip
+import io
+import json
+import os
+from typing import IO, List, Union
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+from supertokens_python.exceptions import raise_general_exception
+from supertokens_python.normalised_url_domain import NormalisedURLDomain
+from supertokens_python.pagination import iter_pages, DEFAULT_BUFFER_SIZE
+from supertokens_python.querier import Querier
+from supertokens_python.supertokens import Supertokens
+from supertokens_python.types import UsersResponse
+
+CSV_COLUMNS = ['recipeId', 'userId', 'email', 'phoneNumber', 'timeJoined', 'thirdPartyId', 'thirdPartyUserId']
+
+
+def to_export_row(user: dict) -> dict:
+    user_obj = user['user']
+    third_party = user_obj.get('thirdParty', {})
+    return {
+        'recipeId': user['recipeId'],
+        'userId': user_obj['id'],
+        'email': user_obj.get('email'),
+        'phoneNumber': user_obj.get('phoneNumber'),
+        'timeJoined': user_obj['timeJoined'],
+        'thirdPartyId': third_party.get('id'),
+        'thirdPartyUserId': third_party.get('userId')
+    }
+
+
+async def export_users(output: Union[str, IO[str]], export_format: Literal['ndjson', 'csv'] = 'ndjson',
+                       time_joined_order: Literal['ASC', 'DESC'] = 'ASC', page_size: Union[int, None] = None,
+                       include_recipe_ids: List[str] = None, pagination_token: Union[str, None] = None,
+                       resume_file: Union[str, None] = None, compress: Union[bool, None] = None,
+                       buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+    """
+    Writes the users to `output` (a path or a text file-like object) and returns how
+    many were written. Paths ending in .gz are gzipped unless `compress` says otherwise.
+
+    If `resume_file` is given, the pagination token of the next page is saved to it
+    after every page, and an export started with the same resume file continues from
+    there (appending to `output`). The resume file is removed once the export completes.
+    When `output` is a path, the size it had after the last complete page is saved too,
+    and a resumed export first truncates it to that size, so that a page written just
+    before a crash is not duplicated. Gzipped output is written as one gzip member per
+    page for the same reason.
+    """
+    if export_format not in ('ndjson', 'csv'):
+        raise_general_exception('export_format must be either ndjson or csv')
+
+    resuming = False
+    offset = None
+    if resume_file is not None and os.path.exists(resume_file):
+        with open(resume_file) as f:
+            saved = f.read().splitlines()
+        # "<size of output>\n<token>", or just the token for file-like outputs
+        if len(saved) == 2:
+            offset = int(saved[0])
+        if len(saved) != 0 and saved[-1] != '':
+            pagination_token = saved[-1]
+        resuming = True
+
+    to_path = isinstance(output, str)
+    if to_path:
+        if compress is None:
+            compress = output.endswith('.gz')
+        output = open(output, 'ab' if resuming else 'wb')
+        if offset is not None:
+            output.truncate(offset)
+
+    def write(text: str):
+        if to_path:
+            if text == '':
+                return
+            data = text.encode('utf-8')
+            output.write(gzip.compress(data) if compress else data)
+        else:
+            output.write(text)
+        output.flush()
+
+    def save_resume_point(token: str):
+        with open(resume_file + '.tmp', 'w') as f:
+            f.write(token if not to_path else str(output.tell()) + '\n' + token)
+        os.replace(resume_file + '.tmp', resume_file)
+
+    async def get_page(token: Union[str, None]) -> UsersResponse:
+        response = await Supertokens.get_users_json(time_joined_order, page_size, token, include_recipe_ids)
+        return UsersResponse(response['users'], response.get('nextPaginationToken'))
+
+    count = 0
+    buffer = io.StringIO(newline='')
+    try:
+        writer = None
+        if export_format == 'csv':
+            writer = csv.DictWriter(buffer, CSV_COLUMNS)
+            if not resuming:
+                writer.writeheader()
+                write(buffer.getvalue())
+
+        async for page in iter_pages(get_page, pagination_token, buffer_size):
+            buffer.seek(0)
+            buffer.truncate()
+            if writer is not None:
+                writer.writerows(to_export_row(user) for user in page.users)
+            else:
+                buffer.writelines(json.dumps(to_export_row(user), separators=(',', ':')) + '\n'
+                                  for user in page.users)
+            write(buffer.getvalue())
+            count += len(page.users)
+            if resume_file is not None and page.next_pagination_token is not None:
+                save_resume_point(page.next_pagination_token)
+    finally:
+        if to_path:
+            output.close()
+
+    if resume_file is not None and os.path.exists(resume_file):
+        os.remove(resume_file)
+    return count
+
+
+def main(args: Union[List[str], None] = None):
+    parser = argparse.ArgumentParser(prog='python -m supertokens_python.export',
+                                     description='Export all users from a SuperTokens core.')
+    parser.add_argument('--connection-uri', required=True,
+                        help='the SuperTokens core to export from (multiple hosts separated by ;)')
+    parser.add_argument('--api-key', default=None)
+    parser.add_argument('--output', default='-', help='file to write to, - for stdout (default)')
+    parser.add_argument('--format', dest='export_format', choices=['ndjson', 'csv'], default='ndjson')
+    parser.add_argument('--gzip', dest='compress', action='store_true', default=None,
+                        help='gzip the output (default: only if the output ends in .gz)')
+    parser.add_argument('--order', dest='time_joined_order', choices=['ASC', 'DESC'], default='ASC')
+    parser.add_argument('--page-size', type=int, default=None)
+    parser.add_argument('--include-recipe-ids', default=None, help='comma separated recipe ids')
+    parser.add_argument('--pagination-token', default=None, help='start from this page')
+    parser.add_argument('--resume-file', default=None,
+                        help='where to keep the pagination token of the next page, to resume interrupted exports')
+    options = parser.parse_args(args)
+
+    hosts = [NormalisedURLDomain(h.strip(), allow_unix_socket=True) for h in options.connection_uri.split(';') if h.strip() != '']
+    Querier.init(hosts, options.api_key)
+    output = options.output
+    if output == '-':
+        if options.compress:
+            output = io.TextIOWrapper(gzip.GzipFile(fileobj=os.fdopen(1, 'wb', closefd=False), mode='wb'),
+                                      encoding='utf-8', newline='')
+        else:
+            output = io.TextIOWrapper(os.fdopen(1, 'wb', closefd=False), encoding='utf-8', newline='')
+    include_recipe_ids = None if options.include_recipe_ids is None else options.include_recipe_ids.split(',')
+
+    try:
+        return asyncio.run(export_users(output, options.export_format, options.time_joined_order, options.page_size,
+                                        include_recipe_ids, options.pagination_token, options.resume_file,
+                                        options.compress))
+    finally:
+        if not isinstance(output, str):
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
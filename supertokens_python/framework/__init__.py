@@ -11,6 +11,13 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-from .django import django_middleware
 from .request import BaseRequest
 from .response import BaseResponse
+
+
+def __getattr__(name):
+    # the django adapter (and asgiref) is only imported if it is actually used
+    if name == 'django_middleware':
+        from .django import django_middleware
+        return django_middleware
+    raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
@@ -49,7 +49,7 @@ class DjangoRequest(BaseRequest):
         return self.request.get_full_path()
 
     def get_session(self):
-        return self.request.supertokens
+        return getattr(self.request, 'supertokens', None)
 
     def set_session(self, session):
         self.request.supertokens = session
@@ -57,5 +57,8 @@ class DjangoRequest(BaseRequest):
     def get_path(self) -> str:
         return self.request.path
 
+    def get_client_ip(self) -> Union[str, None]:
+        return self.request.META.get('REMOTE_ADDR')
+
     async def form_data(self):
         return dict(parse_qsl(self.request.body.decode('utf-8')))
@@ -11,7 +11,7 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-import json
+from supertokens_python.json_codec import json_dumps
 from math import ceil
 from time import time
 
@@ -64,11 +64,5 @@ class DjangoResponse(BaseResponse):
     def set_json_content(self, content):
         if not self.response_sent:
             self.set_header('Content-Type', 'application/json; charset=utf-8')
-            self.response.content = json.dumps(
-                content,
-                ensure_ascii=False,
-                allow_nan=False,
-                indent=None,
-                separators=(",", ":"),
-            ).encode("utf-8")
+            self.response.content = json_dumps(content)
             self.response_sent = True
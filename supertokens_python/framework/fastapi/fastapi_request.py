@@ -46,7 +46,7 @@ class FastApiRequest(BaseRequest):
         return self.request.url
 
     def get_session(self):
-        return self.request.state.supertokens
+        return getattr(self.request.state, 'supertokens', None)
 
     def set_session(self, session):
         self.request.state.supertokens = session
@@ -54,5 +54,10 @@ class FastApiRequest(BaseRequest):
     def get_path(self) -> str:
         return self.request.url.path
 
+    def get_client_ip(self) -> Union[str, None]:
+        if self.request.client is None:
+            return None
+        return self.request.client.host
+
     async def form_data(self):
         return dict(parse_qsl((await self.request.body()).decode('utf-8')))
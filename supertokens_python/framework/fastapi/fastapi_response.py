@@ -14,7 +14,7 @@
 from time import time
 
 from supertokens_python.framework.response import BaseResponse
-import json
+from supertokens_python.json_codec import json_dumps
 from math import ceil
 
 
@@ -54,11 +54,5 @@ class FastApiResponse(BaseResponse):
     def set_json_content(self, content):
         if not self.response_sent:
             self.set_header('Content-Type', 'application/json; charset=utf-8')
-            self.response.body = json.dumps(
-                content,
-                ensure_ascii=False,
-                allow_nan=False,
-                indent=None,
-                separators=(",", ":"),
-            ).encode("utf-8")
+            self.response.body = json_dumps(content)
             self.response_sent = True
@@ -62,5 +62,10 @@ class FlaskRequest(BaseRequest):
             return self.request['PATH_INFO']
         return self.request.base_url
 
+    def get_client_ip(self) -> Union[str, None]:
+        if isinstance(self.request, dict):
+            return self.request.get('REMOTE_ADDR')
+        return self.request.remote_addr
+
     async def form_data(self):
         return self.request.form.to_dict()
@@ -11,7 +11,7 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-import json
+from supertokens_python.json_codec import json_dumps
 
 from werkzeug.http import dump_cookie
 
@@ -88,11 +88,5 @@ class FlaskResponse(BaseResponse):
     def set_json_content(self, content):
         if not self.response_sent:
             self.set_header('Content-Type', 'application/json; charset=utf-8')
-            self.response.data = json.dumps(
-                content,
-                ensure_ascii=False,
-                allow_nan=False,
-                indent=None,
-                separators=(",", ":"),
-            ).encode("utf-8")
+            self.response.data = json_dumps(content)
             self.response_sent = True
@@ -62,3 +62,7 @@ class BaseRequest(ABC):
     @abstractmethod
     def get_path(self) -> str:
         pass
+
+    def get_client_ip(self) -> Union[str, None]:
+        # the address of the peer, which is a proxy if the app runs behind one
+        return None
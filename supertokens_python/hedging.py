@@ -0,0 +1,135 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from threading import Lock
+from typing import Awaitable, Callable, Iterable, Union
+
+DEFAULT_HEDGED_PATHS = ('/recipe/user', '/recipe/session', '/recipe/user/email/verify', '/recipe/jwt/jwks')
+DEFAULT_PERCENTILE = 95
+DEFAULT_INITIAL_DELAY_SECONDS = 0.1
+DEFAULT_MIN_DELAY_SECONDS = 0.005
+DEFAULT_MAX_HEDGE_RATIO = 0.05
+DEFAULT_WINDOW_SIZE = 1000
+DEFAULT_MIN_SAMPLES = 50
+
+
+class HedgingConfig:
+    """
+    When the core has more than one host, GETs to `paths` that have not been answered after
+    the `percentile` of their recent latencies (the last `window_size` ones; until there
+    are `min_samples`, `initial_delay_seconds`) are sent again to the next host. The first
+    answer wins and the other request is cancelled. At most `max_hedge_ratio` of the hedgeable
+    requests are hedged, so a slow core does not get twice the traffic.
+    """
+
+    def __init__(self, percentile: float = DEFAULT_PERCENTILE,
+                 initial_delay_seconds: float = DEFAULT_INITIAL_DELAY_SECONDS,
+                 min_delay_seconds: float = DEFAULT_MIN_DELAY_SECONDS,
+                 max_hedge_ratio: float = DEFAULT_MAX_HEDGE_RATIO,
+                 window_size: int = DEFAULT_WINDOW_SIZE,
+                 min_samples: int = DEFAULT_MIN_SAMPLES,
+                 paths: Union[Iterable[str], None] = None):
+        if not 0 < percentile < 100:
+            raise Exception('percentile must be between 0 and 100')
+        self.percentile = percentile
+        self.initial_delay_seconds = initial_delay_seconds
+        self.min_delay_seconds = min_delay_seconds
+        self.max_hedge_ratio = max_hedge_ratio
+        self.window_size = window_size
+        self.min_samples = min(min_samples, window_size)
+        self.paths = frozenset(DEFAULT_HEDGED_PATHS if paths is None else paths)
+
+
+def _retrieve_exception(task: asyncio.Task):
+    if not task.cancelled():
+        task.exception()
+
+
+class Hedger:
+    def __init__(self, config: HedgingConfig):
+        self.config = config
+        self.__latencies = deque(maxlen=config.window_size)
+        self.__delay = config.initial_delay_seconds
+        self.__new_samples = 0
+        self.__requests = 0
+        self.__hedges = 0
+        self.__lock = Lock()
+
+    def should_hedge(self, method: str, path: str) -> bool:
+        return method == 'GET' and path in self.config.paths
+
+    def get_delay(self) -> float:
+        with self.__lock:
+            # the percentile is recomputed once a tenth of the window has been replaced
+            if len(self.__latencies) >= self.config.min_samples and \
+                    self.__new_samples * 10 >= len(self.__latencies):
+                latencies = sorted(self.__latencies)
+                index = min(len(latencies) - 1, int(len(latencies) * self.config.percentile / 100))
+                self.__delay = max(self.config.min_delay_seconds, latencies[index])
+                self.__new_samples = 0
+            return self.__delay
+
+    def record(self, latency_seconds: float) -> None:
+        with self.__lock:
+            self.__latencies.append(latency_seconds)
+            self.__new_samples += 1
+
+    def count_request(self) -> None:
+        with self.__lock:
+            self.__requests += 1
+            if self.__requests >= self.config.window_size:
+                # halving both counts keeps the ratio while forgetting old traffic
+                self.__requests //= 2
+                self.__hedges //= 2
+
+    def try_hedge(self) -> bool:
+        with self.__lock:
+            if self.__hedges + 1 > self.config.max_hedge_ratio * self.__requests:
+                return False
+            self.__hedges += 1
+            return True
+
+    async def run(self, send: Callable[[], Awaitable]):
+        """
+        Awaits `send()`, calling it a second time if the first call is slower than the
+        current delay (and the hedge budget allows). Returns the first successful result,
+        or raises the error of the first call if both fail.
+        """
+        self.count_request()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        primary = asyncio.ensure_future(send())
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.get_delay())
+            if len(done) == 0 and self.try_hedge():
+                tasks.append(asyncio.ensure_future(send()))
+
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in tasks:
+                    if task in done and task.exception() is None:
+                        self.record(loop.time() - start)
+                        return task.result()
+                if len(pending) == 0:
+                    return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    task.add_done_callback(_retrieve_exception)
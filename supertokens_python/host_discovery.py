@@ -0,0 +1,126 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from os import stat
+from socket import SOCK_STREAM
+from typing import List, Union
+
+from .exceptions import raise_general_exception
+
+DEFAULT_DNS_TTL_SECONDS = 30
+DEFAULT_FILE_TTL_SECONDS = 5
+DEFAULT_DRAIN_SECONDS = 30
+
+
+def split_connection_uri(connection_uri: str) -> List[str]:
+    return [host.strip() for host in connection_uri.replace('\n', ';').split(';') if host.strip() != '']
+
+
+class HostProvider(ABC):
+    """
+    Gives the hosts of the core. The querier asks again, in the background, once
+    `ttl_seconds` have passed since the last answer, and keeps the hosts it has if the
+    provider fails or gives none. Requests to removed hosts are let finish for
+    `drain_seconds` before their connections are closed, and a connection is opened to
+    each new host.
+    """
+    ttl_seconds: float = DEFAULT_DNS_TTL_SECONDS
+    drain_seconds: float = DEFAULT_DRAIN_SECONDS
+
+    @abstractmethod
+    async def get_hosts(self) -> List[str]:
+        pass
+
+
+class StaticHostProvider(HostProvider):
+    def __init__(self, connection_uri: str):
+        self.hosts = split_connection_uri(connection_uri)
+        self.ttl_seconds = float('inf')
+
+    async def get_hosts(self) -> List[str]:
+        return self.hosts
+
+
+class DNSHostProvider(HostProvider):
+    """
+    Resolves `name` to its A / AAAA records, used as `scheme://address:port`. With `srv`,
+    `name` is an SRV record (e.g. `_supertokens._tcp.core.internal`) which gives the port
+    of each host; this needs the dnspython package.
+
+    `https` needs SRV records: the hosts built from A / AAAA records are IP addresses, which
+    the certificate of the core would not be verified against.
+    """
+
+    def __init__(self, name: str, port: int = 3567, scheme: str = 'http', srv: bool = False,
+                 ttl_seconds: float = DEFAULT_DNS_TTL_SECONDS, drain_seconds: float = DEFAULT_DRAIN_SECONDS):
+        if scheme == 'https' and not srv:
+            raise_general_exception('DNSHostProvider can only use https with SRV records, since the certificate of '
+                                    'the core cannot be verified against the addresses of A / AAAA records')
+        if srv:
+            try:
+                import dns.asyncresolver  # noqa: F401
+            except ImportError:
+                raise_general_exception('DNSHostProvider is set to use SRV records but dnspython is not installed')
+        self.name = name
+        self.port = port
+        self.scheme = scheme
+        self.srv = srv
+        self.ttl_seconds = ttl_seconds
+        self.drain_seconds = drain_seconds
+
+    async def get_hosts(self) -> List[str]:
+        if self.srv:
+            import dns.asyncresolver
+            answer = await dns.asyncresolver.resolve(self.name, 'SRV')
+            records = sorted(answer, key=lambda record: (record.priority, -record.weight))
+            return [self.__to_host(record.target.to_text(omit_final_dot=True), record.port) for record in records]
+
+        addresses = await asyncio.get_running_loop().getaddrinfo(self.name, self.port, type=SOCK_STREAM)
+        hosts = []
+        for _, _, _, _, address in addresses:
+            host = self.__to_host(address[0], address[1])
+            if host not in hosts:
+                hosts.append(host)
+        return hosts
+
+    def __to_host(self, address: str, port: int) -> str:
+        if ':' in address:
+            address = '[' + address + ']'
+        return self.scheme + '://' + address + ':' + str(port)
+
+
+class FileHostProvider(HostProvider):
+    """
+    Reads the hosts from a file, in the format of `connection_uri` (separated by `;` or
+    new lines), whenever the file has changed.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = DEFAULT_FILE_TTL_SECONDS,
+                 drain_seconds: float = DEFAULT_DRAIN_SECONDS):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.drain_seconds = drain_seconds
+        self.__modified_at: Union[int, None] = None
+        self.__hosts: List[str] = []
+
+    async def get_hosts(self) -> List[str]:
+        modified_at = stat(self.path).st_mtime_ns
+        if modified_at != self.__modified_at:
+            with open(self.path) as f:
+                self.__hosts = split_connection_uri(f.read())
+            self.__modified_at = modified_at
+        return self.__hosts
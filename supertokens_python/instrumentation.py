@@ -0,0 +1,157 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from asyncio import CancelledError
+from time import monotonic
+from typing import Any, Union
+
+from httpx import NetworkError, ConnectTimeout, TimeoutException
+
+from .exceptions import raise_general_exception
+from .utils import is_4xx_error, is_5xx_error
+
+OUTCOME_OK = 'ok'
+OUTCOME_HTTP_ERROR = 'http_error'
+OUTCOME_TIMEOUT = 'timeout'
+OUTCOME_CONNECTION_ERROR = 'connection_error'
+OUTCOME_CANCELLED = 'cancelled'
+OUTCOME_ERROR = 'error'
+
+
+class CoreCall:
+    """
+    One attempt of a request to the core. `attempt` counts the retries and the failovers to
+    other hosts of the same request, starting at 1. `state` is free for the hooks to keep
+    something (e.g. a span) from before_call to after_call.
+    """
+    __slots__ = ('path', 'method', 'host', 'attempt', 'started_at', 'duration_seconds', 'status_code', 'outcome',
+                 'error', 'state')
+
+    def __init__(self, path: str, method: str, host: str, attempt: int):
+        self.path = path
+        self.method = method
+        self.host = host
+        self.attempt = attempt
+        self.started_at = monotonic()
+        self.duration_seconds: Union[float, None] = None
+        self.status_code: Union[int, None] = None
+        self.outcome: Union[str, None] = None
+        self.error: Union[BaseException, None] = None
+        self.state: Any = None
+
+
+class Instrumentation:
+    """
+    Hooks called around each attempt of a request to the core. They run on the request
+    path, so they should be cheap, and the errors they raise are ignored.
+    """
+
+    def before_call(self, call: CoreCall) -> None:
+        pass
+
+    def after_call(self, call: CoreCall) -> None:
+        pass
+
+
+def start_call(instrumentation: Instrumentation, path: str, method: str, host: str, attempt: int) -> CoreCall:
+    call = CoreCall(path, method, host, attempt)
+    try:
+        instrumentation.before_call(call)
+    except Exception:
+        pass
+    return call
+
+
+def finish_call(instrumentation: Instrumentation, call: CoreCall, status_code: Union[int, None] = None,
+                error: Union[BaseException, None] = None) -> None:
+    call.duration_seconds = monotonic() - call.started_at
+    call.status_code = status_code
+    call.error = error
+    if error is None:
+        call.outcome = OUTCOME_HTTP_ERROR if is_4xx_error(status_code) or is_5xx_error(status_code) else OUTCOME_OK
+    elif isinstance(error, (ConnectionError, NetworkError, ConnectTimeout)):
+        call.outcome = OUTCOME_CONNECTION_ERROR
+    elif isinstance(error, TimeoutException):
+        call.outcome = OUTCOME_TIMEOUT
+    elif isinstance(error, CancelledError):
+        call.outcome = OUTCOME_CANCELLED
+    else:
+        call.outcome = OUTCOME_ERROR
+    try:
+        instrumentation.after_call(call)
+    except Exception:
+        pass
+
+
+class PrometheusInstrumentation(Instrumentation):
+    """
+    Records the duration of the attempts (`<namespace>_request_duration_seconds`, by path,
+    method and outcome) and counts them (`<namespace>_requests_total`, also by host, status
+    code and whether they were retries). Needs the prometheus_client package.
+    """
+
+    def __init__(self, registry: Any = None, namespace: str = 'supertokens_core', buckets: Any = None):
+        try:
+            from prometheus_client import Counter, Histogram, REGISTRY
+        except ImportError:
+            raise_general_exception('PrometheusInstrumentation needs the prometheus_client package')
+        registry = REGISTRY if registry is None else registry
+        histogram_kwargs = {} if buckets is None else {'buckets': buckets}
+        self.duration = Histogram(namespace + '_request_duration_seconds', 'Duration of requests to the SuperTokens core',
+                                  ['path', 'method', 'outcome'], registry=registry, **histogram_kwargs)
+        self.requests = Counter(namespace + '_requests', 'Requests to the SuperTokens core',
+                                ['path', 'method', 'host', 'status_code', 'outcome', 'retry'], registry=registry)
+
+    def after_call(self, call: CoreCall) -> None:
+        self.duration.labels(call.path, call.method, call.outcome).observe(call.duration_seconds)
+        self.requests.labels(call.path, call.method, call.host, '' if call.status_code is None else str(call.status_code),
+                             call.outcome, 'true' if call.attempt > 1 else 'false').inc()
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Wraps each attempt in a client span, child of the current span. Needs the
+    opentelemetry-api package.
+    """
+
+    def __init__(self, tracer: Any = None):
+        try:
+            from opentelemetry import trace
+            from opentelemetry.trace import SpanKind, Status, StatusCode
+        except ImportError:
+            raise_general_exception('OpenTelemetryInstrumentation needs the opentelemetry-api package')
+        self.tracer = trace.get_tracer('supertokens_python') if tracer is None else tracer
+        self.__client_kind = SpanKind.CLIENT
+        self.__error_status = Status(StatusCode.ERROR)
+
+    def before_call(self, call: CoreCall) -> None:
+        call.state = self.tracer.start_span('SuperTokens core ' + call.method + ' ' + call.path,
+                                            kind=self.__client_kind, attributes={
+                                                'http.method': call.method,
+                                                'http.target': call.path,
+                                                'net.peer.name': call.host,
+                                                'supertokens.attempt': call.attempt
+                                            })
+
+    def after_call(self, call: CoreCall) -> None:
+        span = call.state
+        if span is None:
+            return
+        if call.status_code is not None:
+            span.set_attribute('http.status_code', call.status_code)
+        span.set_attribute('supertokens.outcome', call.outcome)
+        if call.outcome != OUTCOME_OK:
+            span.set_status(self.__error_status)
+        span.end()
@@ -0,0 +1,135 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from importlib import import_module
+from typing import Any, Union
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+from supertokens_python.exceptions import raise_general_exception
+
+
+class JSONCodec(ABC):
+    """
+    Encodes and decodes the JSON sent to / received from the core, put in tokens and
+    sent in responses. Encoding is compact, UTF-8 and works on bytes, so callers that
+    write to the network do not need an intermediate str.
+    """
+
+    @abstractmethod
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, str]) -> Any:
+        pass
+
+
+class StdlibJSONCodec(JSONCodec):
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(',', ':'),
+                          sort_keys=sort_keys).encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonJSONCodec(JSONCodec):
+    """
+    Non-str dict keys are converted to strings, as the stdlib does. Unlike the stdlib
+    codec, which raises for them, NaN and infinite floats are encoded as null.
+    """
+
+    def __init__(self):
+        self.orjson = import_module('orjson')
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        option = self.orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= self.orjson.OPT_SORT_KEYS
+        return self.orjson.dumps(obj, option=option)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self.orjson.loads(data)
+
+
+class UjsonJSONCodec(JSONCodec):
+    def __init__(self):
+        self.ujson = import_module('ujson')
+
+    def dumps(self, obj: Any, sort_keys: bool = False) -> bytes:
+        return self.ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False,
+                                sort_keys=sort_keys).encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self.ujson.loads(data)
+
+
+CODECS = {
+    'stdlib': StdlibJSONCodec,
+    'orjson': OrjsonJSONCodec,
+    'ujson': UjsonJSONCodec
+}
+
+JSONCodecName = Literal['stdlib', 'orjson', 'ujson', 'auto']
+
+
+def create_json_codec(name: JSONCodecName) -> JSONCodec:
+    """
+    'auto' picks orjson if it is installed, then ujson, and falls back to the stdlib.
+    See OrjsonJSONCodec for how orjson differs from the stdlib.
+    """
+    if name == 'auto':
+        for codec in ('orjson', 'ujson'):
+            try:
+                return CODECS[codec]()
+            except ImportError:
+                pass
+        return StdlibJSONCodec()
+    if name not in CODECS:
+        raise_general_exception('json_codec must be one of stdlib, orjson, ujson or auto')
+    try:
+        return CODECS[name]()
+    except ImportError:
+        raise_general_exception('json_codec is set to ' + name + ' but it is not installed')
+
+
+class JSON:
+    __codec: JSONCodec = StdlibJSONCodec()
+
+    @staticmethod
+    def set_codec(codec: Union[JSONCodec, JSONCodecName, None]):
+        if codec is None:
+            codec = StdlibJSONCodec()
+        elif not isinstance(codec, JSONCodec):
+            codec = create_json_codec(codec)
+        JSON.__codec = codec
+
+    @staticmethod
+    def get_codec() -> JSONCodec:
+        return JSON.__codec
+
+
+def json_dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    return JSON.get_codec().dumps(obj, sort_keys)
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    return JSON.get_codec().loads(data)
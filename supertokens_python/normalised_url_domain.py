@@ -16,6 +16,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
+from .core_transport import UNIX_SOCKET_SCHEME
 from .utils import is_an_ip_address
 
 if TYPE_CHECKING:
@@ -24,13 +25,24 @@ from .exceptions import raise_general_exception
 
 
 class NormalisedURLDomain:
-    def __init__(self, url: str):
-        self.__value = normalise_domain_path_or_throw_error(url)
+    def __init__(self, url: str, allow_unix_socket: bool = False):
+        if allow_unix_socket and url.strip().lower().startswith(UNIX_SOCKET_SCHEME):
+            self.__value = normalise_unix_socket_or_throw_error(url)
+        else:
+            self.__value = normalise_domain_path_or_throw_error(url)
 
     def get_as_string_dangerous(self):
         return self.__value
 
 
+def normalise_unix_socket_or_throw_error(input_str: str) -> str:
+    # the path of the socket is case sensitive, unlike the rest of a domain
+    path = input_str.strip()[len(UNIX_SOCKET_SCHEME):]
+    if not path.startswith('/') or path.endswith('/'):
+        raise_general_exception('Please provide the absolute path of the unix socket, e.g. unix:///tmp/core.sock')
+    return UNIX_SOCKET_SCHEME + path
+
+
 def normalise_domain_path_or_throw_error(
         input_str: str, ignore_protocol=False) -> str:
     input_str = input_str.strip().lower()
@@ -0,0 +1,107 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import asyncio
+from queue import Queue, Full
+from threading import Thread, Event
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Union
+
+from supertokens_python.querier import Querier
+
+DEFAULT_BUFFER_SIZE = 2
+
+GetPage = Callable[[Union[str, None]], Awaitable[Any]]
+
+
+async def iter_pages(get_page: GetPage, pagination_token: Union[str, None] = None,
+                     buffer_size: int = DEFAULT_BUFFER_SIZE) -> AsyncIterator[Any]:
+    """
+    Yields the pages returned by `get_page(pagination_token)`, following their
+    `next_pagination_token` until it is None. Up to `buffer_size` pages are fetched
+    ahead while the caller is still processing the current one.
+    """
+    pages = asyncio.Queue(max(buffer_size, 1))
+
+    async def fetch_pages():
+        token = pagination_token
+        try:
+            while True:
+                page = await get_page(token)
+                await pages.put(page)
+                token = page.next_pagination_token
+                if token is None:
+                    return
+        except Exception as e:
+            await pages.put(e)
+
+    fetcher = asyncio.get_running_loop().create_task(fetch_pages())
+    try:
+        while True:
+            page = await pages.get()
+            if isinstance(page, Exception):
+                raise page
+            yield page
+            if page.next_pagination_token is None:
+                return
+    finally:
+        fetcher.cancel()
+
+
+def sync_iter_pages(get_page: GetPage, pagination_token: Union[str, None] = None,
+                    buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[Any]:
+    """
+    Same as iter_pages, for callers without an event loop. The pages are fetched on a
+    separate thread so that fetching keeps going while the caller processes a page.
+    That thread's loop only lives for one iteration, so the connections to the core
+    opened from it are closed before it ends.
+    """
+    pages = Queue(max(buffer_size, 1))
+    stopped = Event()
+
+    def put(page):
+        while not stopped.is_set():
+            try:
+                pages.put(page, timeout=0.1)
+                return
+            except Full:
+                pass
+
+    async def fetch_pages():
+        token = pagination_token
+        try:
+            while not stopped.is_set():
+                page = await get_page(token)
+                put(page)
+                token = page.next_pagination_token
+                if token is None:
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            await Querier.close_connections()
+
+    fetcher = Thread(target=asyncio.run, args=(fetch_pages(),), name='supertokens-pagination', daemon=True)
+    fetcher.start()
+    try:
+        while True:
+            page = pages.get()
+            if isinstance(page, Exception):
+                raise page
+            yield page
+            if page.next_pagination_token is None:
+                fetcher.join()
+                return
+    finally:
+        stopped.set()
@@ -13,42 +13,154 @@
 # under the License.
 from __future__ import annotations
 
-from json import JSONDecodeError
+import asyncio
 from os import environ
-from typing import TYPE_CHECKING
+from time import monotonic
+from typing import TYPE_CHECKING, Dict, List, Union
 
-from httpx import AsyncClient, NetworkError, ConnectTimeout
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+from httpx import NetworkError, ConnectTimeout, TimeoutException
 
 from .constants import (
     API_VERSION,
+    HELLO,
     API_KEY_HEADER,
     RID_KEY_HEADER,
     SUPPORTED_CDI_VERSIONS,
     API_VERSION_HEADER
 )
+from .normalised_url_domain import NormalisedURLDomain
 from .normalised_url_path import NormalisedURLPath
+from .bulkhead import Bulkhead
+from .hedging import Hedger
+from .core_transport import CoreTransports
+from .host_discovery import HostProvider, split_connection_uri
+from .background_tasks import BackgroundTaskSupervisor
+from .retry_policy import TimeoutConfig, RetryConfig, core_deadline, get_remaining_budget
+from .sharding import get_shard_key
+from .instrumentation import Instrumentation, start_call, finish_call
 
 if TYPE_CHECKING:
-    pass
-from .exceptions import raise_general_exception
+    from .bulkhead import BulkheadConfig
+    from .hedging import HedgingConfig
+    from .sharding import ShardRouter
+    from .supertokens import SupertokensConfig
+from .exceptions import raise_general_exception, CoreTimeoutError
 from .utils import (
     is_4xx_error,
     is_5xx_error,
     find_max_version
 )
 from .process_state import AllowedProcessStates, ProcessState
+from .json_codec import json_dumps, json_loads
+
+
+class CoreCluster:
+    """
+    One core cluster and everything kept about it: its hosts, API key and API version, the
+    position of the host rotation, its pooled connections and the policies of the requests
+    sent to it.
+    """
+
+    def __init__(self, hosts: List[NormalisedURLDomain], api_key: Union[str, None] = None,
+                 bulkhead: Union[BulkheadConfig, None] = None, timeouts: Union[TimeoutConfig, None] = None,
+                 retry: Union[RetryConfig, None] = None, hedging: Union[HedgingConfig, None] = None,
+                 http2: bool = False, host_provider: Union[HostProvider, None] = None,
+                 instrumentation: Union[Instrumentation, None] = None):
+        # the list is updated in place by refresh_hosts
+        self.hosts = list(hosts)
+        self.api_key = api_key
+        self.api_version: Union[str, None] = None
+        self.last_tried_index = 0
+        self.bulkhead = None if bulkhead is None else Bulkhead(bulkhead)
+        self.hedger = None if hedging is None else Hedger(hedging)
+        self.transports = CoreTransports(http2)
+        self.host_provider = host_provider
+        self.hosts_refresh_at = 0.0
+        self.hosts_refreshing = False
+        self.timeouts = TimeoutConfig() if timeouts is None else timeouts
+        self.retry = RetryConfig() if retry is None else retry
+        self.instrumentation = instrumentation
+
+    @staticmethod
+    def from_config(config: SupertokensConfig) -> CoreCluster:
+        hosts = [NormalisedURLDomain(host, allow_unix_socket=True) for host in split_connection_uri(config.connection_uri)]
+        return CoreCluster(hosts, config.api_key, config.bulkhead, config.timeouts, config.retry, config.hedging,
+                           config.http2, config.host_provider, config.instrumentation)
+
+    async def refresh_hosts(self):
+        """
+        Replaces the hosts with those of the host provider, unless it fails or gives none.
+        """
+        provider = self.host_provider
+        if provider is None:
+            return
+        try:
+            hosts = [NormalisedURLDomain(host, allow_unix_socket=True) for host in await provider.get_hosts()]
+        except Exception:
+            hosts = []
+        finally:
+            self.hosts_refresh_at = monotonic() + provider.ttl_seconds
+            self.hosts_refreshing = False
+        if len(hosts) == 0:
+            return
+
+        old_hosts = {host.get_as_string_dangerous() for host in self.hosts}
+        new_hosts = {host.get_as_string_dangerous() for host in hosts}
+        self.hosts[:] = hosts
+        self.transports.drain(old_hosts - new_hosts, provider.drain_seconds)
+        await self.transports.warm_up(new_hosts - old_hosts, HELLO, self.timeouts.get_timeout(HELLO))
+
+    async def refresh_hosts_if_due(self, mode: Union[Literal['asgi', 'wsgi'], None] = None):
+        if self.host_provider is None:
+            return
+        if len(self.hosts) == 0:
+            # there is nothing to send the request to until the provider answers
+            await self.refresh_hosts()
+        elif not self.hosts_refreshing and monotonic() >= self.hosts_refresh_at:
+            self.hosts_refreshing = True
+            # outside of ASGI apps the running loop can be the one of a sync() call, which
+            # stops with the request, so the refresh goes on the supervisor's thread
+            refresh = BackgroundTaskSupervisor.get_instance().schedule(
+                self.refresh_hosts, 'asgi' if mode == 'asgi' else 'wsgi')
+            if refresh is None:
+                self.hosts_refreshing = False
+            else:
+                # refresh_hosts does not run at all if the refresh is cancelled before it starts
+                refresh.add_done_callback(self.__refresh_done)
+
+    def __refresh_done(self, _):
+        self.hosts_refreshing = False
+
+    def next_host(self, used_hosts: Union[List[str], None]) -> str:
+        for _ in range(len(self.hosts)):
+            # the hosts can have changed since the index was last moved
+            self.last_tried_index %= len(self.hosts)
+            host = self.hosts[self.last_tried_index].get_as_string_dangerous()
+            self.last_tried_index += 1
+            self.last_tried_index %= len(self.hosts)
+            if used_hosts is None or host not in used_hosts:
+                break
+        if used_hosts is not None:
+            used_hosts.append(host)
+        return host
 
 
 class Querier:
     __init_called = False
-    __hosts = None
-    __api_key = None
-    __api_version = None
-    __last_tried_index: int = 0
+    __cluster: Union[CoreCluster, None] = None
+    __shards: Dict[str, CoreCluster] = {}
+    __router: Union[ShardRouter, None] = None
+    __mode: Union[Literal['asgi', 'wsgi'], None] = None
     __hosts_alive_for_testing = set()
 
-    def __init__(self, hosts: list, rid_to_core=None):
-        self.__hosts = hosts
+    def __init__(self, cluster: Union[CoreCluster, None] = None, rid_to_core=None):
+        # without a cluster, each request goes to the cluster of its shard key (or the default one)
+        self.__pinned_cluster = cluster
         self.__rid_to_core = None
         if rid_to_core is not None:
             self.__rid_to_core = rid_to_core
@@ -69,24 +181,26 @@ class Querier:
                 None, 'calling testing function in non testing env')
         return Querier.__hosts_alive_for_testing
 
-    async def get_api_version(self):
-        if Querier.__api_version is not None:
-            return Querier.__api_version
+    async def get_api_version(self, cluster: Union[CoreCluster, None] = None):
+        if cluster is None:
+            cluster = self.get_cluster_of_request()
+        if cluster.api_version is not None:
+            return cluster.api_version
 
         ProcessState.get_instance().add_state(
             AllowedProcessStates.CALLING_SERVICE_IN_GET_API_VERSION)
+        await cluster.refresh_hosts_if_due(Querier.__mode)
 
-        async def f(url):
+        async def f(client, url, timeout):
             headers = {}
-            if Querier.__api_key is not None:
+            if cluster.api_key is not None:
                 headers = {
-                    API_KEY_HEADER: Querier.__api_key
+                    API_KEY_HEADER: cluster.api_key
                 }
-            async with AsyncClient() as client:
-                return await client.get(url, headers=headers)
+            return await client.get(url, headers=headers, timeout=timeout)
 
         response = await self.__send_request_helper(
-            NormalisedURLPath(API_VERSION), 'GET', f, len(self.__hosts))
+            cluster, NormalisedURLPath(API_VERSION), 'GET', f, len(cluster.hosts))
         cdi_supported_by_server = response['versions']
         api_version = find_max_version(
             cdi_supported_by_server,
@@ -97,36 +211,78 @@ class Querier:
                                           'SDK. Please visit https://supertokens.io/docs/community/compatibility-table '
                                           'to find the right versions')
 
-        Querier.__api_version = api_version
+        cluster.api_version = api_version
         # TODO: server-less
-        return Querier.__api_version
+        return cluster.api_version
+
+    @staticmethod
+    def get_cluster(shard: Union[str, None] = None) -> CoreCluster:
+        """
+        Returns the default cluster, or the cluster of the given shard.
+        """
+        if shard is None:
+            return Querier.__cluster
+        if shard not in Querier.__shards:
+            raise_general_exception('Unknown core shard: ' + shard)
+        return Querier.__shards[shard]
+
+    def get_cluster_of_request(self) -> CoreCluster:
+        if self.__pinned_cluster is not None:
+            return self.__pinned_cluster
+        key = get_shard_key()
+        if key is None or Querier.__router is None:
+            return Querier.__cluster
+        return Querier.get_cluster(Querier.__router.get_shard(key, list(Querier.__shards)))
+
+    @staticmethod
+    def __get_clusters() -> List[CoreCluster]:
+        if Querier.__cluster is None:
+            return []
+        return [Querier.__cluster, *Querier.__shards.values()]
+
+    @staticmethod
+    async def refresh_hosts():
+        for cluster in Querier.__get_clusters():
+            await cluster.refresh_hosts()
+
+    @staticmethod
+    async def close_connections():
+        for cluster in Querier.__get_clusters():
+            await cluster.transports.close()
 
     @staticmethod
     def get_instance(rid_to_core=None):
-        if (not Querier.__init_called) or (Querier.__hosts is None):
+        if (not Querier.__init_called) or (Querier.__cluster is None):
             # TODO
             raise Exception(
                 "Please call the supertokens.init function before using SuperTokens")
-        return Querier(Querier.__hosts, rid_to_core)
+        return Querier(None, rid_to_core)
 
     @staticmethod
-    def init(hosts, api_key=None):
+    def init(hosts, api_key=None, bulkhead: Union[BulkheadConfig, None] = None,
+             timeouts: Union[TimeoutConfig, None] = None, retry: Union[RetryConfig, None] = None,
+             hedging: Union[HedgingConfig, None] = None, http2: bool = False,
+             host_provider: Union[HostProvider, None] = None,
+             shards: Union[Dict[str, CoreCluster], None] = None, router: Union[ShardRouter, None] = None,
+             instrumentation: Union[Instrumentation, None] = None,
+             mode: Union[Literal['asgi', 'wsgi'], None] = None):
         if not Querier.__init_called:
             Querier.__init_called = True
-            Querier.__hosts = hosts
-            Querier.__api_key = api_key
-            Querier.__api_version = None
-            Querier.__last_tried_index = 0
+            Querier.__cluster = CoreCluster(hosts, api_key, bulkhead, timeouts, retry, hedging, http2, host_provider,
+                                            instrumentation)
+            Querier.__shards = {} if shards is None else shards
+            Querier.__router = router
+            Querier.__mode = mode
             Querier.__hosts_alive_for_testing = set()
 
-    async def __get_headers_with_api_version(self, path):
+    async def __get_headers_with_api_version(self, cluster: CoreCluster, path):
         headers = {
-            API_VERSION_HEADER: await self.get_api_version()
+            API_VERSION_HEADER: await self.get_api_version(cluster)
         }
-        if Querier.__api_key is not None:
+        if cluster.api_key is not None:
             headers = {
                 **headers,
-                API_KEY_HEADER: Querier.__api_key
+                API_KEY_HEADER: cluster.api_key
             }
         if path.is_a_recipe_path() and self.__rid_to_core is not None:
             headers = {
@@ -138,12 +294,13 @@ class Querier:
     async def send_get_request(self, path: NormalisedURLPath, params=None):
         if params is None:
             params = {}
+        cluster = self.get_cluster_of_request()
 
-        async def f(url):
-            async with AsyncClient() as client:
-                return await client.get(url, params=params, headers=await self.__get_headers_with_api_version(path))
+        async def f(client, url, timeout):
+            return await client.get(url, params=params, headers=await self.__get_headers_with_api_version(cluster, path),
+                                    timeout=timeout)
 
-        return await self.__send_request_helper(path, 'GET', f, len(self.__hosts))
+        return await self.__send_request(cluster, path, 'GET', f)
 
     async def send_post_request(self, path: NormalisedURLPath, data=None, test=False):
         if data is None:
@@ -153,68 +310,143 @@ class Querier:
                 environ['SUPERTOKENS_ENV'] == 'testing') and test:
             return data
 
-        headers = await self.__get_headers_with_api_version(path)
+        cluster = self.get_cluster_of_request()
+        headers = await self.__get_headers_with_api_version(cluster, path)
         headers['content-type'] = 'application/json; charset=utf-8'
+        body = json_dumps(data)
 
-        async def f(url):
-            async with AsyncClient() as client:
-                return await client.post(url, json=data, headers=headers)
+        async def f(client, url, timeout):
+            return await client.post(url, content=body, headers=headers, timeout=timeout)
 
-        return await self.__send_request_helper(path, 'POST', f, len(self.__hosts))
+        return await self.__send_request(cluster, path, 'POST', f)
 
     async def send_delete_request(self, path: NormalisedURLPath):
+        cluster = self.get_cluster_of_request()
 
-        async def f(url):
-            async with AsyncClient() as client:
-                return await client.delete(url, headers=await self.__get_headers_with_api_version(path))
+        async def f(client, url, timeout):
+            return await client.delete(url, headers=await self.__get_headers_with_api_version(cluster, path),
+                                       timeout=timeout)
 
-        return await self.__send_request_helper(path, 'DELETE', f, len(self.__hosts))
+        return await self.__send_request(cluster, path, 'DELETE', f)
 
     async def send_put_request(self, path: NormalisedURLPath, data=None):
         if data is None:
             data = {}
 
-        headers = await self.__get_headers_with_api_version(path)
+        cluster = self.get_cluster_of_request()
+        headers = await self.__get_headers_with_api_version(cluster, path)
         headers['content-type'] = 'application/json; charset=utf-8'
+        body = json_dumps(data)
 
-        async def f(url):
-            async with AsyncClient() as client:
-                return await client.put(url, json=data, headers=headers)
+        async def f(client, url, timeout):
+            return await client.put(url, content=body, headers=headers, timeout=timeout)
 
-        return await self.__send_request_helper(path, 'PUT', f, len(self.__hosts))
+        return await self.__send_request(cluster, path, 'PUT', f)
 
-    async def __send_request_helper(self, path: NormalisedURLPath, method, http_function, no_of_tries):
-        if no_of_tries == 0:
-            raise_general_exception('No SuperTokens core available to query')
-
-        try:
-            current_host = self.__hosts[Querier.__last_tried_index].get_as_string_dangerous(
-            )
-            Querier.__last_tried_index += 1
-            Querier.__last_tried_index %= len(self.__hosts)
-            url = current_host + path.get_as_string_dangerous()
-
-            ProcessState.get_instance().add_state(
-                AllowedProcessStates.CALLING_SERVICE_IN_REQUEST_HELPER)
-            response = await http_function(url)
-            if ('SUPERTOKENS_ENV' in environ) and (
-                    environ['SUPERTOKENS_ENV'] == 'testing'):
-                Querier.__hosts_alive_for_testing.add(current_host)
-
-            if is_4xx_error(response.status_code) or is_5xx_error(
-                    response.status_code):
-                raise_general_exception('SuperTokens core threw an error for a ' + method + ' request to path: ' +
-                                        path.get_as_string_dangerous() + ' with status code: ' + str(
-                                            response.status_code) + ' and message: ' +
-                                        response.text)
+    async def __send_request(self, cluster: CoreCluster, path: NormalisedURLPath, method, http_function):
+        await cluster.refresh_hosts_if_due(Querier.__mode)
+        bulkhead = cluster.bulkhead
+        if bulkhead is None:
+            return await self.__send_request_to_hosts(cluster, path, method, http_function)
 
+        # the time spent queued counts against the deadline of the request
+        with core_deadline(cluster.timeouts.get_deadline(path.get_as_string_dangerous())):
+            await bulkhead.acquire(bulkhead.get_priority(path.get_as_string_dangerous()), get_remaining_budget())
+            start = monotonic()
             try:
-                return response.json()
-            except JSONDecodeError:
-                return response.text
-
-        except (ConnectionError, NetworkError, ConnectTimeout):
-            return await self.__send_request_helper(
-                path, method, http_function, no_of_tries - 1)
-        except Exception as e:
-            raise_general_exception(e)
+                return await self.__send_request_to_hosts(cluster, path, method, http_function)
+            finally:
+                bulkhead.release(monotonic() - start)
+
+    async def __send_request_to_hosts(self, cluster: CoreCluster, path: NormalisedURLPath, method, http_function):
+        hedger = cluster.hedger
+        if hedger is None or len(cluster.hosts) < 2 or \
+                not hedger.should_hedge(method, path.get_as_string_dangerous()):
+            return await self.__send_request_helper(cluster, path, method, http_function, len(cluster.hosts))
+
+        # both requests share the deadline, and each avoids the hosts the other one used
+        used_hosts = []
+        with core_deadline(cluster.timeouts.get_deadline(path.get_as_string_dangerous())):
+            return await hedger.run(lambda: self.__send_request_helper(cluster, path, method, http_function,
+                                                                       len(cluster.hosts), used_hosts))
+
+    async def __send_request_helper(self, cluster: CoreCluster, path: NormalisedURLPath, method, http_function,
+                                    no_of_tries, used_hosts: Union[List[str], None] = None):
+        path_str = path.get_as_string_dangerous()
+        retry = cluster.retry
+        retryable = retry.is_retryable(method, path_str)
+        instrumentation = cluster.instrumentation
+        attempt = 1
+        # unlike attempt, this also counts the failovers to other hosts
+        sends = 0
+
+        with core_deadline(cluster.timeouts.get_deadline(path_str)):
+            while True:
+                if no_of_tries == 0:
+                    raise_general_exception('No SuperTokens core available to query')
+
+                timeout = cluster.timeouts.get_timeout(path_str)
+                remaining = get_remaining_budget()
+                if remaining is not None:
+                    if remaining <= 0:
+                        raise CoreTimeoutError('Deadline exceeded for a ' + method + ' request to path: ' + path_str)
+                    timeout = min(timeout, remaining)
+
+                try:
+                    current_host = cluster.next_host(used_hosts)
+                    url = cluster.transports.get_url(current_host, path_str)
+
+                    ProcessState.get_instance().add_state(
+                        AllowedProcessStates.CALLING_SERVICE_IN_REQUEST_HELPER)
+                    sends += 1
+                    if instrumentation is None:
+                        response = await http_function(cluster.transports.get_client(current_host), url, timeout)
+                    else:
+                        call = start_call(instrumentation, path_str, method, current_host, sends)
+                        try:
+                            response = await http_function(cluster.transports.get_client(current_host), url, timeout)
+                        except BaseException as e:
+                            finish_call(instrumentation, call, error=e)
+                            raise
+                        finish_call(instrumentation, call, response.status_code)
+                    if ('SUPERTOKENS_ENV' in environ) and (
+                            environ['SUPERTOKENS_ENV'] == 'testing'):
+                        Querier.__hosts_alive_for_testing.add(current_host)
+
+                    if response.status_code in retry.retry_on_status and retryable and \
+                            attempt < retry.max_attempts and await self.__back_off(retry, attempt):
+                        attempt += 1
+                        continue
+
+                    if is_4xx_error(response.status_code) or is_5xx_error(
+                            response.status_code):
+                        raise_general_exception('SuperTokens core threw an error for a ' + method + ' request to path: ' +
+                                                path_str + ' with status code: ' + str(
+                                                    response.status_code) + ' and message: ' +
+                                                response.text)
+
+                    try:
+                        return json_loads(response.content)
+                    except ValueError:
+                        return response.text
+
+                except (ConnectionError, NetworkError, ConnectTimeout):
+                    no_of_tries -= 1
+                except TimeoutException:
+                    if retryable and attempt < retry.max_attempts and await self.__back_off(retry, attempt):
+                        attempt += 1
+                        continue
+                    raise CoreTimeoutError('SuperTokens core did not answer a ' + method + ' request to path: ' +
+                                           path_str + ' in time')
+                except Exception as e:
+                    raise_general_exception(e)
+
+    @staticmethod
+    async def __back_off(retry: RetryConfig, attempt: int) -> bool:
+        # returns False, without waiting, if the retry would not fit in the deadline
+        delay = retry.get_delay(attempt)
+        remaining = get_remaining_budget()
+        if remaining is not None and delay >= remaining:
+            return False
+        await asyncio.sleep(delay)
+        return True
@@ -0,0 +1,219 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from math import ceil
+from threading import Lock
+from time import time
+from typing import TYPE_CHECKING, Callable, List, Tuple, Union
+
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+from supertokens_python.utils import send_non_200_response
+
+if TYPE_CHECKING:
+    from supertokens_python.framework.request import BaseRequest
+    from supertokens_python.framework.response import BaseResponse
+
+SIGN_IN_API = 'signin'
+SIGN_UP_API = 'signup'
+GENERATE_PASSWORD_RESET_TOKEN_API = 'generate_password_reset_token'
+CREATE_CODE_API = 'create_code'
+RATE_LIMITED_APIS = (SIGN_IN_API, SIGN_UP_API, GENERATE_PASSWORD_RESET_TOKEN_API, CREATE_CODE_API)
+
+DEFAULT_SHARDS = 16
+DEFAULT_MAX_KEYS_PER_SHARD = 10000
+DEFAULT_PRUNE_INTERVAL_SECONDS = 60
+
+RateLimitKey = Union[Literal['ip', 'email', 'phone_number'], Callable[['BaseRequest'], Union[str, None]]]
+
+
+class RateLimitRule:
+    """
+    A token bucket per value of `key`: each request takes a token, and the bucket holds at
+    most `capacity` tokens and gets `refill_per_second` back every second. `key` is the client
+    IP, the email or phone number in the request, or a function of the request. `apis` are the
+    APIs the rule applies to (all of RATE_LIMITED_APIS by default), and they share the buckets.
+    """
+
+    def __init__(self, key: RateLimitKey, capacity: int, refill_per_second: float,
+                 apis: Union[List[str], None] = None):
+        if capacity <= 0 or refill_per_second <= 0:
+            raise Exception('capacity and refill_per_second must be positive numbers')
+        self.key = key
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.apis = list(RATE_LIMITED_APIS) if apis is None else apis
+
+
+class RateLimitStore(ABC):
+    """
+    Keeps the token buckets. The in-memory store limits each process on its own; a shared
+    store (e.g. SQLiteRateLimitStore, or one backed by Redis) limits all the processes using it.
+    """
+
+    @abstractmethod
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """
+        Takes a token from the bucket of key. Returns 0 if there was one, otherwise the
+        number of seconds until there is. It is awaited on the request path, so stores that
+        block (on a file or the network) must do so off the event loop.
+        """
+        pass
+
+
+def _take_token(tokens: float, updated_at: float, now: float, capacity: int,
+                refill_per_second: float) -> Tuple[float, float]:
+    # returns the tokens left in the bucket and the seconds to wait (0 if a token was taken)
+    tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+    if tokens >= 1:
+        return tokens - 1, 0
+    return tokens, (1 - tokens) / refill_per_second
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    def __init__(self, shards: int = DEFAULT_SHARDS, max_keys_per_shard: int = DEFAULT_MAX_KEYS_PER_SHARD):
+        # the buckets are split across shards with their own lock, so that concurrent
+        # requests (from the syncio threads) for different keys do not wait for each other.
+        # The least recently used buckets are dropped, which only ever refills them
+        self.max_keys_per_shard = max_keys_per_shard
+        self.__shards = [(Lock(), OrderedDict()) for _ in range(shards)]
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        lock, buckets = self.__shards[hash(key) % len(self.__shards)]
+        now = time()
+        with lock:
+            tokens, updated_at = buckets.get(key, (capacity, now))
+            tokens, wait = _take_token(tokens, updated_at, now, capacity, refill_per_second)
+            buckets[key] = (tokens, now)
+            buckets.move_to_end(key)
+            if len(buckets) > self.max_keys_per_shard:
+                buckets.popitem(last=False)
+        return wait
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """
+    Shares the buckets between the worker processes of one host through an SQLite file.
+    Buckets are taken from on the default executor, since waiting for the file lock would
+    block the event loop. Keys come from the requests, so every `prune_interval_seconds`
+    the buckets that have refilled completely are deleted (a missing bucket is a full one).
+    """
+
+    def __init__(self, path: str, prune_interval_seconds: float = DEFAULT_PRUNE_INTERVAL_SECONDS):
+        self.path = path
+        self.prune_interval_seconds = prune_interval_seconds
+        self.__lock = Lock()
+        self.__pruned_at = time()
+        self.__connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self.__connection.execute('CREATE TABLE IF NOT EXISTS supertokens_rate_limit_buckets ('
+                                  'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, '
+                                  'full_at REAL NOT NULL)')
+        self.__connection.execute('CREATE INDEX IF NOT EXISTS supertokens_rate_limit_buckets_full_at '
+                                  'ON supertokens_rate_limit_buckets (full_at)')
+
+    async def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        return await asyncio.get_running_loop().run_in_executor(None, self.__take, key, capacity,
+                                                                refill_per_second)
+
+    def __take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time()
+        with self.__lock:
+            self.__connection.execute('BEGIN IMMEDIATE')
+            try:
+                row = self.__connection.execute(
+                    'SELECT tokens, updated_at FROM supertokens_rate_limit_buckets WHERE key = ?', (key,)).fetchone()
+                tokens, updated_at = (capacity, now) if row is None else row
+                tokens, wait = _take_token(tokens, updated_at, now, capacity, refill_per_second)
+                self.__connection.execute(
+                    'INSERT OR REPLACE INTO supertokens_rate_limit_buckets (key, tokens, updated_at, full_at) '
+                    'VALUES (?, ?, ?, ?)', (key, tokens, now, now + (capacity - tokens) / refill_per_second))
+                if now - self.__pruned_at >= self.prune_interval_seconds:
+                    self.__connection.execute('DELETE FROM supertokens_rate_limit_buckets WHERE full_at <= ?', (now,))
+                    self.__pruned_at = now
+                self.__connection.execute('COMMIT')
+            except BaseException:
+                self.__connection.execute('ROLLBACK')
+                raise
+        return wait
+
+
+class RateLimitConfig:
+    """
+    Enables rate limiting of the sign in / sign up, password reset token and passwordless
+    create code APIs. A request that goes over any of `rules` gets a 429 with a Retry-After
+    header before the core is called. The client IP comes from AppInfo.get_client_ip.
+    """
+
+    def __init__(self, rules: List[RateLimitRule], store: Union[RateLimitStore, None] = None):
+        self.rules = rules
+        self.store = InMemoryRateLimitStore() if store is None else store
+
+
+class ApiRateLimiter:
+    def __init__(self, config: RateLimitConfig, get_client_ip: Callable[[BaseRequest], Union[str, None]]):
+        self.config = config
+        self.get_client_ip = get_client_ip
+
+    def get_key_value(self, rule: RateLimitRule, request: BaseRequest, email: Union[str, None],
+                      phone_number: Union[str, None]) -> Union[str, None]:
+        if rule.key == 'ip':
+            return self.get_client_ip(request)
+        if rule.key == 'email':
+            return None if email is None else email.lower()
+        if rule.key == 'phone_number':
+            return phone_number
+        return rule.key(request)
+
+    async def check(self, api: str, request: BaseRequest, email: Union[str, None] = None,
+                    phone_number: Union[str, None] = None) -> float:
+        """
+        Takes a token for every rule of api. Returns 0 if the request is admitted, otherwise
+        the number of seconds after which it can be retried.
+        """
+        retry_after = 0
+        for index, rule in enumerate(self.config.rules):
+            if api not in rule.apis:
+                continue
+            value = self.get_key_value(rule, request, email, phone_number)
+            if value is None:
+                continue
+            wait = await self.config.store.take(str(index) + ':' + value, rule.capacity, rule.refill_per_second)
+            retry_after = max(retry_after, wait)
+        return retry_after
+
+
+async def enforce_rate_limit(api: str, request: BaseRequest, response: BaseResponse,
+                             email: Union[str, None] = None,
+                             phone_number: Union[str, None] = None) -> Union[BaseResponse, None]:
+    """
+    Returns a 429 response if the request goes over the configured rate limits, or None if it
+    can go ahead.
+    """
+    from supertokens_python.supertokens import Supertokens
+    rate_limiter = Supertokens.get_instance().rate_limiter
+    if rate_limiter is None:
+        return None
+    retry_after = await rate_limiter.check(api, request, email, phone_number)
+    if retry_after <= 0:
+        return None
+    response.set_header('Retry-After', str(ceil(retry_after)))
+    return send_non_200_response('Too many requests', 429, response)
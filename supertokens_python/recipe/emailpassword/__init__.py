@@ -16,17 +16,20 @@ from typing import Union
 from .recipe import EmailPasswordRecipe
 from . import exceptions
 from .utils import InputSignUpFeature, InputResetPasswordUsingTokenFeature, InputOverrideConfig, InputFormField
-from ..emailverification.utils import InputEmailVerificationConfig
+from ..emailverification.utils import InputEmailVerificationConfig, IsEmailVerifiedCacheConfig
+from ...user_existence_cache import UserExistenceCacheConfig
 
 
 def init(sign_up_feature: Union[InputSignUpFeature, None] = None,
          reset_password_using_token_feature: Union[
              InputResetPasswordUsingTokenFeature, None] = None,
          email_verification_feature: Union[InputEmailVerificationConfig, None] = None,
-         override: Union[InputOverrideConfig, None] = None):
+         override: Union[InputOverrideConfig, None] = None,
+         user_existence_cache: Union[UserExistenceCacheConfig, None] = None):
     return EmailPasswordRecipe.init(
         sign_up_feature,
         reset_password_using_token_feature,
         email_verification_feature,
-        override
+        override,
+        user_existence_cache
     )
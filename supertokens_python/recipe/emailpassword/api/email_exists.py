@@ -17,6 +17,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from supertokens_python.recipe.emailpassword.interfaces import APIOptions, APIInterface
 from supertokens_python.exceptions import raise_bad_input_exception
+from supertokens_python.utils import send_non_200_response
 
 
 async def handle_email_exists_api(api_implementation: APIInterface, api_options: APIOptions):
@@ -26,6 +27,10 @@ async def handle_email_exists_api(api_implementation: APIInterface, api_options:
     if email is None or not isinstance(email, str):
         raise_bad_input_exception('Please provide the email as a GET param')
 
+    cache = api_options.config.user_existence_cache
+    if cache is not None and cache.is_throttled(api_options.request):
+        return send_non_200_response('Too many requests', 429, api_options.response)
+
     response = await api_implementation.email_exists_get(email, api_options)
     api_options.response.set_json_content(response.to_json())
 
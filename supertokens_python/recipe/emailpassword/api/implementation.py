@@ -15,7 +15,9 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, List
 
-from supertokens_python.recipe.emailpassword.constants import FORM_FIELD_EMAIL_ID, FORM_FIELD_PASSWORD_ID
+from supertokens_python.delivery_queue import deliver
+from supertokens_python.recipe.emailpassword.constants import FORM_FIELD_EMAIL_ID, FORM_FIELD_PASSWORD_ID, \
+    PASSWORD_RESET_EMAIL_DELIVERY
 from supertokens_python.recipe.emailpassword.interfaces import (
     APIInterface, EmailExistsGetOkResponse, GeneratePasswordResetTokenPostOkResponse,
     PasswordResetPostOkResponse, PasswordResetPostInvalidTokenResponse, SignInPostOkResponse,
@@ -38,8 +40,13 @@ class APIImplementation(APIInterface):
         super().__init__()
 
     async def email_exists_get(self, email: str, api_options: APIOptions) -> EmailExistsGetResponse:
-        user = await api_options.recipe_implementation.get_user_by_email(email)
-        return EmailExistsGetOkResponse(user is not None)
+        cache = api_options.config.user_existence_cache
+        exists = None if cache is None else cache.get(('email', email))
+        if exists is None:
+            exists = await api_options.recipe_implementation.get_user_by_email(email) is not None
+            if cache is not None:
+                cache.set(('email', email), exists)
+        return EmailExistsGetOkResponse(exists)
 
     async def generate_password_reset_token_post(self, form_fields: List[FormField],
                                                  api_options: APIOptions) -> GeneratePasswordResetTokenPostResponse:
@@ -61,8 +68,12 @@ class APIImplementation(APIInterface):
             user) + '?token=' + token + '&rid=' + api_options.recipe_id
 
         try:
-            await api_options.config.reset_password_using_token_feature.create_and_send_custom_email(
-                user, password_reset_link)
+            await deliver(api_options.recipe_id + '.' + PASSWORD_RESET_EMAIL_DELIVERY, {
+                'userId': user.user_id,
+                'email': user.email,
+                'timeJoined': user.time_joined,
+                'passwordResetLink': password_reset_link
+            }, api_options.config.reset_password_using_token_feature.send_password_reset_email)
         except Exception:
             pass
 
@@ -16,7 +16,9 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from supertokens_python.recipe.emailpassword.interfaces import APIOptions, APIInterface
-from .utils import validate_form_fields_or_throw_error
+from .utils import validate_form_fields_or_throw_error, get_form_field_value
+from supertokens_python.recipe.emailpassword.constants import FORM_FIELD_EMAIL_ID
+from supertokens_python.rate_limit import enforce_rate_limit, SIGN_IN_API
 
 
 async def handle_sign_in_api(api_implementation: APIInterface, api_options: APIOptions):
@@ -26,6 +28,10 @@ async def handle_sign_in_api(api_implementation: APIInterface, api_options: APIO
     form_fields_raw = body['formFields'] if 'formFields' in body else []
     form_fields = await validate_form_fields_or_throw_error(api_options.config.sign_in_feature.form_fields,
                                                             form_fields_raw)
+    rate_limited_response = await enforce_rate_limit(SIGN_IN_API, api_options.request, api_options.response,
+                                                     email=get_form_field_value(form_fields, FORM_FIELD_EMAIL_ID))
+    if rate_limited_response is not None:
+        return rate_limited_response
     response = await api_implementation.sign_in_post(form_fields, api_options)
 
     api_options.response.set_json_content(response.to_json())
@@ -12,14 +12,14 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 from __future__ import annotations
-from __future__ import annotations
-from typing import List
+
+from asyncio import gather
+from typing import List, Dict, Union
 
 from supertokens_python.recipe.emailpassword.exceptions import raise_form_field_exception
 
 from supertokens_python.recipe.emailpassword.constants import FORM_FIELD_EMAIL_ID
 from supertokens_python.recipe.emailpassword.types import FormField, ErrorFormField, NormalisedFormField
-from supertokens_python.utils import find_first_occurrence_in_list
 from supertokens_python.exceptions import raise_bad_input_exception
 
 
@@ -29,19 +29,35 @@ async def validate_form_or_throw_error(inputs: List[FormField], config_form_fiel
         raise_bad_input_exception(
             'Are you sending too many / too few formFields?')
 
+    inputs_by_id: Dict[str, FormField] = {}
+    for input_field in inputs:
+        inputs_by_id.setdefault(input_field.id, input_field)
+
+    # the validators of the fields are independent, so they run concurrently. The errors
+    # are still reported in the order of the configured fields
+    field_errors: List[Union[str, None]] = []
+    validations = []
+    validated_indexes: List[int] = []
     for field in config_form_fields:
-        input_field: FormField = find_first_occurrence_in_list(
-            lambda x: x.id == field.id, inputs)
+        input_field = inputs_by_id.get(field.id)
         if input_field is None or (
                 input_field.value == '' and not field.optional):
-            validation_errors.append(
-                ErrorFormField(
-                    field.id,
-                    'Field is not optional'))
+            field_errors.append('Field is not optional')
         else:
-            error = await field.validate(input_field.value)
-            if error is not None:
-                validation_errors.append(ErrorFormField(field.id, error))
+            validated_indexes.append(len(field_errors))
+            field_errors.append(None)
+            validations.append(field.validate(input_field.value))
+
+    if len(validations) == 1:
+        errors = [await validations[0]]
+    else:
+        errors = await gather(*validations)
+    for index, error in zip(validated_indexes, errors):
+        field_errors[index] = error
+
+    for field, error in zip(config_form_fields, field_errors):
+        if error is not None:
+            validation_errors.append(ErrorFormField(field.id, error))
 
     if len(validation_errors) != 0:
         # raise BadInputError(msg="Error in input formFields")
@@ -50,6 +66,13 @@ async def validate_form_or_throw_error(inputs: List[FormField], config_form_fiel
             validation_errors)
 
 
+def get_form_field_value(form_fields: List[FormField], field_id: str) -> Union[str, None]:
+    for form_field in form_fields:
+        if form_field.id == field_id:
+            return form_field.value
+    return None
+
+
 async def validate_form_fields_or_throw_error(config_form_fields: List[NormalisedFormField], form_fields_raw: any) -> \
         List[FormField]:
     if form_fields_raw is None:
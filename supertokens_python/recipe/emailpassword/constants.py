@@ -19,3 +19,4 @@ USER_PASSWORD_RESET_TOKEN = '/user/password/reset/token'
 USER_PASSWORD_RESET = '/user/password/reset'
 SIGNUP_EMAIL_EXISTS = '/signup/email/exists'
 RESET_PASSWORD = '/reset-password'
+PASSWORD_RESET_EMAIL_DELIVERY = 'password_reset_email'
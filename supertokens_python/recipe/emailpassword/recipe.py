@@ -43,11 +43,14 @@ from .constants import (
     SIGNUP,
     USER_PASSWORD_RESET_TOKEN,
     USER_PASSWORD_RESET,
-    SIGNUP_EMAIL_EXISTS
+    SIGNUP_EMAIL_EXISTS,
+    PASSWORD_RESET_EMAIL_DELIVERY
 )
 
 from supertokens_python.querier import Querier
+from supertokens_python.delivery_queue import DeliveryQueue
 from supertokens_python.recipe.emailverification.utils import InputEmailVerificationConfig
+from supertokens_python.user_existence_cache import UserExistenceCacheConfig
 
 
 class EmailPasswordRecipe(RecipeModule):
@@ -59,23 +62,29 @@ class EmailPasswordRecipe(RecipeModule):
                  reset_password_using_token_feature: Union[InputResetPasswordUsingTokenFeature, None] = None,
                  email_verification_feature: Union[InputEmailVerificationConfig, None] = None,
                  override: Union[InputOverrideConfig, None] = None,
-                 email_verification_recipe: Union[EmailVerificationRecipe, None] = None):
+                 email_verification_recipe: Union[EmailVerificationRecipe, None] = None,
+                 user_existence_cache: Union[UserExistenceCacheConfig, None] = None):
         super().__init__(recipe_id, app_info)
         self.config = validate_and_normalise_user_input(self, app_info, sign_up_feature,
                                                         reset_password_using_token_feature,
-                                                        email_verification_feature, override)
+                                                        email_verification_feature, override,
+                                                        user_existence_cache)
         if email_verification_recipe is not None:
             self.email_verification_recipe = email_verification_recipe
         else:
             self.email_verification_recipe = EmailVerificationRecipe(recipe_id, app_info,
                                                                      self.config.email_verification_feature)
         recipe_implementation = RecipeImplementation(
-            Querier.get_instance(recipe_id))
+            Querier.get_instance(recipe_id), self.config.user_existence_cache)
         self.recipe_implementation = recipe_implementation if self.config.override.functions is None else \
             self.config.override.functions(recipe_implementation)
         api_implementation = APIImplementation()
         self.api_implementation = api_implementation if self.config.override.apis is None else \
             self.config.override.apis(api_implementation)
+        delivery_queue = DeliveryQueue.get_instance()
+        if delivery_queue is not None:
+            delivery_queue.register(recipe_id + '.' + PASSWORD_RESET_EMAIL_DELIVERY,
+                                    self.config.reset_password_using_token_feature.send_password_reset_email)
 
     def is_error_from_this_recipe_based_on_instance(self, err):
         return isinstance(err, SuperTokensError) and (
@@ -140,14 +149,17 @@ class EmailPasswordRecipe(RecipeModule):
     def init(sign_up_feature: Union[InputSignUpFeature, None] = None,
              reset_password_using_token_feature: Union[InputResetPasswordUsingTokenFeature, None] = None,
              email_verification_feature: Union[InputEmailVerificationConfig, None] = None,
-             override: Union[InputOverrideConfig, None] = None):
+             override: Union[InputOverrideConfig, None] = None,
+             user_existence_cache: Union[UserExistenceCacheConfig, None] = None):
         def func(app_info: AppInfo):
             if EmailPasswordRecipe.__instance is None:
                 EmailPasswordRecipe.__instance = EmailPasswordRecipe(EmailPasswordRecipe.recipe_id, app_info,
                                                                      sign_up_feature,
                                                                      reset_password_using_token_feature,
                                                                      email_verification_feature,
-                                                                     override)
+                                                                     override,
+                                                                     None,
+                                                                     user_existence_cache)
                 return EmailPasswordRecipe.__instance
             else:
                 raise Exception(None, 'Emailpassword recipe has already been initialised. Please check your '
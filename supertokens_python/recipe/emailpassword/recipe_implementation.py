@@ -32,6 +32,7 @@ from supertokens_python.normalised_url_path import NormalisedURLPath
 
 if TYPE_CHECKING:
     from supertokens_python.querier import Querier
+    from supertokens_python.user_existence_cache import UserExistenceCache
     from .interfaces import (
         UpdateEmailOrPasswordResult, SignUpResult, SignInResult, ResetPasswordUsingTokenResult,
         CreateResetPasswordResult
@@ -39,9 +40,10 @@ if TYPE_CHECKING:
 
 
 class RecipeImplementation(RecipeInterface):
-    def __init__(self, querier: Querier):
+    def __init__(self, querier: Querier, user_existence_cache: Union[UserExistenceCache, None] = None):
         super().__init__()
         self.querier = querier
+        self.user_existence_cache = user_existence_cache
 
     async def get_user_by_id(self, user_id: str) -> Union[User, None]:
         params = {
@@ -129,6 +131,9 @@ class RecipeImplementation(RecipeInterface):
             'email': email
         }
         response = await self.querier.send_post_request(NormalisedURLPath('/recipe/signup'), data)
+        if self.user_existence_cache is not None:
+            # the email exists whether this call created the user or not
+            self.user_existence_cache.set(('email', email), True)
         if 'status' in response and response['status'] == 'OK':
             return SignUpOkResult(
                 User(response['user']['id'], response['user']['email'], response['user']['timeJoined']))
@@ -161,6 +166,9 @@ class RecipeImplementation(RecipeInterface):
             }
         response = await self.querier.send_put_request(NormalisedURLPath('/recipe/user'), data)
         if 'status' in response and response['status'] == 'OK':
+            if email is not None and self.user_existence_cache is not None:
+                # the previous email of the user is not known here
+                self.user_existence_cache.clear()
             return UpdateEmailOrPasswordOkResult()
         if 'status' in response and response['status'] == 'EMAIL_ALREADY_EXISTS_ERROR':
             return UpdateEmailOrPasswordEmailAlreadyExistsErrorResult()
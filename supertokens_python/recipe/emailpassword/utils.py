@@ -14,7 +14,7 @@
 from __future__ import annotations
 
 from os import environ
-from re import fullmatch
+import re
 from typing import List, Union, Callable, Awaitable, TYPE_CHECKING
 
 from .interfaces import RecipeInterface, APIInterface
@@ -29,6 +29,7 @@ from .constants import (
     RESET_PASSWORD
 )
 from supertokens_python.utils import get_filtered_list
+from supertokens_python.user_existence_cache import UserExistenceCache, UserExistenceCacheConfig
 from httpx import AsyncClient
 from supertokens_python.recipe.emailverification.utils import (
     InputEmailVerificationConfig,
@@ -37,6 +38,13 @@ from supertokens_python.recipe.emailverification.utils import (
 )
 
 
+PASSWORD_HAS_ALPHABET_REGEX = re.compile(r'^.*[A-Za-z]+.*$')
+PASSWORD_HAS_NUMBER_REGEX = re.compile(r'^.*[0-9]+.*$')
+# Regex from https://stackoverflow.com/a/46181/3867175
+EMAIL_REGEX = re.compile(r'^(([^<>()\[\]\\.,;:\s@"]+(\.[^<>()\[\]\\.,;:\s@"]+)*)|(".+"))@((\[[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,'
+                         r'3}\.[0-9]{1,3}\])|(([a-zA-Z\-0-9]+\.)+[a-zA-Z]{2,}))$')
+
+
 async def default_validator(_):
     return None
 
@@ -63,10 +71,10 @@ async def default_password_validator(value) -> Union[str, None]:
     if len(value) >= 100:
         return 'Password\'s length must be lesser than 100 characters'
 
-    if fullmatch(r'^.*[A-Za-z]+.*$', value) is None:
+    if PASSWORD_HAS_ALPHABET_REGEX.fullmatch(value) is None:
         return 'Password must contain at least one alphabet'
 
-    if fullmatch(r'^.*[0-9]+.*$', value) is None:
+    if PASSWORD_HAS_NUMBER_REGEX.fullmatch(value) is None:
         return 'Password must contain at least one number'
 
     return None
@@ -75,12 +83,10 @@ async def default_password_validator(value) -> Union[str, None]:
 async def default_email_validator(value) -> Union[str, None]:
     # We check if the email syntax is correct
     # As per https://github.com/supertokens/supertokens-auth-react/issues/5#issuecomment-709512438
-    # Regex from https://stackoverflow.com/a/46181/3867175
     if not isinstance(value, str):
         return 'Development bug: Please make sure the email field yields a string'
 
-    if fullmatch(r'^(([^<>()\[\]\\.,;:\s@"]+(\.[^<>()\[\]\\.,;:\s@"]+)*)|(".+"))@((\[[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,'
-                 r'3}\.[0-9]{1,3}\])|(([a-zA-Z\-0-9]+\.)+[a-zA-Z]{2,}))$', value) is None:
+    if EMAIL_REGEX.fullmatch(value) is None:
         return 'Email is not valid'
 
     return None
@@ -202,6 +208,10 @@ class ResetPasswordUsingTokenFeature:
         self.get_reset_password_url = get_reset_password_url
         self.create_and_send_custom_email = create_and_send_custom_email
 
+    async def send_password_reset_email(self, payload: dict):
+        user = User(payload['userId'], payload['email'], payload['timeJoined'])
+        await self.create_and_send_custom_email(user, payload['passwordResetLink'])
+
 
 def validate_and_normalise_reset_password_using_token_config(app_info: AppInfo, sign_up_config: InputSignUpFeature,
                                                              config: InputResetPasswordUsingTokenFeature) -> ResetPasswordUsingTokenFeature:
@@ -257,7 +267,8 @@ def validate_and_normalise_email_verification_config(
         get_email_for_user_id=recipe.get_email_for_user_id,
         create_and_send_custom_email=create_and_send_custom_email,
         get_email_verification_url=get_email_verification_url,
-        override=override.email_verification_feature
+        override=override.email_verification_feature,
+        cache=config.cache
     )
 
 
@@ -283,12 +294,14 @@ class EmailPasswordConfig:
                  sign_in_feature: SignInFeature,
                  reset_password_using_token_feature: ResetPasswordUsingTokenFeature,
                  email_verification_feature: ParentRecipeEmailVerificationConfig,
-                 override: OverrideConfig):
+                 override: OverrideConfig,
+                 user_existence_cache: Union[UserExistenceCache, None] = None):
         self.sign_up_feature = sign_up_feature
         self.sign_in_feature = sign_in_feature
         self.reset_password_using_token_feature = reset_password_using_token_feature
         self.email_verification_feature = email_verification_feature
         self.override = override
+        self.user_existence_cache = user_existence_cache
 
 
 def validate_and_normalise_user_input(recipe: EmailPasswordRecipe, app_info: AppInfo,
@@ -296,7 +309,8 @@ def validate_and_normalise_user_input(recipe: EmailPasswordRecipe, app_info: App
                                       reset_password_using_token_feature: Union[
                                           InputResetPasswordUsingTokenFeature, None] = None,
                                       email_verification_feature: Union[InputEmailVerificationConfig, None] = None,
-                                      override: Union[InputOverrideConfig, None] = None) -> EmailPasswordConfig:
+                                      override: Union[InputOverrideConfig, None] = None,
+                                      user_existence_cache: Union[UserExistenceCacheConfig, None] = None) -> EmailPasswordConfig:
     if override is None:
         override = InputOverrideConfig()
     if reset_password_using_token_feature is None:
@@ -317,5 +331,6 @@ def validate_and_normalise_user_input(recipe: EmailPasswordRecipe, app_info: App
             reset_password_using_token_feature
         ),
         email_verification_feature,
-        OverrideConfig(functions=override.functions, apis=override.apis)
+        OverrideConfig(functions=override.functions, apis=override.apis),
+        None if user_existence_cache is None else UserExistenceCache(user_existence_cache, app_info.get_client_ip)
     )
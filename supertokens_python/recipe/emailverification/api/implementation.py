@@ -25,7 +25,10 @@ if TYPE_CHECKING:
     from supertokens_python.recipe.emailverification.interfaces import (
         APIOptions, GenerateEmailVerifyTokenPostResponse, IsEmailVerifiedGetResponse, EmailVerifyPostResponse
     )
+from supertokens_python.delivery_queue import deliver
+from supertokens_python.recipe.emailverification.constants import VERIFICATION_EMAIL_DELIVERY
 from supertokens_python.recipe.emailverification.types import User
+from supertokens_python.recipe.emailverification.utils import is_email_verified_for_session
 from supertokens_python.recipe.session.asyncio import get_session
 
 
@@ -44,10 +47,8 @@ class APIImplementation(APIInterface):
         if session is None:
             raise Exception('Session is undefined. Should not come here.')
 
-        user_id = session.get_user_id()
-        email = await api_options.config.get_email_for_user_id(user_id)
-
-        is_verified = await api_options.recipe_implementation.is_email_verified(user_id, email)
+        is_verified = await is_email_verified_for_session(api_options.recipe_implementation, api_options.config,
+                                                          session)
         return IsEmailVerifiedGetOkResponse(is_verified)
 
     async def generate_email_verify_token_post(self, api_options: APIOptions) -> GenerateEmailVerifyTokenPostResponse:
@@ -68,7 +69,11 @@ class APIImplementation(APIInterface):
             user)) + '?token=' + token_result.token + '&rid' + api_options.recipe_id
 
         try:
-            await api_options.config.create_and_send_custom_email(user, email_verify_link)
+            await deliver(api_options.recipe_id + '.' + VERIFICATION_EMAIL_DELIVERY, {
+                'userId': user.user_id,
+                'email': user.email,
+                'emailVerifyLink': email_verify_link
+            }, api_options.config.send_verification_email)
         except Exception:
             pass
 
@@ -10,8 +10,16 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from supertokens_python.recipe.emailverification import utils
 from supertokens_python.recipe.emailverification.recipe import EmailVerificationRecipe
 
+if TYPE_CHECKING:
+    from supertokens_python.recipe.session import Session
+
 
 async def create_email_verification_token(user_id: str, email: str):
     return await EmailVerificationRecipe.get_instance().recipe_implementation.create_email_verification_token(user_id,
@@ -26,6 +34,11 @@ async def is_email_verified(user_id: str, email: str):
     return await EmailVerificationRecipe.get_instance().recipe_implementation.is_email_verified(user_id, email)
 
 
+async def is_email_verified_for_session(session: Session):
+    recipe = EmailVerificationRecipe.get_instance()
+    return await utils.is_email_verified_for_session(recipe.recipe_implementation, recipe.config, session)
+
+
 async def unverify_email(user_id: str, email: str):
     return await EmailVerificationRecipe.get_instance().recipe_implementation.unverify_email(user_id, email)
 
@@ -36,12 +36,14 @@ from .api import (
 )
 from .constants import (
     USER_EMAIL_VERIFY,
-    USER_EMAIL_VERIFY_TOKEN
+    USER_EMAIL_VERIFY_TOKEN,
+    VERIFICATION_EMAIL_DELIVERY
 )
 from .exceptions import (
     SuperTokensEmailVerificationError
 )
 from supertokens_python.querier import Querier
+from supertokens_python.delivery_queue import DeliveryQueue
 
 
 class EmailVerificationRecipe(RecipeModule):
@@ -58,6 +60,9 @@ class EmailVerificationRecipe(RecipeModule):
         api_implementation = APIImplementation()
         self.api_implementation = api_implementation if self.config.override.apis is None else \
             self.config.override.apis(api_implementation)
+        delivery_queue = DeliveryQueue.get_instance()
+        if delivery_queue is not None:
+            delivery_queue.register(recipe_id + '.' + VERIFICATION_EMAIL_DELIVERY, self.config.send_verification_email)
 
     def is_error_from_this_recipe_based_on_instance(self, err):
         return isinstance(err, SuperTokensError) and isinstance(
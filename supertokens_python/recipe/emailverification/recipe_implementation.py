@@ -23,6 +23,8 @@ from typing import TYPE_CHECKING
 
 from .types import User
 from supertokens_python.normalised_url_path import NormalisedURLPath
+from supertokens_python.ttl_cache import TTLCache
+from supertokens_python.sharding import get_shard_key
 
 if TYPE_CHECKING:
     from .utils import EmailVerificationConfig
@@ -34,6 +36,13 @@ class RecipeImplementation(RecipeInterface):
         super().__init__()
         self.querier = querier
         self.config = config
+        self.is_email_verified_cache = None if config.cache is None else TTLCache(config.cache.max_size)
+
+    def cache_is_email_verified(self, user_id: str, email: str, is_verified: bool):
+        if self.is_email_verified_cache is None:
+            return
+        ttl = self.config.cache.verified_ttl_seconds if is_verified else self.config.cache.unverified_ttl_seconds
+        self.is_email_verified_cache.set((get_shard_key(), user_id, email), is_verified, ttl)
 
     async def create_email_verification_token(self, user_id: str, email: str) -> CreateEmailVerificationTokenResult:
         data = {
@@ -43,6 +52,7 @@ class RecipeImplementation(RecipeInterface):
         response = await self.querier.send_post_request(NormalisedURLPath('/recipe/user/email/verify/token'), data)
         if 'status' in response and response['status'] == 'OK':
             return CreateEmailVerificationTokenOkResult(response['token'])
+        self.cache_is_email_verified(user_id, email, True)
         return CreateEmailVerificationTokenEmailAlreadyVerifiedErrorResult()
 
     async def verify_email_using_token(self, token: str) -> VerifyEmailUsingTokenResult:
@@ -52,16 +62,22 @@ class RecipeImplementation(RecipeInterface):
         }
         response = await self.querier.send_post_request(NormalisedURLPath('/recipe/user/email/verify'), data)
         if 'status' in response and response['status'] == 'OK':
+            self.cache_is_email_verified(response['userId'], response['email'], True)
             return VerifyEmailUsingTokenOkResult(
                 User(response['userId'], response['email']))
         return VerifyEmailUsingTokenInvalidTokenErrorResult()
 
     async def is_email_verified(self, user_id: str, email: str) -> bool:
+        if self.is_email_verified_cache is not None:
+            is_verified = self.is_email_verified_cache.get((get_shard_key(), user_id, email))
+            if is_verified is not None:
+                return is_verified
         params = {
             'userId': user_id,
             'email': email
         }
         response = await self.querier.send_get_request(NormalisedURLPath('/recipe/user/email/verify'), params)
+        self.cache_is_email_verified(user_id, email, response['isVerified'])
         return response['isVerified']
 
     async def revoke_email_verification_tokens(self, user_id: str, email: str) -> RevokeEmailVerificationTokensResult:
@@ -78,4 +94,6 @@ class RecipeImplementation(RecipeInterface):
             'email': email
         }
         await self.querier.send_post_request(NormalisedURLPath('/recipe/user/email/verify/remove'), data)
+        self.cache_is_email_verified(user_id, email, False)
+        self.config.set_unverified_at(user_id, email)
         return UnverifyEmailOkResult()
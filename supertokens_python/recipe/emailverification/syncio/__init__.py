@@ -30,9 +30,14 @@ def is_email_verified(user_id: str, email: str):
     return sync(is_email_verified(user_id, email))
 
 
-async def unverify_email(user_id: str, email: str):
-    from supertokens_python.recipe.emailverification.asyncio import is_email_verified
-    return sync(is_email_verified(user_id, email))
+def is_email_verified_for_session(session):
+    from supertokens_python.recipe.emailverification.asyncio import is_email_verified_for_session
+    return sync(is_email_verified_for_session(session))
+
+
+def unverify_email(user_id: str, email: str):
+    from supertokens_python.recipe.emailverification.asyncio import unverify_email
+    return sync(unverify_email(user_id, email))
 
 
 async def revoke_email_verification_tokens(user_id: str, email: str):
@@ -16,10 +16,14 @@ from httpx import AsyncClient
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from supertokens_python.supertokens import AppInfo
-    from .types import User
     from .interfaces import RecipeInterface, APIInterface
     from typing import Callable, Union, Awaitable
+    from supertokens_python.recipe.session import Session
 from os import environ
+from supertokens_python.utils import get_timestamp_ms
+from supertokens_python.ttl_cache import TTLCache
+from supertokens_python.sharding import get_shard_key
+from .types import User
 
 
 def default_get_email_verification_url(app_info: AppInfo):
@@ -48,13 +52,45 @@ class OverrideConfig:
         self.apis = apis
 
 
+DEFAULT_VERIFIED_TTL_SECONDS = 60 * 60
+DEFAULT_UNVERIFIED_TTL_SECONDS = 5
+DEFAULT_CACHE_MAX_SIZE = 10000
+
+
+class IsEmailVerifiedCacheConfig:
+    """
+    Caches the result of is_email_verified per (shard key, user id, email) in this process. Verified emails are
+    cached for longer than unverified ones since they rarely go back to unverified, and both entries
+    are invalidated by verify_email_using_token / unverify_email called in the same process.
+
+    If access_token_claim is set, the verified email is also stored under that key in the access
+    token payload (with the same expiry as verified_ttl_seconds) when is_email_verified_get sees it
+    verified, so that later checks for that session do not need the core at all. Adding the claim
+    updates the session in the core, so the first of these checks per session (a GET of the is
+    email verified API) makes a write to the core. A claim issued before unverify_email was called
+    in the same process is ignored; in other processes it is trusted until it expires, like their
+    cached results.
+    """
+
+    def __init__(self, verified_ttl_seconds: int = DEFAULT_VERIFIED_TTL_SECONDS,
+                 unverified_ttl_seconds: int = DEFAULT_UNVERIFIED_TTL_SECONDS,
+                 max_size: int = DEFAULT_CACHE_MAX_SIZE,
+                 access_token_claim: Union[str, None] = None):
+        self.verified_ttl_seconds = verified_ttl_seconds
+        self.unverified_ttl_seconds = unverified_ttl_seconds
+        self.max_size = max_size
+        self.access_token_claim = access_token_claim
+
+
 class InputEmailVerificationConfig:
     def __init__(self,
                  get_email_verification_url: Union[Callable[[User], Awaitable[str]], None] = None,
-                 create_and_send_custom_email: Union[Callable[[User, str], Awaitable[None]], None] = None
+                 create_and_send_custom_email: Union[Callable[[User, str], Awaitable[None]], None] = None,
+                 cache: Union[IsEmailVerifiedCacheConfig, None] = None
                  ):
         self.get_email_verification_url = get_email_verification_url
         self.create_and_send_custom_email = create_and_send_custom_email
+        self.cache = cache
 
 
 class ParentRecipeEmailVerificationConfig:
@@ -62,12 +98,14 @@ class ParentRecipeEmailVerificationConfig:
                  get_email_for_user_id: Callable[[str], Awaitable[str]],
                  override: Union[OverrideConfig, None] = None,
                  get_email_verification_url: Union[Callable[[User], Awaitable[str]], None] = None,
-                 create_and_send_custom_email: Union[Callable[[User, str], Awaitable[None]], None] = None
+                 create_and_send_custom_email: Union[Callable[[User, str], Awaitable[None]], None] = None,
+                 cache: Union[IsEmailVerifiedCacheConfig, None] = None
                  ):
         self.override = override
         self.get_email_verification_url = get_email_verification_url
         self.create_and_send_custom_email = create_and_send_custom_email
         self.get_email_for_user_id = get_email_for_user_id
+        self.cache = cache
 
 
 class EmailVerificationConfig:
@@ -75,12 +113,49 @@ class EmailVerificationConfig:
                  override: OverrideConfig,
                  get_email_verification_url: Callable[[User], Awaitable[str]],
                  create_and_send_custom_email: Callable[[User, str], Awaitable[None]],
-                 get_email_for_user_id: Callable[[str], Awaitable[str]]
+                 get_email_for_user_id: Callable[[str], Awaitable[str]],
+                 cache: Union[IsEmailVerifiedCacheConfig, None] = None
                  ):
         self.get_email_for_user_id = get_email_for_user_id
         self.get_email_verification_url = get_email_verification_url
         self.create_and_send_custom_email = create_and_send_custom_email
         self.override = override
+        self.cache = cache
+        # when unverify_email was last called per (shard key, user id, email), to ignore the claims issued before
+        self.unverified_at = None if cache is None else TTLCache(cache.max_size)
+
+    def set_unverified_at(self, user_id: str, email: str):
+        if self.unverified_at is not None:
+            self.unverified_at.set((get_shard_key(), user_id, email), get_timestamp_ms(),
+                                   self.cache.verified_ttl_seconds)
+
+    async def send_verification_email(self, payload: dict):
+        await self.create_and_send_custom_email(User(payload['userId'], payload['email']), payload['emailVerifyLink'])
+
+
+async def is_email_verified_for_session(recipe_implementation: RecipeInterface, config: EmailVerificationConfig,
+                                        session: Session) -> bool:
+    user_id = session.get_user_id()
+    email = await config.get_email_for_user_id(user_id)
+    claim = None if config.cache is None else config.cache.access_token_claim
+    if claim is not None:
+        verified = session.get_access_token_payload().get(claim)
+        if isinstance(verified, dict) and verified.get('email') == email and \
+                verified.get('expiresAt', 0) > get_timestamp_ms() and \
+                verified.get('issuedAt', 0) > config.unverified_at.get((get_shard_key(), user_id, email), -1):
+            return True
+
+    is_verified = await recipe_implementation.is_email_verified(user_id, email)
+    if is_verified and claim is not None:
+        await session.update_access_token_payload({
+            **session.get_access_token_payload(),
+            claim: {
+                'email': email,
+                'issuedAt': get_timestamp_ms(),
+                'expiresAt': get_timestamp_ms() + config.cache.verified_ttl_seconds * 1000
+            }
+        })
+    return is_verified
 
 
 def validate_and_normalise_user_input(app_info: AppInfo, config: ParentRecipeEmailVerificationConfig):
@@ -95,5 +170,6 @@ def validate_and_normalise_user_input(app_info: AppInfo, config: ParentRecipeEma
         override=override,
         get_email_for_user_id=config.get_email_for_user_id,
         create_and_send_custom_email=create_and_send_custom_email,
-        get_email_verification_url=get_email_verification_url
+        get_email_verification_url=get_email_verification_url,
+        cache=config.cache
     )
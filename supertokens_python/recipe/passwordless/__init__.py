@@ -18,15 +18,18 @@ from .utils import ContactConfig, OverrideConfig as InputOverrideConfig, Contact
     CreateAndSendCustomEmailParameters
 
 from .recipe import PasswordlessRecipe
+from ...user_existence_cache import UserExistenceCacheConfig
 
 
 def init(contact_config: ContactConfig,
          flow_type: Literal['USER_INPUT_CODE', 'MAGIC_LINK', 'USER_INPUT_CODE_AND_MAGIC_LINK'],
          override: Union[InputOverrideConfig, None] = None,
          get_link_domain_and_path: Union[Callable[[str], Awaitable[Union[str, None]]]] = None,
-         get_custom_user_input_code: Union[Callable[[], Awaitable[str]], None] = None):
+         get_custom_user_input_code: Union[Callable[[], Awaitable[str]], None] = None,
+         user_existence_cache: Union[UserExistenceCacheConfig, None] = None):
     return PasswordlessRecipe.init(contact_config,
                                    flow_type,
                                    override,
                                    get_link_domain_and_path,
-                                   get_custom_user_input_code)
+                                   get_custom_user_input_code,
+                                   user_existence_cache)
@@ -16,9 +16,8 @@ from typing import Union
 from supertokens_python.exceptions import raise_bad_input_exception
 from supertokens_python.recipe.passwordless.interfaces import APIInterface, APIOptions, CreateCodePostGeneralErrorResponse
 from supertokens_python.recipe.passwordless.utils import ContactPhoneOnlyConfig, ContactEmailOnlyConfig, \
-    ContactEmailOrPhoneConfig
-from phonenumbers import parse, format_number
-import phonenumbers
+    ContactEmailOrPhoneConfig, normalise_phone_number
+from supertokens_python.rate_limit import enforce_rate_limit, CREATE_CODE_API
 
 
 async def create_code(api_implementation: APIInterface, api_options: APIOptions):
@@ -64,11 +63,12 @@ async def create_code(api_implementation: APIInterface, api_options: APIOptions)
         if validation_error is not None:
             api_options.response.set_json_content(CreateCodePostGeneralErrorResponse(validation_error).to_json())
             return api_options.response
-        try:
-            validated_phone_number = parse(phone_number, None)
-            phone_number = format_number(validated_phone_number, phonenumbers.PhoneNumberFormat.E164)
-        except Exception:
-            phone_number = phone_number.strip()
+        phone_number = normalise_phone_number(phone_number)
+
+    rate_limited_response = await enforce_rate_limit(CREATE_CODE_API, api_options.request, api_options.response,
+                                                     email=email, phone_number=phone_number)
+    if rate_limited_response is not None:
+        return rate_limited_response
     result = await api_implementation.create_code_post(
         email=email, phone_number=phone_number, api_options=api_options)
     api_options.response.set_json_content(result.to_json())
@@ -12,6 +12,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 from supertokens_python.exceptions import raise_bad_input_exception
+from supertokens_python.utils import send_non_200_response
 from supertokens_python.recipe.passwordless.interfaces import APIInterface, APIOptions
 
 
@@ -23,6 +24,10 @@ async def email_exists(api_implementation: APIInterface, api_options: APIOptions
     if email is None or not isinstance(email, str):
         raise_bad_input_exception('Please provide the email as a GET param')
 
+    cache = api_options.config.user_existence_cache
+    if cache is not None and cache.is_throttled(api_options.request):
+        return send_non_200_response('Too many requests', 429, api_options.response)
+
     result = await api_implementation.email_exists_get(email, api_options)
     api_options.response.set_json_content(result.to_json())
 
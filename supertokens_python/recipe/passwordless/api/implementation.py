@@ -20,8 +20,10 @@ from supertokens_python.recipe.passwordless.interfaces import APIInterface, APIO
     ResendCodePostGeneralErrorResponse, ConsumeCodePostOkResponse, \
     ConsumeCodePostExpiredUserInputCodeErrorResponse, ConsumeCodePostIncorrectUserInputCodeErrorResponse, \
     ConsumeCodePostRestartFlowErrorResponse
+from supertokens_python.delivery_queue import deliver
+from supertokens_python.recipe.passwordless.constants import EMAIL_DELIVERY, TEXT_MESSAGE_DELIVERY
 from supertokens_python.recipe.passwordless.utils import ContactPhoneOnlyConfig, ContactEmailOnlyConfig, \
-    ContactEmailOrPhoneConfig, CreateAndSendCustomTextMessageParameters, CreateAndSendCustomEmailParameters
+    ContactEmailOrPhoneConfig, normalise_phone_number
 from supertokens_python.recipe.session.asyncio import create_new_session
 
 
@@ -45,22 +47,22 @@ class APIImplementation(APIInterface):
         try:
             if isinstance(api_options.config.contact_config, ContactEmailOnlyConfig) or \
                     (isinstance(api_options.config.contact_config, ContactEmailOrPhoneConfig) and email is not None):
-                await api_options.config.contact_config.create_and_send_custom_email(CreateAndSendCustomEmailParameters(
-                    email=email,
-                    user_input_code=user_input_code,
-                    url_with_link_code=magic_link,
-                    code_life_time=response.code_life_time,
-                    pre_auth_session_id=response.pre_auth_session_id
-                ))
+                await deliver(api_options.recipe_id + '.' + EMAIL_DELIVERY, {
+                    'email': email,
+                    'userInputCode': user_input_code,
+                    'urlWithLinkCode': magic_link,
+                    'codeLifeTime': response.code_life_time,
+                    'preAuthSessionId': response.pre_auth_session_id
+                }, api_options.config.send_email)
             elif isinstance(api_options.config.contact_config, ContactEmailOrPhoneConfig) or \
                     isinstance(api_options.config.contact_config, ContactPhoneOnlyConfig):
-                await api_options.config.contact_config.create_and_send_custom_text_message(CreateAndSendCustomTextMessageParameters(
-                    phone_number=phone_number,
-                    user_input_code=user_input_code,
-                    url_with_link_code=magic_link,
-                    code_life_time=response.code_life_time,
-                    pre_auth_session_id=response.pre_auth_session_id
-                ))
+                await deliver(api_options.recipe_id + '.' + TEXT_MESSAGE_DELIVERY, {
+                    'phoneNumber': phone_number,
+                    'userInputCode': user_input_code,
+                    'urlWithLinkCode': magic_link,
+                    'codeLifeTime': response.code_life_time,
+                    'preAuthSessionId': response.pre_auth_session_id
+                }, api_options.config.send_text_message)
         except Exception as e:
             return CreateCodePostGeneralErrorResponse(str(e))
         return CreateCodePostOkResponse(response.device_id, response.pre_auth_session_id, flow_type)
@@ -104,22 +106,22 @@ class APIImplementation(APIInterface):
                     if isinstance(api_options.config.contact_config, ContactEmailOnlyConfig) or \
                             (isinstance(api_options.config.contact_config,
                                         ContactEmailOrPhoneConfig) and device_info.email is not None):
-                        await api_options.config.contact_config.create_and_send_custom_email(CreateAndSendCustomEmailParameters(
-                            email=device_info.email,
-                            user_input_code=user_input_code,
-                            url_with_link_code=magic_link,
-                            code_life_time=response.code_life_time,
-                            pre_auth_session_id=response.pre_auth_session_id
-                        ))
+                        await deliver(api_options.recipe_id + '.' + EMAIL_DELIVERY, {
+                            'email': device_info.email,
+                            'userInputCode': user_input_code,
+                            'urlWithLinkCode': magic_link,
+                            'codeLifeTime': response.code_life_time,
+                            'preAuthSessionId': response.pre_auth_session_id
+                        }, api_options.config.send_email)
                     elif isinstance(api_options.config.contact_config, ContactEmailOrPhoneConfig) or \
                             isinstance(api_options.config.contact_config, ContactPhoneOnlyConfig):
-                        await api_options.config.contact_config.create_and_send_custom_text_message(CreateAndSendCustomTextMessageParameters(
-                            phone_number=device_info.phone_number,
-                            user_input_code=user_input_code,
-                            url_with_link_code=magic_link,
-                            code_life_time=response.code_life_time,
-                            pre_auth_session_id=response.pre_auth_session_id
-                        ))
+                        await deliver(api_options.recipe_id + '.' + TEXT_MESSAGE_DELIVERY, {
+                            'phoneNumber': device_info.phone_number,
+                            'userInputCode': user_input_code,
+                            'urlWithLinkCode': magic_link,
+                            'codeLifeTime': response.code_life_time,
+                            'preAuthSessionId': response.pre_auth_session_id
+                        }, api_options.config.send_text_message)
                 except Exception as e:
                     return ResendCodePostGeneralErrorResponse(str(e))
             return ResendCodePostOkResponse()
@@ -154,9 +156,20 @@ class APIImplementation(APIInterface):
         )
 
     async def email_exists_get(self, email: str, api_options: APIOptions) -> EmailExistsGetResponse:
-        response = await api_options.recipe_implementation.get_user_by_email(email)
-        return EmailExistsGetOkResponse(exists=response is not None)
+        cache = api_options.config.user_existence_cache
+        exists = None if cache is None else cache.get(('email', email))
+        if exists is None:
+            exists = await api_options.recipe_implementation.get_user_by_email(email) is not None
+            if cache is not None:
+                cache.set(('email', email), exists)
+        return EmailExistsGetOkResponse(exists=exists)
 
     async def phone_number_exists_get(self, phone_number: str, api_options: APIOptions) -> PhoneNumberExistsGetResponse:
-        response = await api_options.recipe_implementation.get_user_by_phone_number(phone_number)
-        return PhoneNumberExistsGetOkResponse(exists=response is not None)
+        cache = api_options.config.user_existence_cache
+        key = None if cache is None else ('phoneNumber', normalise_phone_number(phone_number))
+        exists = None if cache is None else cache.get(key)
+        if exists is None:
+            exists = await api_options.recipe_implementation.get_user_by_phone_number(phone_number) is not None
+            if cache is not None:
+                cache.set(key, exists)
+        return PhoneNumberExistsGetOkResponse(exists=exists)
@@ -17,3 +17,6 @@ RESEND_CODE_API = '/signinup/code/resend'
 CONSUME_CODE_API = '/signinup/code/consume'
 DOES_EMAIL_EXIST_API = '/signup/email/exists'
 DOES_PHONE_NUMBER_EXIST_API = '/signup/phonenumber/exists'
+EMAIL_DELIVERY = 'email'
+TEXT_MESSAGE_DELIVERY = 'text_message'
+PHONE_NUMBER_CACHE_MAX_SIZE = 1024
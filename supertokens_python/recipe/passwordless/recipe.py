@@ -17,6 +17,7 @@ from os import environ
 from typing import List, TYPE_CHECKING, Union, Literal, Callable, Awaitable
 
 from supertokens_python.querier import Querier
+from supertokens_python.delivery_queue import DeliveryQueue
 from .api import (
     consume_code,
     create_code,
@@ -26,10 +27,11 @@ from .api import (
 )
 from .api.implementation import APIImplementation
 from .constants import CREATE_CODE_API, RESEND_CODE_API, CONSUME_CODE_API, DOES_EMAIL_EXIST_API, \
-    DOES_PHONE_NUMBER_EXIST_API
+    DOES_PHONE_NUMBER_EXIST_API, EMAIL_DELIVERY, TEXT_MESSAGE_DELIVERY
 from .interfaces import APIOptions
 from .recipe_implementation import RecipeImplementation
 from .utils import validate_and_normalise_user_input, OverrideConfig, ContactConfig
+from supertokens_python.user_existence_cache import UserExistenceCacheConfig
 from .exceptions import SuperTokensPasswordlessError
 from .interfaces import ConsumeCodeOkResult
 
@@ -51,17 +53,24 @@ class PasswordlessRecipe(RecipeModule):
                  flow_type: Literal['USER_INPUT_CODE', 'MAGIC_LINK', 'USER_INPUT_CODE_AND_MAGIC_LINK'],
                  override: Union[OverrideConfig, None] = None,
                  get_link_domain_and_path: Union[Callable[[str], Awaitable[Union[str, None]]]] = None,
-                 get_custom_user_input_code: Union[Callable[[], Awaitable[str]], None] = None):
+                 get_custom_user_input_code: Union[Callable[[], Awaitable[str]], None] = None,
+                 user_existence_cache: Union[UserExistenceCacheConfig, None] = None):
         super().__init__(recipe_id, app_info)
         self.config = validate_and_normalise_user_input(app_info, contact_config, flow_type, override,
-                                                        get_link_domain_and_path, get_custom_user_input_code)
+                                                        get_link_domain_and_path, get_custom_user_input_code,
+                                                        user_existence_cache)
 
-        recipe_implementation = RecipeImplementation(Querier.get_instance(recipe_id))
+        recipe_implementation = RecipeImplementation(Querier.get_instance(recipe_id),
+                                                     self.config.user_existence_cache)
         self.recipe_implementation = recipe_implementation if self.config.override.functions is None else \
             self.config.override.functions(recipe_implementation)
         api_implementation = APIImplementation()
         self.api_implementation = api_implementation if self.config.override.apis is None else \
             self.config.override.apis(api_implementation)
+        delivery_queue = DeliveryQueue.get_instance()
+        if delivery_queue is not None:
+            delivery_queue.register(recipe_id + '.' + EMAIL_DELIVERY, self.config.send_email)
+            delivery_queue.register(recipe_id + '.' + TEXT_MESSAGE_DELIVERY, self.config.send_text_message)
 
     def get_apis_handled(self) -> List[APIHandled]:
         return [
@@ -109,14 +118,15 @@ class PasswordlessRecipe(RecipeModule):
              flow_type: Literal['USER_INPUT_CODE', 'MAGIC_LINK', 'USER_INPUT_CODE_AND_MAGIC_LINK'],
              override: Union[OverrideConfig, None] = None,
              get_link_domain_and_path: Union[Callable[[str], Awaitable[Union[str, None]]]] = None,
-             get_custom_user_input_code: Union[Callable[[], Awaitable[str]], None] = None):
+             get_custom_user_input_code: Union[Callable[[], Awaitable[str]], None] = None,
+             user_existence_cache: Union[UserExistenceCacheConfig, None] = None):
         def func(app_info: AppInfo):
             if PasswordlessRecipe.__instance is None:
                 PasswordlessRecipe.__instance = PasswordlessRecipe(
                     PasswordlessRecipe.recipe_id,
                     app_info,
                     contact_config, flow_type, override,
-                    get_link_domain_and_path, get_custom_user_input_code)
+                    get_link_domain_and_path, get_custom_user_input_code, user_existence_cache)
                 return PasswordlessRecipe.__instance
             else:
                 raise_general_exception('Passwordless recipe has already been initialised. Please check '
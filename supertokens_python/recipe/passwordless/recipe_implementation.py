@@ -19,6 +19,7 @@ from typing import TYPE_CHECKING, Union, List
 from .types import DeviceType, User, DeviceCode
 
 if TYPE_CHECKING:
+    from supertokens_python.user_existence_cache import UserExistenceCache
     from .interfaces import CreateCodeResult, RevokeCodeResult, RevokeAllCodesResult, UpdateUserResult, \
         ConsumeCodeResult, CreateNewCodeForDeviceResult
 from .interfaces import RecipeInterface, CreateNewCodeForDeviceOkResult, \
@@ -32,9 +33,10 @@ from supertokens_python.normalised_url_path import NormalisedURLPath
 
 class RecipeImplementation(RecipeInterface):
 
-    def __init__(self, querier: Querier):
+    def __init__(self, querier: Querier, user_existence_cache: Union[UserExistenceCache, None] = None):
         super().__init__()
         self.querier = querier
+        self.user_existence_cache = user_existence_cache
 
     async def create_code(self, email: Union[None, str] = None, phone_number: Union[None, str] = None,
                           user_input_code: Union[None, str] = None) -> CreateCodeResult:
@@ -118,6 +120,11 @@ class RecipeImplementation(RecipeInterface):
                         email=email,
                         phone_number=phone_number,
                         time_joined=result['user']['timeJoined'])
+            if result['createdNewUser'] and self.user_existence_cache is not None:
+                if email is not None:
+                    self.user_existence_cache.set(('email', email), True)
+                if phone_number is not None:
+                    self.user_existence_cache.set(('phoneNumber', phone_number), True)
             return ConsumeCodeOkResult(result['createdNewUser'], user)
         elif result['status'] == 'RESTART_FLOW_ERROR':
             return ConsumeCodeRestartFlowErrorResult()
@@ -202,6 +209,9 @@ class RecipeImplementation(RecipeInterface):
             }
         result = await self.querier.send_put_request(NormalisedURLPath('/recipe/user'), data)
         if result['status'] == 'OK':
+            if self.user_existence_cache is not None:
+                # the previous email / phone number of the user is not known here
+                self.user_existence_cache.clear()
             return UpdateUserOkResult()
         elif result['status'] == 'UNKNOWN_USER_ID_ERROR':
             return UpdateUserUnknownUserIdErrorResult()
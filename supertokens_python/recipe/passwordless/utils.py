@@ -14,24 +14,45 @@
 from __future__ import annotations
 
 from abc import ABC
-from typing import TYPE_CHECKING, Callable, Union, Awaitable, Literal
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Union, Awaitable, Literal, Tuple
 
 if TYPE_CHECKING:
     from .interfaces import RecipeInterface, APIInterface
     from supertokens_python import AppInfo
-from phonenumbers import parse, is_valid_number
-from re import fullmatch
+from phonenumbers import parse, is_valid_number, format_number, PhoneNumberFormat
+import re
 
+from .constants import PHONE_NUMBER_CACHE_MAX_SIZE
+from supertokens_python.user_existence_cache import UserExistenceCache, UserExistenceCacheConfig
 
-async def default_validate_phone_number(value: str):
+EMAIL_REGEX = re.compile(r"^(([^<>()\[\]\\.,;:\s@\"]+(\.[^<>()\[\]\\.,;:\s@\"]+)*)|(\".+\"))@((\[[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\])|(([a-zA-Z\-0-9]+\.)+[a-zA-Z]{2,}))$")
+
+
+@lru_cache(maxsize=PHONE_NUMBER_CACHE_MAX_SIZE)
+def _parse_phone_number(value: str) -> Tuple[bool, Union[str, None]]:
+    # parsing with phonenumbers is expensive and the same number is usually validated and
+    # then normalised (or retried), so the result is kept for the recent numbers.
+    # Returns whether the number is valid and its E.164 form (None if it cannot be parsed)
     try:
         parsed_phone_number = parse(value, None)
-        if not is_valid_number(parsed_phone_number):
-            return 'Phone number is invalid'
     except Exception:
+        return False, None
+    return is_valid_number(parsed_phone_number), format_number(parsed_phone_number, PhoneNumberFormat.E164)
+
+
+async def default_validate_phone_number(value: str):
+    if not isinstance(value, str) or not _parse_phone_number(value)[0]:
         return 'Phone number is invalid'
 
 
+def normalise_phone_number(value: str) -> str:
+    formatted = _parse_phone_number(value)[1]
+    if formatted is None:
+        return value.strip()
+    return formatted
+
+
 def default_get_link_domain_and_path(app_info: AppInfo):
     async def get_link_domain_and_path(_: str):
         return app_info.website_domain.get_as_string_dangerous() + app_info.website_base_path.get_as_string_dangerous() + '/verify'
@@ -39,8 +60,7 @@ def default_get_link_domain_and_path(app_info: AppInfo):
 
 
 async def default_validate_email(value: str):
-    pattern = r"^(([^<>()\[\]\\.,;:\s@\"]+(\.[^<>()\[\]\\.,;:\s@\"]+)*)|(\".+\"))@((\[[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\])|(([a-zA-Z\-0-9]+\.)+[a-zA-Z]{2,}))$"
-    if fullmatch(pattern, value) is None:
+    if EMAIL_REGEX.fullmatch(value) is None:
         return 'Email is invalid'
 
 
@@ -142,13 +162,33 @@ class PasswordlessConfig:
                  override: OverrideConfig,
                  flow_type: Literal['USER_INPUT_CODE', 'MAGIC_LINK', 'USER_INPUT_CODE_AND_MAGIC_LINK'],
                  get_link_domain_and_path: Callable[[str], Awaitable[Union[str, None]]],
-                 get_custom_user_input_code: Union[Callable[[], Awaitable[str]], None] = None
+                 get_custom_user_input_code: Union[Callable[[], Awaitable[str]], None] = None,
+                 user_existence_cache: Union[UserExistenceCache, None] = None
                  ):
         self.contact_config = contact_config
         self.override = override
         self.flow_type = flow_type
         self.get_custom_user_input_code = get_custom_user_input_code
         self.get_link_domain_and_path = get_link_domain_and_path
+        self.user_existence_cache = user_existence_cache
+
+    async def send_email(self, payload: dict):
+        await self.contact_config.create_and_send_custom_email(CreateAndSendCustomEmailParameters(
+            email=payload['email'],
+            user_input_code=payload['userInputCode'],
+            url_with_link_code=payload['urlWithLinkCode'],
+            code_life_time=payload['codeLifeTime'],
+            pre_auth_session_id=payload['preAuthSessionId']
+        ))
+
+    async def send_text_message(self, payload: dict):
+        await self.contact_config.create_and_send_custom_text_message(CreateAndSendCustomTextMessageParameters(
+            phone_number=payload['phoneNumber'],
+            user_input_code=payload['userInputCode'],
+            url_with_link_code=payload['urlWithLinkCode'],
+            code_life_time=payload['codeLifeTime'],
+            pre_auth_session_id=payload['preAuthSessionId']
+        ))
 
 
 def validate_and_normalise_user_input(
@@ -157,7 +197,8 @@ def validate_and_normalise_user_input(
         flow_type: Literal['USER_INPUT_CODE', 'MAGIC_LINK', 'USER_INPUT_CODE_AND_MAGIC_LINK'],
         override: Union[OverrideConfig, None] = None,
         get_link_domain_and_path: Union[Callable[[str], Awaitable[Union[str, None]]]] = None,
-        get_custom_user_input_code: Union[Callable[[], Awaitable[str]], None] = None):
+        get_custom_user_input_code: Union[Callable[[], Awaitable[str]], None] = None,
+        user_existence_cache: Union[UserExistenceCacheConfig, None] = None):
 
     if override is None:
         override = OverrideConfig()
@@ -192,5 +233,6 @@ def validate_and_normalise_user_input(
         override=OverrideConfig(functions=override.functions, apis=override.apis),
         flow_type=flow_type,
         get_link_domain_and_path=get_link_domain_and_path,
-        get_custom_user_input_code=get_custom_user_input_code
+        get_custom_user_input_code=get_custom_user_input_code,
+        user_existence_cache=None if user_existence_cache is None else UserExistenceCache(user_existence_cache, app_info.get_client_ip)
     )
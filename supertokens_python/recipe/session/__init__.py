@@ -16,8 +16,18 @@ from typing import Union, Literal
 from .session_class import Session
 from .recipe import SessionRecipe
 from . import exceptions
-from .utils import InputErrorHandlers, InputOverrideConfig, JWTConfig
-from supertokens_python.recipe.openid import InputOverrideConfig as OpenIdInputOverrideConfig, JWTOverrideConfig
+from .utils import InputErrorHandlers, InputOverrideConfig, JWTConfig, AccessTokenPreCheckConfig
+
+
+def __getattr__(name):
+    # the openid / jwt recipes are only imported when the JWT feature is used
+    if name == 'OpenIdInputOverrideConfig':
+        from supertokens_python.recipe.openid import InputOverrideConfig as OpenIdInputOverrideConfig
+        return OpenIdInputOverrideConfig
+    if name == 'JWTOverrideConfig':
+        from supertokens_python.recipe.openid import JWTOverrideConfig
+        return JWTOverrideConfig
+    raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
 
 
 def init(cookie_domain: Union[str, None] = None,
@@ -27,7 +37,8 @@ def init(cookie_domain: Union[str, None] = None,
          anti_csrf: Union[Literal["VIA_TOKEN", "VIA_CUSTOM_HEADER", "NONE"], None] = None,
          error_handlers: Union[InputErrorHandlers, None] = None,
          override: Union[InputOverrideConfig, None] = None,
-         jwt: Union[JWTConfig, None] = None):
+         jwt: Union[JWTConfig, None] = None,
+         access_token_pre_check: Union[AccessTokenPreCheckConfig, None] = None):
     return SessionRecipe.init(cookie_domain,
                               cookie_secure,
                               cookie_same_site,
@@ -35,4 +46,5 @@ def init(cookie_domain: Union[str, None] = None,
                               anti_csrf,
                               error_handlers,
                               override,
-                              jwt)
+                              jwt,
+                              access_token_pre_check)
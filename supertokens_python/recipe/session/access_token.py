@@ -12,10 +12,20 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 from __future__ import annotations
-from .jwt import get_payload
+
+import re
+from typing import Union, TYPE_CHECKING
+
+from .jwt import verify_signature, ParsedJWT, _allowed_headers
 from supertokens_python.utils import get_timestamp_ms
 from .exceptions import raise_try_refresh_token_exception
-from typing import Union
+
+if TYPE_CHECKING:
+    from .utils import AccessTokenPreCheckConfig
+
+# base64 (and base64url) encoded header, payload and signature
+_access_token_characters = re.compile(r'[A-Za-z0-9+/=_-]+\.[A-Za-z0-9+/=_-]+\.[A-Za-z0-9+/=_-]+')
+_allowed_header_prefixes = tuple(header + '.' for header in _allowed_headers)
 
 
 def sanitize_string(s: any) -> Union[str, None]:
@@ -36,43 +46,96 @@ def sanitize_number(n: any) -> Union[Union[int, float], None]:
     return None
 
 
-def get_info_from_access_token(
-        token: str, jwt_signing_public_key: str, do_anti_csrf_check: bool):
+class AccessTokenInfo:
+    __slots__ = ('session_handle', 'user_id', 'refresh_token_hash_1', 'parent_refresh_token_hash_1', 'user_data',
+                 'anti_csrf_token', 'expiry_time', 'time_created')
+
+    def __init__(self, session_handle: str, user_id: str, refresh_token_hash_1: str,
+                 parent_refresh_token_hash_1: Union[str, None], user_data: dict, anti_csrf_token: Union[str, None],
+                 expiry_time: int, time_created: int):
+        self.session_handle = session_handle
+        self.user_id = user_id
+        self.refresh_token_hash_1 = refresh_token_hash_1
+        self.parent_refresh_token_hash_1 = parent_refresh_token_hash_1
+        self.user_data = user_data
+        self.anti_csrf_token = anti_csrf_token
+        self.expiry_time = expiry_time
+        self.time_created = time_created
+
+
+def pre_check_access_token(token: str, config: AccessTokenPreCheckConfig) -> Union[ParsedJWT, str]:
+    """
+    Runs the cheap checks of `config` on a raw access token. Returns the parsed token, or
+    why it was rejected, so that junk tokens never reach the signature verification.
+    """
+    if config.max_length is not None and len(token) > config.max_length:
+        return 'Access token is too long'
+    if config.check_characters and _access_token_characters.fullmatch(token) is None:
+        return 'Access token contains invalid characters'
+    if config.check_header and not token.startswith(_allowed_header_prefixes):
+        return 'jwt header mismatch'
     try:
-        payload = get_payload(token, jwt_signing_public_key)
-        session_handle = sanitize_string(payload.get('sessionHandle'))
-        user_id = sanitize_string(payload.get('userId'))
-        refresh_token_hash_1 = sanitize_string(
-            payload.get('refreshTokenHash1'))
-        parent_refresh_token_hash_1 = sanitize_string(
-            payload.get('parentRefreshTokenHash1'))
-        user_data = payload.get('userData')
-        anti_csrf_token = sanitize_string(payload.get('antiCsrfToken'))
-        expiry_time = sanitize_number(payload.get('expiryTime'))
-        time_created = sanitize_number(payload.get('timeCreated'))
-
-        if (session_handle is None) or \
-                (user_data is None) or \
-                (refresh_token_hash_1 is None) or \
-                (user_data is None) or \
-                (anti_csrf_token is None and do_anti_csrf_check) or \
-                (expiry_time is None) or \
-                (time_created is None):
-            raise Exception(
-                'Access token does not contain all the information. Maybe the structure has changed?')
-
-        if expiry_time < get_timestamp_ms():
-            raise Exception('Access token expired')
-
-        return {
-            'sessionHandle': session_handle,
-            'userId': user_id,
-            'refreshTokenHash1': refresh_token_hash_1,
-            'parentRefreshTokenHash1': parent_refresh_token_hash_1,
-            'userData': user_data,
-            'antiCsrfToken': anti_csrf_token,
-            'expiryTime': expiry_time,
-            'timeCreated': time_created
-        }
+        parsed = ParsedJWT(token)
+        if config.check_expiry:
+            expiry_time = sanitize_number(parsed.get_payload().get('expiryTime'))
+            if expiry_time is not None and expiry_time < get_timestamp_ms():
+                return 'Access token expired'
     except Exception as e:
-        raise_try_refresh_token_exception(e)
+        return str(e)
+    return parsed
+
+
+def verify_access_token(
+        token: ParsedJWT, jwt_signing_public_key: str, do_anti_csrf_check: bool) -> Union[AccessTokenInfo, str]:
+    """
+    Returns the information in the access token, or why it is not valid for the signing
+    key, without raising.
+    """
+    error = verify_signature(token, jwt_signing_public_key)
+    if error is not None:
+        return error
+    try:
+        payload = token.get_payload()
+    except Exception as e:
+        return str(e)
+    if not isinstance(payload, dict):
+        return 'Access token does not contain all the information. Maybe the structure has changed?'
+
+    session_handle = sanitize_string(payload.get('sessionHandle'))
+    user_id = sanitize_string(payload.get('userId'))
+    refresh_token_hash_1 = sanitize_string(
+        payload.get('refreshTokenHash1'))
+    parent_refresh_token_hash_1 = sanitize_string(
+        payload.get('parentRefreshTokenHash1'))
+    user_data = payload.get('userData')
+    anti_csrf_token = sanitize_string(payload.get('antiCsrfToken'))
+    expiry_time = sanitize_number(payload.get('expiryTime'))
+    time_created = sanitize_number(payload.get('timeCreated'))
+
+    if (session_handle is None) or \
+            (user_data is None) or \
+            (refresh_token_hash_1 is None) or \
+            (user_data is None) or \
+            (anti_csrf_token is None and do_anti_csrf_check) or \
+            (expiry_time is None) or \
+            (time_created is None):
+        return 'Access token does not contain all the information. Maybe the structure has changed?'
+
+    if expiry_time < get_timestamp_ms():
+        return 'Access token expired'
+
+    return AccessTokenInfo(session_handle, user_id, refresh_token_hash_1, parent_refresh_token_hash_1, user_data,
+                           anti_csrf_token, expiry_time, time_created)
+
+
+def get_info_from_access_token(
+        token: Union[str, ParsedJWT], jwt_signing_public_key: str, do_anti_csrf_check: bool) -> AccessTokenInfo:
+    if not isinstance(token, ParsedJWT):
+        try:
+            token = ParsedJWT(token)
+        except Exception as e:
+            raise_try_refresh_token_exception(e)
+    result = verify_access_token(token, jwt_signing_public_key, do_anti_csrf_check)
+    if isinstance(result, str):
+        raise_try_refresh_token_exception(result)
+    return result
@@ -11,13 +11,19 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
-from typing import Union, List
+from __future__ import annotations
+
+from typing import Union, List, TYPE_CHECKING, Callable, Dict
 
-from supertokens_python.recipe.openid.interfaces import CreateJwtResult, GetJWKSResult, \
-    GetOpenIdDiscoveryConfigurationResult
 from supertokens_python.recipe.session.session_class import Session
 from supertokens_python.recipe.session.recipe import SessionRecipe
 from supertokens_python.utils import FRAMEWORKS
+from supertokens_python.batch import BatchResult, run_batch, DEFAULT_BATCH_CONCURRENCY
+from supertokens_python.recipe.session.exceptions import UnauthorisedError
+
+if TYPE_CHECKING:
+    from supertokens_python.recipe.openid.interfaces import CreateJwtResult, GetJWKSResult, \
+        GetOpenIdDiscoveryConfigurationResult
 
 
 async def create_new_session(request, user_id: str, access_token_payload: Union[dict, None] = None,
@@ -53,6 +59,11 @@ async def revoke_all_sessions_for_user(user_id: str) -> List[str]:
     return await SessionRecipe.get_instance().recipe_implementation.revoke_all_sessions_for_user(user_id)
 
 
+async def revoke_all_sessions_for_users(user_ids: List[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                                        on_progress: Union[Callable[[int, int], None], None] = None) -> BatchResult:
+    return await run_batch(user_ids, revoke_all_sessions_for_user, concurrency, on_progress)
+
+
 async def get_all_session_handles_for_user(user_id: str) -> List[str]:
     return await SessionRecipe.get_instance().recipe_implementation.get_all_session_handles_for_user(user_id)
 
@@ -65,6 +76,38 @@ async def get_session_information(session_handle: str) -> dict:
     return await SessionRecipe.get_instance().recipe_implementation.get_session_information(session_handle)
 
 
+async def get_sessions_information(session_handles: List[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                                   cache_ttl_seconds: Union[float, None] = None) -> Dict[str, Union[dict, None]]:
+    """
+    Returns the information of every distinct session handle (None for sessions that
+    do not exist any more), fetching at most `concurrency` of them at a time. With
+    `cache_ttl_seconds`, the information is kept for that long and later calls only
+    fetch what is missing; it is dropped as soon as a session is revoked or updated.
+    """
+    recipe = SessionRecipe.get_instance()
+    cache = recipe.session_information_cache
+    session_handles = list(dict.fromkeys(session_handles))
+    information = {}
+    if cache_ttl_seconds is not None:
+        for session_handle in session_handles:
+            cached = cache.get(session_handle)
+            if cached is not None:
+                information[session_handle] = cached
+
+    result = await run_batch([h for h in session_handles if h not in information],
+                             recipe.recipe_implementation.get_session_information, concurrency)
+    for session_handle, error in result.errors.items():
+        if not isinstance(error, UnauthorisedError):
+            raise error
+        information[session_handle] = None
+    for session_handle, session_information in result.results.items():
+        information[session_handle] = session_information
+        if cache_ttl_seconds is not None:
+            cache.set(session_handle, session_information, cache_ttl_seconds)
+
+    return {session_handle: information[session_handle] for session_handle in session_handles}
+
+
 async def update_session_data(session_handle: str, new_session_data: dict) -> None:
     return await SessionRecipe.get_instance().recipe_implementation.update_session_data(session_handle,
                                                                                         new_session_data)
@@ -74,6 +117,23 @@ async def update_access_token_payload(session_handle: str, new_access_token_payl
     return await SessionRecipe.get_instance().recipe_implementation.update_access_token_payload(session_handle, new_access_token_payload)
 
 
+async def update_session_data_for_user(user_id: str, new_session_data: dict,
+                                       concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                                       on_progress: Union[Callable[[int, int], None], None] = None) -> BatchResult:
+    async def update(session_handle: str):
+        return await update_session_data(session_handle, new_session_data)
+    return await run_batch(await get_all_session_handles_for_user(user_id), update, concurrency, on_progress)
+
+
+async def update_access_token_payload_for_user(user_id: str, new_access_token_payload: dict,
+                                               concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                                               on_progress: Union[Callable[[int, int], None], None] = None) -> \
+        BatchResult:
+    async def update(session_handle: str):
+        return await update_access_token_payload(session_handle, new_access_token_payload)
+    return await run_batch(await get_all_session_handles_for_user(user_id), update, concurrency, on_progress)
+
+
 async def create_jwt(payload: dict, validity_seconds: int = None) -> [CreateJwtResult, None]:
     openid_recipe = SessionRecipe.get_instance().openid_recipe
 
@@ -22,3 +22,5 @@ RID_HEADER_KEY = 'rid'
 ID_REFRESH_TOKEN_HEADER_SET_KEY = 'id-refresh-token'
 ID_REFRESH_TOKEN_HEADER_GET_KEY = 'id-refresh-token'
 ACCESS_CONTROL_EXPOSE_HEADERS = 'Access-Control-Expose-Headers'
+SESSION_INFORMATION_CACHE_MAX_SIZE = 10000
+DEFAULT_MAX_ACCESS_TOKEN_LENGTH = 8192
@@ -13,7 +13,7 @@
 # under the License.
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Union
 
 try:
     from typing import Literal
@@ -37,18 +37,38 @@ if TYPE_CHECKING:
     from supertokens_python.framework.request import BaseRequest
     from supertokens_python.framework.response import BaseResponse
     from .recipe import SessionRecipe
-from supertokens_python.utils import get_header
+    from .utils import SessionConfig
+from json import dumps
+
+from supertokens_python.utils import get_header, utf_base64encode
 from supertokens_python.exceptions import raise_general_exception
-from supertokens_python.utils import (
-    utf_base64encode
-)
-from json import (
-    dumps
-)
+
+
+class CookieTemplates:
+    """
+    The attributes of the session cookies, built once from the session config so that
+    setting or clearing a cookie does not read the config and normalise the path again.
+    """
+    __slots__ = ('access_token_path', 'refresh_token_path', 'clear_cookies')
+
+    def __init__(self, config: SessionConfig):
+        attributes = {
+            'domain': config.cookie_domain,
+            'secure': config.cookie_secure,
+            'httponly': True,
+            'samesite': config.cookie_same_site
+        }
+        self.access_token_path = dict(attributes, path='/')
+        self.refresh_token_path = dict(attributes, path=config.refresh_token_path.get_as_string_dangerous())
+        self.clear_cookies = (
+            (ACCESS_TOKEN_COOKIE_KEY, self.access_token_path),
+            (ID_REFRESH_TOKEN_COOKIE_KEY, self.access_token_path),
+            (REFRESH_TOKEN_COOKIE_KEY, self.refresh_token_path)
+        )
 
 
 def set_front_token_in_headers(recipe: SessionRecipe, response: BaseResponse, user_id: str, expires_at: int,
-                               jwt_payload=None):
+                               jwt_payload=None, expose_headers: Union[List[str], None] = None):
     if jwt_payload is None:
         jwt_payload = {}
     token_info = {
@@ -56,24 +76,15 @@ def set_front_token_in_headers(recipe: SessionRecipe, response: BaseResponse, us
         'ate': expires_at,
         'up': jwt_payload
     }
+    # the frontend SDKs decode the front token as ASCII-escaped JSON, so it does not go
+    # through the configured JSON codec
     set_header(
         recipe,
         response,
         FRONT_TOKEN_HEADER_SET_KEY,
-        utf_base64encode(
-            dumps(
-                token_info,
-                separators=(
-                    ',',
-                    ':'),
-                sort_keys=True)),
+        utf_base64encode(dumps(token_info, separators=(',', ':'), sort_keys=True)),
         False)
-    set_header(
-        recipe,
-        response,
-        ACCESS_CONTROL_EXPOSE_HEADERS,
-        FRONT_TOKEN_HEADER_SET_KEY,
-        True)
+    expose_header(recipe, response, FRONT_TOKEN_HEADER_SET_KEY, expose_headers)
 
 
 def get_cors_allowed_headers():
@@ -100,6 +111,21 @@ def set_header(recipe: SessionRecipe, response: BaseResponse,
             value)
 
 
+def expose_header(recipe: SessionRecipe, response: BaseResponse, key: str,
+                  expose_headers: Union[List[str], None] = None):
+    # callers that set several headers collect the keys in expose_headers and write
+    # them with a single set_expose_headers call
+    if expose_headers is None:
+        set_header(recipe, response, ACCESS_CONTROL_EXPOSE_HEADERS, key, True)
+    else:
+        expose_headers.append(key)
+
+
+def set_expose_headers(recipe: SessionRecipe, response: BaseResponse, expose_headers: List[str]):
+    if len(expose_headers) != 0:
+        set_header(recipe, response, ACCESS_CONTROL_EXPOSE_HEADERS, ','.join(expose_headers), True)
+
+
 def get_cookie(request: BaseRequest, key: str):
     cookie_val = request.get_cookie(key)
     if cookie_val is None:
@@ -109,27 +135,17 @@ def get_cookie(request: BaseRequest, key: str):
 
 def set_cookie(recipe: SessionRecipe, response: BaseResponse, key, value,
                expires, path_type: Literal['refresh_token_path', 'access_token_path']):
-    domain = recipe.config.cookie_domain
-    secure = recipe.config.cookie_secure
-    same_site = recipe.config.cookie_same_site
-    path = ''
     if path_type == 'refresh_token_path':
-        path = recipe.config.refresh_token_path.get_as_string_dangerous()
-    elif path_type == 'access_token_path':
-        path = '/'
-    http_only = True
-    response.set_cookie(key=key, value=quote(value, encoding='utf-8'), expires=expires,
-                        path=path, domain=domain, secure=secure, httponly=http_only, samesite=same_site)
+        attributes = recipe.cookie_templates.refresh_token_path
+    else:
+        attributes = recipe.cookie_templates.access_token_path
+    response.set_cookie(key=key, value=quote(value, encoding='utf-8'), expires=expires, **attributes)
 
 
 def attach_anti_csrf_header(recipe: SessionRecipe,
-                            response: BaseResponse, value):
+                            response: BaseResponse, value, expose_headers: Union[List[str], None] = None):
     set_header(recipe, response, ANTI_CSRF_HEADER_KEY, value, False)
-    set_header(
-        recipe,
-        response,
-        ACCESS_CONTROL_EXPOSE_HEADERS,
-        ANTI_CSRF_HEADER_KEY, True)
+    expose_header(recipe, response, ANTI_CSRF_HEADER_KEY, expose_headers)
 
 
 def get_anti_csrf_header(request: BaseRequest):
@@ -163,7 +179,7 @@ def attach_refresh_token_to_cookie(
 
 
 def attach_id_refresh_token_to_cookie_and_header(
-        recipe: SessionRecipe, response: BaseResponse, token, expires_at):
+        recipe: SessionRecipe, response: BaseResponse, token, expires_at, expose_headers: Union[List[str], None] = None):
     set_header(
         recipe,
         response,
@@ -173,13 +189,7 @@ def attach_id_refresh_token_to_cookie_and_header(
         str(expires_at),
         False
     )
-    set_header(
-        recipe,
-        response,
-        ACCESS_CONTROL_EXPOSE_HEADERS,
-        ID_REFRESH_TOKEN_HEADER_SET_KEY,
-        True
-    )
+    expose_header(recipe, response, ID_REFRESH_TOKEN_HEADER_SET_KEY, expose_headers)
     set_cookie(
         recipe,
         response,
@@ -203,36 +213,12 @@ def get_id_refresh_token_from_cookie(request: BaseRequest):
 
 def clear_cookies(recipe: SessionRecipe, response: BaseResponse):
     if response is not None:
-        set_cookie(
-            recipe,
-            response,
-            ACCESS_TOKEN_COOKIE_KEY,
-            '',
-            0,
-            'access_token_path')
-        set_cookie(
-            recipe,
-            response,
-            ID_REFRESH_TOKEN_COOKIE_KEY,
-            '',
-            0,
-            'access_token_path')
-        set_cookie(
-            recipe,
-            response,
-            REFRESH_TOKEN_COOKIE_KEY,
-            '',
-            0,
-            'refresh_token_path')
+        for key, attributes in recipe.cookie_templates.clear_cookies:
+            response.set_cookie(key=key, value='', expires=0, **attributes)
         set_header(
             recipe,
             response,
             ID_REFRESH_TOKEN_HEADER_SET_KEY,
             "remove",
             False)
-        set_header(
-            recipe,
-            response,
-            ACCESS_CONTROL_EXPOSE_HEADERS,
-            ID_REFRESH_TOKEN_HEADER_SET_KEY,
-            True)
+        expose_header(recipe, response, ID_REFRESH_TOKEN_HEADER_SET_KEY)
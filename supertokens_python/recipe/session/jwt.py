@@ -11,20 +11,24 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+from __future__ import annotations
 
-from supertokens_python.utils import (
-    utf_base64decode,
-    utf_base64encode
-)
+from binascii import a2b_base64, Error as BinasciiError
+from functools import lru_cache
 from json import (
-    loads,
     dumps
 )
+from textwrap import wrap
+from typing import Union
+
+from Crypto.Hash import SHA256
 from Crypto.PublicKey import RSA
 from Crypto.Signature.pkcs1_15 import PKCS115_SigScheme
-from Crypto.Hash import SHA256
-from base64 import b64decode
-from textwrap import wrap
+
+from supertokens_python.json_codec import json_loads
+from supertokens_python.utils import (
+    utf_base64encode
+)
 
 _key_start = '-----BEGIN PUBLIC KEY-----\n'
 _key_end = '\n-----END PUBLIC KEY-----'
@@ -41,17 +45,47 @@ _allowed_headers = [utf_base64encode(dumps({
     'typ': 'JWT',
     'version': '2'
 }, separators=(',', ':'), sort_keys=True))]
+_allowed_header_bytes = frozenset(header.encode('ascii') for header in _allowed_headers)
+
 
+class ParsedJWT:
+    """
+    A JWT split once into memoryview slices of its bytes, so that checking the header,
+    hashing the signing input and decoding the payload do not copy the token again.
+    The decoded payload is kept, so the verify and the refresh fallback paths share it.
+    """
+    __slots__ = ('header', 'payload', 'signature', 'signing_input', '__decoded_payload')
 
-def get_payload(jwt, signing_public_key):
-    splitted_input = jwt.split(".")
-    if len(splitted_input) != 3:
-        raise Exception("invalid jwt")
+    def __init__(self, jwt: Union[str, bytes]):
+        if isinstance(jwt, str):
+            try:
+                jwt = jwt.encode('ascii')
+            except UnicodeEncodeError:
+                raise Exception("invalid jwt")
+        first_dot = jwt.find(b'.')
+        second_dot = jwt.find(b'.', first_dot + 1)
+        if first_dot == -1 or second_dot == -1 or jwt.find(b'.', second_dot + 1) != -1:
+            raise Exception("invalid jwt")
+        view = memoryview(jwt)
+        self.header = view[:first_dot]
+        self.payload = view[first_dot + 1:second_dot]
+        self.signature = view[second_dot + 1:]
+        self.signing_input = view[:second_dot]
+        self.__decoded_payload = None
 
-    header, payload, signature = splitted_input
-    if header not in _allowed_headers:
-        raise Exception("jwt header mismatch")
+    def get_payload(self) -> dict:
+        if self.__decoded_payload is None:
+            try:
+                self.__decoded_payload = json_loads(a2b_base64(self.payload))
+            except BinasciiError:
+                raise Exception("invalid jwt")
+        return self.__decoded_payload
 
+
+@lru_cache(maxsize=32)
+def _get_verifier(signing_public_key: str) -> PKCS115_SigScheme:
+    # importing the key is much slower than verifying with it, and there are only a
+    # handful of signing keys alive at a time
     public_key = RSA.import_key(
         _key_start +
         "\n".join(
@@ -59,20 +93,37 @@ def get_payload(jwt, signing_public_key):
                 signing_public_key,
                 width=64)) +
         _key_end)
-    verifier = PKCS115_SigScheme(public_key)
-    to_verify = SHA256.new((header + "." + payload).encode('utf-8'))
+    return PKCS115_SigScheme(public_key)
+
+
+def verify_signature(jwt: ParsedJWT, signing_public_key: str) -> Union[str, None]:
+    """
+    Returns why the jwt is not valid for the signing key, or None if it is.
+    """
+    if jwt.header not in _allowed_header_bytes:
+        return "jwt header mismatch"
+
+    verifier = _get_verifier(signing_public_key)
+    to_verify = SHA256.new(jwt.signing_input)
     try:
-        verifier.verify(to_verify, b64decode(signature.encode('utf-8')))
-    except BaseException:
-        raise Exception("jwt verification failed")
+        verifier.verify(to_verify, a2b_base64(jwt.signature))
+    except Exception:
+        return "jwt verification failed"
+    return None
+
+
+def get_payload(jwt: Union[str, ParsedJWT], signing_public_key: str) -> dict:
+    if not isinstance(jwt, ParsedJWT):
+        jwt = ParsedJWT(jwt)
 
-    return loads(utf_base64decode(payload))
+    error = verify_signature(jwt, signing_public_key)
+    if error is not None:
+        raise Exception(error)
 
+    return jwt.get_payload()
 
-def get_payload_without_verifying(jwt: str) -> dict:
-    splitted_input = jwt.split(".")
-    if len(splitted_input) != 3:
-        raise Exception("invalid jwt")
 
-    payload = splitted_input[1]
-    return loads(utf_base64decode(payload))
+def get_payload_without_verifying(jwt: Union[str, ParsedJWT]) -> dict:
+    if not isinstance(jwt, ParsedJWT):
+        jwt = ParsedJWT(jwt)
+    return jwt.get_payload()
@@ -15,6 +15,7 @@ from __future__ import annotations
 
 from .cookie_and_header import (
     get_cors_allowed_headers,
+    CookieTemplates
 )
 from .exceptions import (
     TokenTheftError,
@@ -32,7 +33,9 @@ from supertokens_python.framework.response import BaseResponse
 if TYPE_CHECKING:
     from supertokens_python.framework import BaseRequest
     from supertokens_python.supertokens import AppInfo
-from .utils import validate_and_normalise_user_input, InputErrorHandlers, InputOverrideConfig, JWTConfig
+    from supertokens_python.recipe.openid.recipe import OpenIdRecipe
+from .utils import validate_and_normalise_user_input, InputErrorHandlers, InputOverrideConfig, JWTConfig, \
+    AccessTokenPreCheckConfig
 from .constants import SESSION_REFRESH, SIGNOUT
 from supertokens_python.normalised_url_path import NormalisedURLPath
 from supertokens_python.recipe_module import RecipeModule, APIHandled
@@ -41,8 +44,6 @@ from .recipe_implementation import RecipeImplementation
 from supertokens_python.querier import Querier
 from .api.implementation import APIImplementation
 from .interfaces import APIOptions
-from supertokens_python.recipe.openid.recipe import OpenIdRecipe
-from supertokens_python.recipe.session.with_jwt import RecipeImplementationWithJWT
 
 
 class SessionRecipe(RecipeModule):
@@ -57,7 +58,8 @@ class SessionRecipe(RecipeModule):
                  anti_csrf: Union[Literal["VIA_TOKEN", "VIA_CUSTOM_HEADER", "NONE"], None] = None,
                  error_handlers: Union[InputErrorHandlers, None] = None,
                  override: Union[InputOverrideConfig, None] = None,
-                 jwt: Union[JWTConfig, None] = None):
+                 jwt: Union[JWTConfig, None] = None,
+                 access_token_pre_check: Union[AccessTokenPreCheckConfig, None] = None):
         super().__init__(recipe_id, app_info)
         self.openid_recipe: Union[None, OpenIdRecipe] = None
         self.config = validate_and_normalise_user_input(self, app_info, cookie_domain,
@@ -67,17 +69,22 @@ class SessionRecipe(RecipeModule):
                                                         anti_csrf,
                                                         error_handlers,
                                                         override,
-                                                        jwt)
+                                                        jwt,
+                                                        access_token_pre_check)
+        self.cookie_templates = CookieTemplates(self.config)
         if self.config.jwt.enable:
+            from supertokens_python.recipe.openid import recipe as openid
+            from .with_jwt.recipe_implementation import RecipeImplementationWithJWT
             openid_feature_override = None
             if override is not None:
                 openid_feature_override = override.openid_feature
-            self.openid_recipe = OpenIdRecipe(recipe_id, app_info, None, self.config.jwt.issuer,
-                                              openid_feature_override)
+            self.openid_recipe = openid.OpenIdRecipe(recipe_id, app_info, None, self.config.jwt.issuer,
+                                                     openid_feature_override)
             recipe_implementation = RecipeImplementationWithJWT(
                 Querier.get_instance(recipe_id), self.config, self.openid_recipe.recipe_implementation)
         else:
             recipe_implementation = RecipeImplementation(Querier.get_instance(recipe_id), self.config)
+        self.session_information_cache = recipe_implementation.session_information_cache
         self.recipe_implementation = recipe_implementation if self.config.override.functions is None else self.config.override.functions(
             recipe_implementation)
         api_implementation = APIImplementation()
@@ -153,7 +160,8 @@ class SessionRecipe(RecipeModule):
              anti_csrf: Union[Literal["VIA_TOKEN", "VIA_CUSTOM_HEADER", "NONE"], None] = None,
              error_handlers: Union[InputErrorHandlers, None] = None,
              override: Union[InputOverrideConfig, None] = None,
-             jwt: Union[JWTConfig, None] = None):
+             jwt: Union[JWTConfig, None] = None,
+             access_token_pre_check: Union[AccessTokenPreCheckConfig, None] = None):
         def func(app_info: AppInfo):
             if SessionRecipe.__instance is None:
                 SessionRecipe.__instance = SessionRecipe(
@@ -164,7 +172,8 @@ class SessionRecipe(RecipeModule):
                     anti_csrf,
                     error_handlers,
                     override,
-                    jwt
+                    jwt,
+                    access_token_pre_check
                 )
                 return SessionRecipe.__instance
             else:
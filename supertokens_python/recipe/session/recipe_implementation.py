@@ -23,14 +23,19 @@ from .cookie_and_header import get_id_refresh_token_from_cookie, get_access_toke
 from . import session_functions
 from supertokens_python.utils import execute_in_background, FRAMEWORKS, frontend_has_interceptor, \
     normalise_http_method, get_timestamp_ms
+from supertokens_python.ttl_cache import TTLCache
+from .constants import SESSION_INFORMATION_CACHE_MAX_SIZE
 
 if TYPE_CHECKING:
     from typing import Union, List
     from .utils import SessionConfig
     from supertokens_python.querier import Querier
+    from supertokens_python.framework.request import BaseRequest
 
 
 class HandshakeInfo:
+    __slots__ = ('access_token_blacklisting_enabled', 'raw_jwt_signing_public_key_list', 'anti_csrf',
+                 'access_token_validity', 'refresh_token_validity')
 
     def __init__(self, info):
         self.access_token_blacklisting_enabled = info['accessTokenBlacklistingEnabled']
@@ -47,12 +52,37 @@ class HandshakeInfo:
         return [key for key in self.raw_jwt_signing_public_key_list if key['expiryTime'] > time_now]
 
 
+def get_verified_session_from_request(request: BaseRequest, verified_tokens: tuple) -> Union[Session, None]:
+    """
+    Returns the session already verified earlier in this request (e.g. by verify_session) if it was
+    verified with the same tokens and at least as strict an anti-csrf check, so that calling get_session
+    several times in one request does not re-verify the access token or call the core again.
+    """
+    session = request.get_session()
+    if not isinstance(session, Session) or session.verified_tokens is None or session.remove_cookies:
+        return None
+    access_token, anti_csrf_token, anti_csrf_check, has_rid_header = verified_tokens
+    verified_access_token, verified_anti_csrf_token, verified_anti_csrf_check, verified_has_rid_header = \
+        session.verified_tokens
+    if access_token != verified_access_token or anti_csrf_token != verified_anti_csrf_token or \
+            has_rid_header != verified_has_rid_header:
+        return None
+    if anti_csrf_check and not verified_anti_csrf_check:
+        return None
+    return session
+
+
 class RecipeImplementation(RecipeInterface):
+    # the class of the sessions created by this recipe implementation
+    session_class = Session
+
     def __init__(self, querier: Querier, config: SessionConfig):
         super().__init__()
         self.querier = querier
         self.config = config
         self.handshake_info: Union[HandshakeInfo, None] = None
+        # filled by get_sessions_information when asked to cache, and cleared here whenever a session changes
+        self.session_information_cache = TTLCache(SESSION_INFORMATION_CACHE_MAX_SIZE)
 
         async def call_get_handshake_info():
             try:
@@ -101,8 +131,8 @@ class RecipeImplementation(RecipeInterface):
         access_token = session['accessToken']
         refresh_token = session['refreshToken']
         id_refresh_token = session['idRefreshToken']
-        new_session = Session(self, access_token['token'], session['session']['handle'],
-                              session['session']['userId'], session['session']['userDataInJWT'])
+        new_session = self.session_class(self, access_token['token'], session['session']['handle'],
+                                         session['session']['userId'], session['session']['userDataInJWT'])
         new_session.new_access_token_info = access_token
         new_session.new_refresh_token_info = refresh_token
         new_session.new_id_refresh_token_info = id_refresh_token
@@ -132,16 +162,23 @@ class RecipeImplementation(RecipeInterface):
         anti_csrf_token = get_anti_csrf_header(request)
         if anti_csrf_check is None:
             anti_csrf_check = normalise_http_method(request.method()) != 'get'
+        has_rid_header = get_rid_header(request) is not None
+        verified_tokens = (access_token, anti_csrf_token, anti_csrf_check, has_rid_header)
+        existing_session = get_verified_session_from_request(request, verified_tokens)
+        if existing_session is not None:
+            return existing_session
+
         new_session = await session_functions.get_session(self, access_token, anti_csrf_token, anti_csrf_check,
-                                                          get_rid_header(request) is not None)
+                                                          has_rid_header)
         if 'accessToken' in new_session:
             access_token = new_session['accessToken']['token']
 
-        session = Session(self, access_token, new_session['session']['handle'],
-                          new_session['session']['userId'], new_session['session']['userDataInJWT'])
+        session = self.session_class(self, access_token, new_session['session']['handle'],
+                                     new_session['session']['userId'], new_session['session']['userDataInJWT'])
 
         if 'accessToken' in new_session:
             session.new_access_token_info = new_session['accessToken']
+        session.verified_tokens = verified_tokens
         request.set_session(session)
         return request.get_session()
 
@@ -163,8 +200,8 @@ class RecipeImplementation(RecipeInterface):
         access_token = new_session['accessToken']
         refresh_token = new_session['refreshToken']
         id_refresh_token = new_session['idRefreshToken']
-        session = Session(self, access_token['token'], new_session['session']['handle'],
-                          new_session['session']['userId'], new_session['session']['userDataInJWT'])
+        session = self.session_class(self, access_token['token'], new_session['session']['handle'],
+                                     new_session['session']['userId'], new_session['session']['userDataInJWT'])
         session.new_access_token_info = access_token
         session.new_refresh_token_info = refresh_token
         session.new_id_refresh_token_info = id_refresh_token
@@ -175,25 +212,49 @@ class RecipeImplementation(RecipeInterface):
         return request.get_session()
 
     async def revoke_session(self, session_handle: str) -> bool:
-        return await session_functions.revoke_session(self, session_handle)
+        # dropped again afterwards, since a concurrent get_sessions_information can cache
+        # the old information while the core call is in flight
+        self.session_information_cache.delete(session_handle)
+        try:
+            return await session_functions.revoke_session(self, session_handle)
+        finally:
+            self.session_information_cache.delete(session_handle)
 
     async def revoke_all_sessions_for_user(self, user_id: str) -> List[str]:
-        return await session_functions.revoke_all_sessions_for_user(self, user_id)
+        # the handles are only known once revoked, so they are dropped after the core call
+        session_handles = await session_functions.revoke_all_sessions_for_user(self, user_id)
+        for session_handle in session_handles:
+            self.session_information_cache.delete(session_handle)
+        return session_handles
 
     async def get_all_session_handles_for_user(self, user_id: str) -> List[str]:
         return await session_functions.get_all_session_handles_for_user(self, user_id)
 
     async def revoke_multiple_sessions(self, session_handles: List[str]) -> List[str]:
-        return await session_functions.revoke_multiple_sessions(self, session_handles)
+        for session_handle in session_handles:
+            self.session_information_cache.delete(session_handle)
+        try:
+            return await session_functions.revoke_multiple_sessions(self, session_handles)
+        finally:
+            for session_handle in session_handles:
+                self.session_information_cache.delete(session_handle)
 
     async def get_session_information(self, session_handle: str) -> dict:
         return await session_functions.get_session_information(self, session_handle)
 
     async def update_session_data(self, session_handle: str, new_session_data: dict) -> None:
-        await session_functions.update_session_data(self, session_handle, new_session_data)
+        self.session_information_cache.delete(session_handle)
+        try:
+            await session_functions.update_session_data(self, session_handle, new_session_data)
+        finally:
+            self.session_information_cache.delete(session_handle)
 
     async def update_access_token_payload(self, session_handle: str, new_access_token_payload: dict) -> None:
-        await session_functions.update_access_token_payload(self, session_handle, new_access_token_payload)
+        self.session_information_cache.delete(session_handle)
+        try:
+            await session_functions.update_access_token_payload(self, session_handle, new_access_token_payload)
+        finally:
+            self.session_information_cache.delete(session_handle)
 
     async def get_access_token_lifetime_ms(self) -> int:
         return (await self.get_handshake_info()).access_token_validity
@@ -19,11 +19,16 @@ from supertokens_python.normalised_url_path import NormalisedURLPath
 if TYPE_CHECKING:
     from .recipe_implementation import RecipeImplementation
 
-from . import session_functions
 from .exceptions import raise_unauthorised_exception
 
 
 class Session:
+    # a session is created for every verified request, so it keeps its attributes in slots
+    # instead of a per-instance __dict__
+    __slots__ = ('__recipe_implementation', '__access_token', '__session_handle', 'access_token_payload', 'user_id',
+                 'new_access_token_info', 'new_refresh_token_info', 'new_id_refresh_token_info', 'new_anti_csrf_token',
+                 'remove_cookies', 'verified_tokens')
+
     def __init__(self, recipe_implementation: RecipeImplementation, access_token, session_handle, user_id,
                  access_token_payload):
         super().__init__()
@@ -37,9 +42,12 @@ class Session:
         self.new_id_refresh_token_info = None
         self.new_anti_csrf_token = None
         self.remove_cookies = False
+        # (access token, anti-csrf token, anti-csrf check, rid header present) this session was
+        # verified with, so that get_session can reuse it for the rest of the request
+        self.verified_tokens = None
 
     async def revoke_session(self) -> None:
-        if await session_functions.revoke_session(self.__recipe_implementation, self.__session_handle):
+        if await self.__recipe_implementation.revoke_session(self.__session_handle):
             self.remove_cookies = True
 
     def sync_revoke_session(self) -> None:
@@ -49,26 +57,30 @@ class Session:
         return sync(self.get_session_data())
 
     async def get_session_data(self) -> dict:
-        session_info = await session_functions.get_session_information(self.__recipe_implementation,
-                                                                       self.__session_handle)
+        session_info = await self.__recipe_implementation.get_session_information(self.__session_handle)
         return session_info['sessionData']
 
     def sync_update_session_data(self, new_session_data) -> None:
         sync(self.update_session_data(new_session_data))
 
     async def update_session_data(self, new_session_data) -> None:
-        return await session_functions.update_session_data(self.__recipe_implementation, self.__session_handle,
-                                                           new_session_data)
+        return await self.__recipe_implementation.update_session_data(self.__session_handle, new_session_data)
 
     def sync_update_access_token_payload(self, new_access_token_payload) -> None:
         sync(self.update_access_token_payload(new_access_token_payload))
 
     async def update_access_token_payload(self, new_access_token_payload) -> None:
-        result = await self.__recipe_implementation.querier.send_post_request(NormalisedURLPath('/recipe/session'
-                                                                                                '/regenerate'), {
-            'accessToken': self.__access_token,
-            'userDataInJWT': new_access_token_payload
-        })
+        cache = self.__recipe_implementation.session_information_cache
+        # dropped before and after the core call, like in the recipe implementation
+        cache.delete(self.__session_handle)
+        try:
+            result = await self.__recipe_implementation.querier.send_post_request(
+                NormalisedURLPath('/recipe/session/regenerate'), {
+                    'accessToken': self.__access_token,
+                    'userDataInJWT': new_access_token_payload
+                })
+        finally:
+            cache.delete(self.__session_handle)
         if result['status'] == 'UNAUTHORISED':
             raise_unauthorised_exception('Session has probably been revoked while updating access token payload')
         self.access_token_payload = result['session']['userDataInJWT']
@@ -15,8 +15,7 @@ from __future__ import annotations
 
 import time
 from typing import Union, TYPE_CHECKING, List
-from .access_token import get_info_from_access_token
-from .jwt import get_payload_without_verifying
+from .access_token import AccessTokenInfo, pre_check_access_token, verify_access_token
 
 if TYPE_CHECKING:
     from .recipe_implementation import RecipeImplementation
@@ -24,8 +23,7 @@ from supertokens_python.normalised_url_path import NormalisedURLPath
 from .exceptions import (
     raise_try_refresh_token_exception,
     raise_unauthorised_exception,
-    raise_token_theft_exception,
-    TryRefreshTokenError
+    raise_token_theft_exception
 )
 from supertokens_python.process_state import AllowedProcessStates, ProcessState
 
@@ -59,42 +57,40 @@ async def create_new_session(recipe_implementation: RecipeImplementation, user_i
 async def get_session(recipe_implementation: RecipeImplementation, access_token: str,
                       anti_csrf_token: Union[str, None],
                       do_anti_csrf_check: bool, contains_custom_header: bool):
+    # junk tokens are rejected before the handshake and the signature verification. The
+    # checks below return why a token is invalid instead of raising, and the
+    # TryRefreshTokenError is only raised once a decision is made.
+    parsed_access_token = pre_check_access_token(access_token, recipe_implementation.config.access_token_pre_check)
+    if isinstance(parsed_access_token, str):
+        raise_try_refresh_token_exception(parsed_access_token)
+
     handshake_info = await recipe_implementation.get_handshake_info()
     access_token_info = None
     found_a_sign_key_that_is_older_than_the_access_token = False
+    do_access_token_anti_csrf_check = handshake_info.anti_csrf == 'VIA_TOKEN' and do_anti_csrf_check
 
     for key in handshake_info.get_jwt_signing_public_key_list():
-        try:
-            access_token_info = get_info_from_access_token(access_token,
-                                                           key['publicKey'],
-                                                           handshake_info.anti_csrf == 'VIA_TOKEN'
-                                                           and do_anti_csrf_check)
-
+        result = verify_access_token(parsed_access_token, key['publicKey'], do_access_token_anti_csrf_check)
+        if isinstance(result, AccessTokenInfo):
+            access_token_info = result
             found_a_sign_key_that_is_older_than_the_access_token = True
+            break
 
-        except Exception as e:
+        try:
+            payload = parsed_access_token.get_payload()
+        except Exception:
             payload = None
 
-            if e.__class__ != TryRefreshTokenError:
-                raise e
+        if not isinstance(payload, dict) or not isinstance(payload.get('timeCreated'), int) or \
+                not isinstance(payload.get('expiryTime'), int):
+            raise_try_refresh_token_exception(result)
 
-            try:
-                payload = get_payload_without_verifying(access_token)
-            except BaseException:
-                raise e
+        if payload['expiryTime'] < time.time():
+            raise_try_refresh_token_exception(result)
 
-            if payload is None:
-                raise e
-
-            if not isinstance(payload['timeCreated'], int) or not isinstance(payload['expiryTime'], int):
-                raise e
-
-            if payload['expiryTime'] < time.time():
-                raise e
-
-            if payload['timeCreated'] >= key['createdAt']:
-                found_a_sign_key_that_is_older_than_the_access_token = True
-                break
+        if payload['timeCreated'] >= key['createdAt']:
+            found_a_sign_key_that_is_older_than_the_access_token = True
+            break
 
     if not found_a_sign_key_that_is_older_than_the_access_token:
         raise_try_refresh_token_exception(
@@ -102,8 +98,7 @@ async def get_session(recipe_implementation: RecipeImplementation, access_token:
 
     if handshake_info.anti_csrf == 'VIA_TOKEN' and do_anti_csrf_check:
         if access_token_info is not None:
-            if anti_csrf_token is None or anti_csrf_token != access_token_info[
-                    'antiCsrfToken']:
+            if anti_csrf_token is None or anti_csrf_token != access_token_info.anti_csrf_token:
                 if anti_csrf_token is None:
                     raise_try_refresh_token_exception('Provided antiCsrfToken is undefined. If you do not '
                                                       'want anti-csrf check for this API, please set '
@@ -119,12 +114,12 @@ async def get_session(recipe_implementation: RecipeImplementation, access_token:
                                          'for this API')
 
     if access_token_info is not None and not handshake_info.access_token_blacklisting_enabled and \
-            access_token_info['parentRefreshTokenHash1'] is None:
+            access_token_info.parent_refresh_token_hash_1 is None:
         return {
             'session': {
-                'handle': access_token_info['sessionHandle'],
-                'userId': access_token_info['userId'],
-                'userDataInJWT': access_token_info['userData']
+                'handle': access_token_info.session_handle,
+                'userId': access_token_info.user_id,
+                'userDataInJWT': access_token_info.user_data
             }
         }
 
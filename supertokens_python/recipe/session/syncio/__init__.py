@@ -12,12 +12,17 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
-from typing import Union, List
+from __future__ import annotations
+
+from typing import Union, List, TYPE_CHECKING, Callable, Dict
 
 from supertokens_python.async_to_sync_wrapper import sync
-from supertokens_python.recipe.openid.interfaces import CreateJwtResult, GetOpenIdDiscoveryConfigurationResult, \
-    GetJWKSResult
 from supertokens_python.recipe.session.asyncio import Session
+from supertokens_python.batch import BatchResult, DEFAULT_BATCH_CONCURRENCY
+
+if TYPE_CHECKING:
+    from supertokens_python.recipe.openid.interfaces import CreateJwtResult, GetOpenIdDiscoveryConfigurationResult, \
+        GetJWKSResult
 
 
 def create_new_session(request, user_id: str, access_token_payload: Union[dict, None] = None,
@@ -48,6 +53,19 @@ def revoke_all_sessions_for_user(user_id: str) -> List[str]:
     return sync(async_revoke_all_sessions_for_user(user_id))
 
 
+def revoke_all_sessions_for_users(user_ids: List[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                                  on_progress: Union[Callable[[int, int], None], None] = None) -> BatchResult:
+    from supertokens_python.recipe.session.asyncio import \
+        revoke_all_sessions_for_users as async_revoke_all_sessions_for_users
+    return sync(async_revoke_all_sessions_for_users(user_ids, concurrency, on_progress))
+
+
+def get_all_session_handles_for_user(user_id: str) -> List[str]:
+    from supertokens_python.recipe.session.asyncio import \
+        get_all_session_handles_for_user as async_get_all_session_handles_for_user
+    return sync(async_get_all_session_handles_for_user(user_id))
+
+
 def revoke_multiple_sessions(session_handles: List[str]) -> List[str]:
     from supertokens_python.recipe.session.asyncio import revoke_multiple_sessions as async_revoke_multiple_sessions
     return sync(async_revoke_multiple_sessions(session_handles))
@@ -58,16 +76,39 @@ def get_session_information(session_handle: str) -> dict:
     return sync(async_get_session_information(session_handle))
 
 
+def get_sessions_information(session_handles: List[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                             cache_ttl_seconds: Union[float, None] = None) -> Dict[str, Union[dict, None]]:
+    from supertokens_python.recipe.session.asyncio import get_sessions_information as async_get_sessions_information
+    return sync(async_get_sessions_information(session_handles, concurrency, cache_ttl_seconds))
+
+
 def update_session_data(session_handle: str, new_session_data: dict) -> None:
     from supertokens_python.recipe.session.asyncio import update_session_data as async_update_session_data
     return sync(async_update_session_data(session_handle, new_session_data))
 
 
-async def update_access_token_payload(session_handle: str, new_access_token_payload: dict) -> None:
+def update_access_token_payload(session_handle: str, new_access_token_payload: dict) -> None:
     from supertokens_python.recipe.session.asyncio import update_access_token_payload as async_update_access_token_payload
     return sync(async_update_access_token_payload(session_handle, new_access_token_payload))
 
 
+def update_session_data_for_user(user_id: str, new_session_data: dict,
+                                 concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                                 on_progress: Union[Callable[[int, int], None], None] = None) -> BatchResult:
+    from supertokens_python.recipe.session.asyncio import \
+        update_session_data_for_user as async_update_session_data_for_user
+    return sync(async_update_session_data_for_user(user_id, new_session_data, concurrency, on_progress))
+
+
+def update_access_token_payload_for_user(user_id: str, new_access_token_payload: dict,
+                                         concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                                         on_progress: Union[Callable[[int, int], None], None] = None) -> BatchResult:
+    from supertokens_python.recipe.session.asyncio import \
+        update_access_token_payload_for_user as async_update_access_token_payload_for_user
+    return sync(async_update_access_token_payload_for_user(user_id, new_access_token_payload, concurrency,
+                                                           on_progress))
+
+
 async def create_jwt(payload: dict, validity_seconds: int = None) -> [CreateJwtResult, None]:
     from supertokens_python.recipe.session.asyncio import \
         create_jwt as async_create_jwt
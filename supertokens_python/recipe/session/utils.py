@@ -22,9 +22,8 @@ from supertokens_python.exceptions import raise_general_exception
 from supertokens_python.framework import BaseResponse
 from supertokens_python.normalised_url_path import NormalisedURLPath
 from supertokens_python.utils import is_an_ip_address, send_non_200_response
-from .constants import SESSION_REFRESH
+from .constants import SESSION_REFRESH, DEFAULT_MAX_ACCESS_TOKEN_LENGTH
 from .cookie_and_header import clear_cookies
-from supertokens_python.recipe.openid import InputOverrideConfig as OpenIdInputOverrideConfig
 from .with_jwt.constants import ACCESS_TOKEN_PAYLOAD_JWT_PROPERTY_NAME_KEY, JWT_RESERVED_KEY_USE_ERROR_MESSAGE
 
 if TYPE_CHECKING:
@@ -32,6 +31,7 @@ if TYPE_CHECKING:
     from supertokens_python.framework import BaseRequest
     from .recipe import SessionRecipe
     from supertokens_python.supertokens import AppInfo
+    from supertokens_python.recipe.openid import InputOverrideConfig as OpenIdInputOverrideConfig
 
 
 def normalise_session_scope(recipe: SessionRecipe, session_scope: str) -> str:
@@ -186,6 +186,22 @@ class JWTConfig:
         self.issuer = issuer
 
 
+class AccessTokenPreCheckConfig:
+    """
+    Cheap checks that run before an access token is verified, so that malformed, oversized
+    or expired tokens (e.g. junk cookies sent by bots) are rejected without an RSA verify.
+    """
+
+    def __init__(self, max_length: Union[int, None] = DEFAULT_MAX_ACCESS_TOKEN_LENGTH,
+                 check_characters: bool = True, check_header: bool = True, check_expiry: bool = True):
+        if max_length is not None and max_length <= 0:
+            raise Exception('max_length must be a positive number')
+        self.max_length = max_length
+        self.check_characters = check_characters
+        self.check_header = check_header
+        self.check_expiry = check_expiry
+
+
 class SessionConfig:
     def __init__(self,
                  refresh_token_path: NormalisedURLPath,
@@ -198,7 +214,8 @@ class SessionConfig:
                  override: OverrideConfig,
                  framework: str,
                  mode: str,
-                 jwt: JWTConfig
+                 jwt: JWTConfig,
+                 access_token_pre_check: AccessTokenPreCheckConfig
                  ):
         self.refresh_token_path = refresh_token_path
         self.cookie_domain = cookie_domain
@@ -211,6 +228,7 @@ class SessionConfig:
         self.framework = framework
         self.mode = mode
         self.jwt = jwt
+        self.access_token_pre_check = access_token_pre_check
 
 
 def validate_and_normalise_user_input(
@@ -222,7 +240,8 @@ def validate_and_normalise_user_input(
     anti_csrf: Union[Literal["VIA_TOKEN", "VIA_CUSTOM_HEADER", "NONE"], None] = None,
     error_handlers: Union[InputErrorHandlers, None] = None,
     override: Union[InputOverrideConfig, None] = None,
-    jwt: Union[JWTConfig, None] = None
+    jwt: Union[JWTConfig, None] = None,
+    access_token_pre_check: Union[AccessTokenPreCheckConfig, None] = None
 ):
     cookie_domain = normalise_session_scope(recipe, cookie_domain) if cookie_domain is not None else None
     top_level_api_domain = get_top_level_domain_for_same_site_resolution(
@@ -275,6 +294,9 @@ def validate_and_normalise_user_input(
     if jwt is None:
         jwt = JWTConfig(False)
 
+    if access_token_pre_check is None:
+        access_token_pre_check = AccessTokenPreCheckConfig()
+
     return SessionConfig(
         app_info.api_base_path.append(NormalisedURLPath(SESSION_REFRESH)),
         cookie_domain,
@@ -286,5 +308,6 @@ def validate_and_normalise_user_input(
         OverrideConfig(override.functions, override.apis),
         app_info.framework,
         app_info.mode,
-        jwt
+        jwt,
+        access_token_pre_check
     )
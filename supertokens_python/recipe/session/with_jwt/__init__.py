@@ -14,4 +14,10 @@
 
 from __future__ import annotations
 
-from .recipe_implementation import RecipeImplementationWithJWT
+
+def __getattr__(name):
+    # importing with_jwt.constants must not pull in PyJWT and the openid recipe
+    if name == 'RecipeImplementationWithJWT':
+        from .recipe_implementation import RecipeImplementationWithJWT
+        return RecipeImplementationWithJWT
+    raise AttributeError('module ' + __name__ + ' has no attribute ' + name)
@@ -20,7 +20,7 @@ from jwt import decode
 from supertokens_python.querier import Querier
 from supertokens_python.utils import get_timestamp_ms
 from .constants import ACCESS_TOKEN_PAYLOAD_JWT_PROPERTY_NAME_KEY
-from .session_class import get_session_with_jwt
+from .session_class import SessionWithJWT
 from supertokens_python.recipe.session.recipe_implementation import RecipeImplementation
 from .utills import add_jwt_to_access_token_payload
 from supertokens_python.recipe.session import Session
@@ -37,6 +37,8 @@ def get_jwt_expiry(access_token_expiry: int):
 
 
 class RecipeImplementationWithJWT(RecipeImplementation):
+    session_class = SessionWithJWT
+
     def __init__(self, querier: Querier, config: SessionConfig, openid_recipe_implementation: OpenIdRecipeInterface):
         super().__init__(querier, config)
         self.openid_recipe_implementation = openid_recipe_implementation
@@ -53,16 +55,8 @@ class RecipeImplementationWithJWT(RecipeImplementation):
             jwt_property_name=self.config.jwt.property_name_in_access_token_payload,
             openid_recipe_implementation=self.openid_recipe_implementation
         )
-        session = await RecipeImplementation.create_new_session(
+        return await RecipeImplementation.create_new_session(
             self, request, user_id, access_token_payload, session_data)
-        return get_session_with_jwt(session, self.openid_recipe_implementation)
-
-    async def get_session(self, request: any, anti_csrf_check: Union[bool, None] = None,
-                          session_required: bool = True) -> Union[Session, None]:
-        session_container = await RecipeImplementation.get_session(self, request, anti_csrf_check, session_required)
-        if session_container is None:
-            return None
-        return get_session_with_jwt(session_container, self.openid_recipe_implementation)
 
     async def refresh_session(self, request: any) -> Session:
         access_token_validity_in_seconds = ceil(await self.get_access_token_lifetime_ms() / 1000)
@@ -78,8 +72,9 @@ class RecipeImplementationWithJWT(RecipeImplementation):
             openid_recipe_implementation=self.openid_recipe_implementation
         )
 
-        await new_session.update_access_token_payload(access_token_payload)
-        return get_session_with_jwt(new_session, self.openid_recipe_implementation)
+        # the payload already has the new jwt, so skip the jwt handling of SessionWithJWT
+        await Session.update_access_token_payload(new_session, access_token_payload)
+        return new_session
 
     async def update_access_token_payload(self, session_handle: str, new_access_token_payload: dict) -> None:
         if new_access_token_payload is None:
@@ -29,16 +29,24 @@ if TYPE_CHECKING:
 from supertokens_python.recipe.session import Session
 
 
-def get_session_with_jwt(original_session: Session, openid_recipe_implementation: OpenIdRecipeInterface) -> Session:
-    original_update_access_token_payload = original_session.update_access_token_payload
-
-    async def update_access_token_payload(new_access_token_payload) -> None:
+class SessionWithJWT(Session):
+    """
+    Session of the session recipe with the JWT feature enabled: updating the access token
+    payload also re-issues the JWT in it.
+    """
+    __slots__ = ('__openid_recipe_implementation',)
+
+    def __init__(self, recipe_implementation, access_token, session_handle, user_id, access_token_payload):
+        super().__init__(recipe_implementation, access_token, session_handle, user_id, access_token_payload)
+        self.__openid_recipe_implementation: OpenIdRecipeInterface = recipe_implementation.openid_recipe_implementation
+
+    async def update_access_token_payload(self, new_access_token_payload) -> None:
         if new_access_token_payload is None:
             new_access_token_payload = {}
-        access_token_payload = original_session.get_access_token_payload()
+        access_token_payload = self.get_access_token_payload()
 
         if ACCESS_TOKEN_PAYLOAD_JWT_PROPERTY_NAME_KEY not in access_token_payload:
-            return await original_update_access_token_payload(new_access_token_payload)
+            return await super().update_access_token_payload(new_access_token_payload)
 
         jwt_property_name = access_token_payload[ACCESS_TOKEN_PAYLOAD_JWT_PROPERTY_NAME_KEY]
 
@@ -65,12 +73,9 @@ def get_session_with_jwt(original_session: Session, openid_recipe_implementation
         new_access_token_payload = await add_jwt_to_access_token_payload(
             access_token_payload=new_access_token_payload,
             jwt_expiry=jwt_expiry,
-            user_id=original_session.get_user_id(),
+            user_id=self.get_user_id(),
             jwt_property_name=jwt_property_name,
-            openid_recipe_implementation=openid_recipe_implementation
+            openid_recipe_implementation=self.__openid_recipe_implementation
         )
 
-        return await original_update_access_token_payload(new_access_token_payload)
-
-    original_session.update_access_token_payload = update_access_token_payload
-    return original_session
+        return await super().update_access_token_payload(new_access_token_payload)
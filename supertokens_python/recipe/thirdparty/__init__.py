@@ -25,7 +25,7 @@ from .providers import (
     Discord,
     GoogleWorkspaces
 )
-from ..emailverification.utils import InputEmailVerificationConfig
+from ..emailverification.utils import InputEmailVerificationConfig, IsEmailVerifiedCacheConfig
 
 
 def init(sign_in_and_up_feature: SignInAndUpFeature,
@@ -103,7 +103,8 @@ def validate_and_normalise_email_verification_config(
         get_email_for_user_id=recipe.get_email_for_user_id,
         create_and_send_custom_email=create_and_send_custom_email,
         get_email_verification_url=get_email_verification_url,
-        override=override.email_verification_feature
+        override=override.email_verification_feature,
+        cache=config.cache
     )
 
 
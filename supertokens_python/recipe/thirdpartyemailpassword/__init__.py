@@ -28,7 +28,7 @@ from supertokens_python.recipe.thirdparty import (
     GoogleWorkspaces
 )
 from ..emailpassword import InputResetPasswordUsingTokenFeature, InputSignUpFeature
-from ..emailverification.utils import InputEmailVerificationConfig
+from ..emailverification.utils import InputEmailVerificationConfig, IsEmailVerifiedCacheConfig
 
 Google = Google
 Github = Github
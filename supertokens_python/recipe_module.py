@@ -74,6 +74,8 @@ class RecipeModule(abc.ABC):
 
 
 class APIHandled:
+    __slots__ = ('path_without_api_base_path', 'method', 'request_id', 'disabled')
+
     def __init__(self, path_without_api_base_path: NormalisedURLPath,
                  method: Literal['post', 'get', 'delete', 'put', 'options', 'trace'], request_id: str, disabled: bool):
         self.path_without_api_base_path = path_without_api_base_path
@@ -0,0 +1,131 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from random import uniform
+from time import monotonic
+from typing import Dict, Iterable, Iterator, Union
+
+from .constants import USER_COUNT, USERS
+
+DEFAULT_TIMEOUT_SECONDS = 5
+DEFAULT_DEADLINE_SECONDS = 10
+DEFAULT_PATH_TIMEOUTS = {
+    '/recipe/session/verify': 2,
+    '/recipe/handshake': 2,
+    '/recipe/users': 30,
+    '/recipe/users/count': 30,
+    USERS: 30,
+    USER_COUNT: 30
+}
+# user listings get room for a retry of their longer timeout
+DEFAULT_PATH_DEADLINES = {
+    '/recipe/users': 60,
+    '/recipe/users/count': 60,
+    USERS: 60,
+    USER_COUNT: 60
+}
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY_SECONDS = 0.05
+DEFAULT_MAX_DELAY_SECONDS = 1
+DEFAULT_RETRY_ON_STATUS = (502, 503, 504)
+# POSTs to the core that only read, so sending them twice is harmless
+DEFAULT_SAFE_POST_PATHS = ('/recipe/session/verify',)
+
+_deadline: ContextVar[Union[float, None]] = ContextVar('supertokens_core_deadline', default=None)
+
+
+class TimeoutConfig:
+    """
+    `paths` maps a core path to the timeout (in seconds) of one attempt of a request to it,
+    on top of DEFAULT_PATH_TIMEOUTS; other paths use `default_seconds`. A request, with its
+    retries, its failovers to other hosts and the requests it makes itself (e.g. for the API
+    version), never takes longer than its deadline, nor than the budget of an enclosing
+    `core_deadline`. The deadline is `deadline_seconds`, or the one of its path in
+    `deadline_paths` (on top of DEFAULT_PATH_DEADLINES), and is never shorter than the
+    timeout of the path. With `deadline_seconds=None` requests have no deadline.
+    """
+
+    def __init__(self, default_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+                 paths: Union[Dict[str, float], None] = None,
+                 deadline_seconds: Union[float, None] = DEFAULT_DEADLINE_SECONDS,
+                 deadline_paths: Union[Dict[str, float], None] = None):
+        self.default_seconds = default_seconds
+        self.paths = {**DEFAULT_PATH_TIMEOUTS, **({} if paths is None else paths)}
+        self.deadline_seconds = deadline_seconds
+        self.deadline_paths = {**DEFAULT_PATH_DEADLINES, **({} if deadline_paths is None else deadline_paths)}
+
+    def get_timeout(self, path: str) -> float:
+        return self.paths.get(path, self.default_seconds)
+
+    def get_deadline(self, path: str) -> Union[float, None]:
+        if self.deadline_seconds is None:
+            return None
+        return max(self.deadline_paths.get(path, self.deadline_seconds), self.get_timeout(path))
+
+
+class RetryConfig:
+    """
+    Requests that are safe to send again (GETs, and POSTs to `safe_post_paths`) are retried
+    up to `max_attempts` times in all when they time out or the core answers with one of
+    `retry_on_status`. The n-th retry waits a random time (full jitter) of up to
+    `base_delay_seconds * 2 ** (n - 1)`, capped at `max_delay_seconds`, and is not made if
+    that would exceed the deadline. Connection errors move on to the next host straight away,
+    whatever the method.
+    """
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 base_delay_seconds: float = DEFAULT_BASE_DELAY_SECONDS,
+                 max_delay_seconds: float = DEFAULT_MAX_DELAY_SECONDS,
+                 retry_on_status: Iterable[int] = DEFAULT_RETRY_ON_STATUS,
+                 safe_post_paths: Iterable[str] = DEFAULT_SAFE_POST_PATHS):
+        if max_attempts < 1:
+            raise Exception('max_attempts must be at least 1')
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.retry_on_status = frozenset(retry_on_status)
+        self.safe_post_paths = frozenset(safe_post_paths)
+
+    def is_retryable(self, method: str, path: str) -> bool:
+        return method == 'GET' or (method == 'POST' and path in self.safe_post_paths)
+
+    def get_delay(self, retry: int) -> float:
+        return uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (retry - 1)))
+
+
+@contextmanager
+def core_deadline(seconds: Union[float, None]) -> Iterator[None]:
+    """
+    Requests to the core made in this block (including from tasks it starts) share a
+    budget of `seconds`. Nested blocks can only shorten the budget of the enclosing one.
+    """
+    deadline = _deadline.get()
+    if seconds is not None:
+        deadline = monotonic() + seconds if deadline is None else min(deadline, monotonic() + seconds)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def get_remaining_budget() -> Union[float, None]:
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - monotonic()
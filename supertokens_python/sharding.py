@@ -0,0 +1,94 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from hashlib import sha1
+from typing import TYPE_CHECKING, Dict, Iterator, List, Union
+
+if TYPE_CHECKING:
+    from .supertokens import SupertokensConfig
+
+_shard_key: ContextVar[Union[str, None]] = ContextVar('supertokens_core_shard_key', default=None)
+
+
+@contextmanager
+def core_shard_key(key: Union[str, None]) -> Iterator[None]:
+    """
+    Requests to the core made in this block (including from tasks it starts) go to the
+    shard that the router picks for `key`, e.g. the tenant of the request.
+    """
+    token = _shard_key.set(key)
+    try:
+        yield
+    finally:
+        _shard_key.reset(token)
+
+
+def get_shard_key() -> Union[str, None]:
+    return _shard_key.get()
+
+
+class ShardRouter(ABC):
+    @abstractmethod
+    def get_shard(self, key: str, shards: List[str]) -> str:
+        """
+        Returns the name, among `shards`, of the shard of `key`.
+        """
+        pass
+
+
+class HashShardRouter(ShardRouter):
+    """
+    Spreads the keys over the shards with rendezvous hashing: each key goes to the shard
+    with the highest hash of (shard, key), so adding a shard only moves the keys that the
+    new shard wins.
+    """
+
+    def get_shard(self, key: str, shards: List[str]) -> str:
+        return max(shards, key=lambda shard: sha1((shard + ':' + key).encode('utf-8')).digest())
+
+
+class MappedShardRouter(ShardRouter):
+    """
+    Sends the keys of `shard_of_key` to their shard and the other keys to `default_shard`.
+    """
+
+    def __init__(self, shard_of_key: Dict[str, str], default_shard: str):
+        self.shard_of_key = shard_of_key
+        self.default_shard = default_shard
+
+    def get_shard(self, key: str, shards: List[str]) -> str:
+        return self.shard_of_key.get(key, self.default_shard)
+
+
+class ShardingConfig:
+    """
+    Each shard is a separate core cluster, configured like the default one. Requests made
+    within `core_shard_key(key)` go to the shard `router` picks for the key; the others go to
+    the cluster of `SupertokensConfig.connection_uri`.
+
+    The key has to be known before the user exists, which is why it is set by the app (e.g.
+    from the tenant of the request) rather than derived from the user id the core creates at
+    sign up. As the session recipe keeps the signing keys of the access tokens of one cluster,
+    the shards must share their access token signing key.
+    """
+
+    def __init__(self, shards: Dict[str, SupertokensConfig], router: Union[ShardRouter, None] = None):
+        if len(shards) == 0:
+            raise Exception('sharding needs at least one shard')
+        self.shards = shards
+        self.router = HashShardRouter() if router is None else router
@@ -14,7 +14,7 @@
 
 from __future__ import annotations
 
-from typing import Union, List, TYPE_CHECKING, Callable
+from typing import Union, List, TYPE_CHECKING, Callable, AsyncIterator, Dict, Tuple
 
 try:
     from typing import Literal
@@ -30,11 +30,7 @@ from .constants import (
 )
 from .normalised_url_domain import NormalisedURLDomain
 from .normalised_url_path import NormalisedURLPath
-from .querier import Querier
-from .recipe.session.cookie_and_header import attach_access_token_to_cookie, clear_cookies, \
-    attach_refresh_token_to_cookie, attach_id_refresh_token_to_cookie_and_header, attach_anti_csrf_header, \
-    set_front_token_in_headers
-
+from .querier import Querier, CoreCluster
 from .types import UsersResponse, User, ThirdPartyInfo
 from .utils import (
     compare_version,
@@ -48,6 +44,7 @@ if TYPE_CHECKING:
     from supertokens_python.framework.request import BaseRequest
     from supertokens_python.framework.response import BaseResponse
     from supertokens_python.recipe.session import Session
+    from .sharding import ShardRouter
 from os import environ
 from httpx import AsyncClient
 from .exceptions import raise_general_exception
@@ -56,14 +53,47 @@ from .exceptions import (
     GeneralError,
     BadInputError
 )
-from supertokens_python.recipe.session import SessionRecipe
-import asyncio
+from .background_tasks import BackgroundTaskSupervisor, DEFAULT_SHUTDOWN_TIMEOUT_SECONDS
+from .delivery_queue import DeliveryQueue, DeliveryConfig
+from .pagination import iter_pages, DEFAULT_BUFFER_SIZE
+from .batch import BatchResult, run_batch, DEFAULT_BATCH_CONCURRENCY
+from .json_codec import JSON, JSONCodec, JSONCodecName
+from .rate_limit import ApiRateLimiter, RateLimitConfig
+from .bulkhead import BulkheadConfig
+from .retry_policy import TimeoutConfig, RetryConfig
+from .hedging import HedgingConfig
+from .host_discovery import HostProvider
+from .sharding import ShardingConfig
+from .instrumentation import Instrumentation
 
 
 class SupertokensConfig:
-    def __init__(self, connection_uri: str, api_key: Union[str, None] = None):
+    def __init__(self, connection_uri: str, api_key: Union[str, None] = None,
+                 bulkhead: Union[BulkheadConfig, None] = None,
+                 timeouts: Union[TimeoutConfig, None] = None,
+                 retry: Union[RetryConfig, None] = None,
+                 hedging: Union[HedgingConfig, None] = None,
+                 http2: bool = False,
+                 host_provider: Union[HostProvider, None] = None,
+                 sharding: Union[ShardingConfig, None] = None,
+                 instrumentation: Union[Instrumentation, None] = None):
         self.connection_uri = connection_uri
         self.api_key = api_key
+        self.bulkhead = bulkhead
+        self.timeouts = timeouts
+        self.retry = retry
+        self.hedging = hedging
+        self.http2 = http2
+        self.host_provider = host_provider
+        self.sharding = sharding
+        self.instrumentation = instrumentation
+
+
+def get_shards(config: SupertokensConfig) -> Tuple[Union[Dict[str, CoreCluster], None], Union[ShardRouter, None]]:
+    if config.sharding is None:
+        return None, None
+    shards = {name: CoreCluster.from_config(shard) for name, shard in config.sharding.shards.items()}
+    return shards, config.sharding.router
 
 
 class InputAppInfo:
@@ -74,6 +104,7 @@ class InputAppInfo:
                  api_gateway_path: str = '',
                  api_base_path: str = '/auth',
                  website_base_path: str = '/auth',
+                 get_client_ip: Union[Callable[[BaseRequest], Union[str, None]], None] = None
                  ):
         self.app_name = app_name
         self.api_gateway_path = api_gateway_path
@@ -81,13 +112,15 @@ class InputAppInfo:
         self.website_domain = website_domain
         self.api_base_path = api_base_path
         self.website_base_path = website_base_path
+        self.get_client_ip = get_client_ip
 
 
 class AppInfo:
     def __init__(self, app_name: str, api_domain: str, website_domain: str,
                  framework: Literal['fastapi', 'flask', 'django'], api_gateway_path: str = '',
                  api_base_path: str = '/auth', website_base_path: str = '/auth',
-                 mode: Union[Literal['asgi', 'wsgi'], None] = None):
+                 mode: Union[Literal['asgi', 'wsgi'], None] = None,
+                 get_client_ip: Union[Callable[[BaseRequest], Union[str, None]], None] = None):
         self.app_name = app_name
         self.api_gateway_path: NormalisedURLPath = NormalisedURLPath(api_gateway_path)
         self.api_domain: NormalisedURLDomain = NormalisedURLDomain(api_domain)
@@ -102,13 +135,29 @@ class AppInfo:
             mode = 'wsgi'
         self.framework = framework
         self.mode = mode
+        self.__get_client_ip = get_client_ip
+
+    def get_client_ip(self, request: BaseRequest) -> Union[str, None]:
+        """
+        The client IP used by the rate limits and the exists API throttling. It is the address
+        of the peer unless get_client_ip is set in the app info, e.g. to read X-Forwarded-For
+        when running behind a proxy.
+        """
+        if self.__get_client_ip is not None:
+            return self.__get_client_ip(request)
+        return request.get_client_ip()
 
 
 def manage_cookies_post_response(session: Session, response: BaseResponse):
+    from .recipe.session import SessionRecipe
+    from .recipe.session.cookie_and_header import attach_access_token_to_cookie, clear_cookies, \
+        attach_refresh_token_to_cookie, attach_id_refresh_token_to_cookie_and_header, attach_anti_csrf_header, \
+        set_front_token_in_headers, set_expose_headers
     recipe = SessionRecipe.get_instance()
     if session['remove_cookies']:
         clear_cookies(recipe, response)
     else:
+        expose_headers = []
         access_token = session['new_access_token_info']
         if access_token is not None:
             attach_access_token_to_cookie(
@@ -122,7 +171,8 @@ def manage_cookies_post_response(session: Session, response: BaseResponse):
                 response,
                 session['user_id'],
                 access_token['expiry'],
-                session['access_token_payload']
+                session['access_token_payload'],
+                expose_headers
             )
         refresh_token = session['new_refresh_token_info']
         if refresh_token is not None:
@@ -138,11 +188,13 @@ def manage_cookies_post_response(session: Session, response: BaseResponse):
                 recipe,
                 response,
                 id_refresh_token['token'],
-                id_refresh_token['expiry']
+                id_refresh_token['expiry'],
+                expose_headers
             )
         anti_csrf_token = session['new_anti_csrf_token']
         if anti_csrf_token is not None:
-            attach_anti_csrf_header(recipe, response, anti_csrf_token)
+            attach_anti_csrf_header(recipe, response, anti_csrf_token, expose_headers)
+        set_expose_headers(recipe, response, expose_headers)
 
 
 class Supertokens:
@@ -154,7 +206,10 @@ class Supertokens:
                  supertokens_config: SupertokensConfig,
                  recipe_list: List[Callable[[AppInfo], RecipeModule]],
                  mode: Union[Literal['asgi', 'wsgi'], None] = None,
-                 telemetry: Union[bool, None] = None
+                 telemetry: Union[bool, None] = None,
+                 delivery: Union[DeliveryConfig, None] = None,
+                 json_codec: Union[JSONCodec, JSONCodecName, None] = None,
+                 rate_limit: Union[RateLimitConfig, None] = None
                  ):
         self.app_info = AppInfo(
             app_info.app_name,
@@ -164,11 +219,19 @@ class Supertokens:
             app_info.api_gateway_path,
             app_info.api_base_path,
             app_info.website_base_path,
-            mode
+            mode,
+            app_info.get_client_ip
         )
-        hosts = list(map(lambda h: NormalisedURLDomain(h.strip()),
+        JSON.set_codec(json_codec)
+        hosts = list(map(lambda h: NormalisedURLDomain(h.strip(), allow_unix_socket=True),
                          filter(lambda x: x != '', supertokens_config.connection_uri.split(';'))))
-        Querier.init(hosts, supertokens_config.api_key)
+        Querier.init(hosts, supertokens_config.api_key, supertokens_config.bulkhead,
+                     supertokens_config.timeouts, supertokens_config.retry, supertokens_config.hedging,
+                     supertokens_config.http2, supertokens_config.host_provider, *get_shards(supertokens_config),
+                     supertokens_config.instrumentation, self.app_info.mode)
+        self.background_tasks = BackgroundTaskSupervisor.get_instance()
+        self.delivery_queue = None if delivery is None else DeliveryQueue.init(delivery)
+        self.rate_limiter = None if rate_limit is None else ApiRateLimiter(rate_limit, self.app_info.get_client_ip)
 
         if len(recipe_list) == 0:
             raise_general_exception(
@@ -176,15 +239,14 @@ class Supertokens:
 
         self.recipe_modules: List[RecipeModule] = list(map(lambda func: func(self.app_info), recipe_list))
 
+        if self.delivery_queue is not None:
+            self.delivery_queue.start()
+
         if telemetry is None:
             telemetry = ('SUPERTOKENS_ENV' not in environ) or (environ['SUPERTOKENS_ENV'] != 'testing')
 
         if telemetry:
-            if self.app_info.framework.lower() == 'flask' or self.app_info.framework.lower() == 'django':
-                loop = asyncio.get_event_loop()
-                loop.run_until_complete(self.send_telemetry())
-            else:
-                asyncio.create_task(self.send_telemetry())
+            self.background_tasks.schedule(self.send_telemetry, self.app_info.mode)
 
     async def send_telemetry(self):
         try:
@@ -215,9 +277,13 @@ class Supertokens:
              supertokens_config: SupertokensConfig,
              recipe_list: List[Callable[[AppInfo], RecipeModule]],
              mode: Union[Literal['asgi', 'wsgi'], None] = None,
-             telemetry: Union[bool, None] = None):
+             telemetry: Union[bool, None] = None,
+             delivery: Union[DeliveryConfig, None] = None,
+             json_codec: Union[JSONCodec, JSONCodecName, None] = None,
+             rate_limit: Union[RateLimitConfig, None] = None):
         if Supertokens.__instance is None:
-            Supertokens.__instance = Supertokens(app_info, framework, supertokens_config, recipe_list, mode, telemetry)
+            Supertokens.__instance = Supertokens(app_info, framework, supertokens_config, recipe_list, mode, telemetry,
+                                                 delivery, json_codec, rate_limit)
 
     @staticmethod
     def reset():
@@ -226,6 +292,9 @@ class Supertokens:
             raise_general_exception(
                 None, 'calling testing function in non testing env')
         Querier.reset()
+        BackgroundTaskSupervisor.reset()
+        DeliveryQueue.reset()
+        JSON.set_codec(None)
         Supertokens.__instance = None
 
     @staticmethod
@@ -236,6 +305,12 @@ class Supertokens:
             None,
             'Initialisation not done. Did you forget to call the SuperTokens.init function?')
 
+    async def shutdown(self, timeout: Union[float, None] = DEFAULT_SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        await self.background_tasks.shutdown(timeout)
+        if self.delivery_queue is not None:
+            await self.delivery_queue.shutdown(timeout)
+        await Querier.close_connections()
+
     def get_all_cors_headers(self) -> List[str]:
         headers_set = set()
         headers_set.add(RID_KEY_HEADER)
@@ -274,9 +349,37 @@ class Supertokens:
             raise_general_exception(
                 None, 'Please upgrade the SuperTokens core to >= 3.7.0')
 
+    async def delete_users(self, user_ids: List[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                           on_progress: Union[Callable[[int, int], None], None] = None) -> BatchResult:
+        return await run_batch(user_ids, self.delete_user, concurrency, on_progress)
+
     async def get_users(self, time_joined_order: Literal['ASC', 'DESC'],
                         limit: Union[int, None] = None, pagination_token: Union[str, None] = None,
                         include_recipe_ids: List[str] = None) -> UsersResponse:
+        response = await Supertokens.get_users_json(time_joined_order, limit, pagination_token, include_recipe_ids)
+        next_pagination_token = None
+        if 'nextPaginationToken' in response:
+            next_pagination_token = response['nextPaginationToken']
+        users_list = response['users']
+        users = []
+        for user in users_list:
+            recipe_id = user['recipeId']
+            user_obj = user['user']
+            third_party = None
+            if 'thirdParty' in user_obj:
+                third_party = ThirdPartyInfo(
+                    user_obj['thirdParty']['userId'],
+                    user_obj['thirdParty']['id']
+                )
+            users.append(User(recipe_id, user_obj['id'], user_obj['email'], user_obj['timeJoined'], third_party))
+
+        return UsersResponse(users, next_pagination_token)
+
+    @staticmethod
+    async def get_users_json(time_joined_order: Literal['ASC', 'DESC'],
+                             limit: Union[int, None] = None, pagination_token: Union[str, None] = None,
+                             include_recipe_ids: List[str] = None) -> dict:
+        # the raw page returned by the core, for callers (like the exporter) that do not need User objects
         querier = Querier.get_instance(None)
         params = {
             'timeJoinedOrder': time_joined_order
@@ -292,33 +395,23 @@ class Supertokens:
                 **params
             }
 
-        include_recipe_ids_str = None
         if include_recipe_ids is not None:
-            include_recipe_ids_str = ','.join(include_recipe_ids)
+            params = {
+                'includeRecipeIds': ','.join(include_recipe_ids),
+                **params
+            }
 
-        params = {
-            'paginationToken': include_recipe_ids_str,
-            **params
-        }
+        return await querier.send_get_request(NormalisedURLPath(USERS), params)
 
-        response = await querier.send_get_request(NormalisedURLPath(USERS), params)
-        next_pagination_token = None
-        if 'nextPaginationToken' in response:
-            next_pagination_token = response['nextPaginationToken']
-        users_list = response['users']
-        users = []
-        for user in users_list:
-            recipe_id = user['recipeId']
-            user_obj = user['user']
-            third_party = None
-            if 'thirdParty' in user_obj:
-                third_party = ThirdPartyInfo(
-                    user_obj['thirdParty']['userId'],
-                    user_obj['thirdParty']['id']
-                )
-            users.append(User(recipe_id, user_obj['id'], user_obj['email'], user_obj['timeJoined'], third_party))
+    async def iter_users(self, time_joined_order: Literal['ASC', 'DESC'] = 'ASC', page_size: Union[int, None] = None,
+                         include_recipe_ids: List[str] = None,
+                         buffer_size: int = DEFAULT_BUFFER_SIZE) -> AsyncIterator[User]:
+        async def get_page(pagination_token: Union[str, None]) -> UsersResponse:
+            return await self.get_users(time_joined_order, page_size, pagination_token, include_recipe_ids)
 
-        return UsersResponse(users, next_pagination_token)
+        async for page in iter_pages(get_page, None, buffer_size):
+            for user in page.users:
+                yield user
 
     async def middleware(self, request: BaseRequest, response: BaseResponse) -> Union[BaseResponse, None]:
         path = Supertokens.get_instance().app_info.api_gateway_path.append(
@@ -17,8 +17,10 @@ try:
     from typing import Literal
 except ImportError:
     from typing_extensions import Literal
-from typing import Union, List
-from supertokens_python.types import UsersResponse
+from typing import Union, List, Iterator, IO, Dict, Callable
+from supertokens_python.types import UsersResponse, User
+from supertokens_python.pagination import sync_iter_pages, DEFAULT_BUFFER_SIZE
+from supertokens_python.batch import BatchResult, DEFAULT_BATCH_CONCURRENCY
 
 
 def get_users_oldest_first(limit: Union[int, None] = None, pagination_token: Union[str, None] = None,
@@ -31,9 +33,47 @@ def get_users_newest_first(limit: Union[int, None] = None, pagination_token: Uni
     return sync(Supertokens.get_instance().get_users('DESC', limit, pagination_token, include_recipe_ids))
 
 
+def iter_users(time_joined_order: Literal['ASC', 'DESC'] = 'ASC', page_size: Union[int, None] = None,
+               include_recipe_ids: List[str] = None, buffer_size: int = DEFAULT_BUFFER_SIZE) -> Iterator[User]:
+    async def get_page(pagination_token: Union[str, None]) -> UsersResponse:
+        return await Supertokens.get_instance().get_users(time_joined_order, page_size, pagination_token,
+                                                          include_recipe_ids)
+
+    for page in sync_iter_pages(get_page, None, buffer_size):
+        for user in page.users:
+            yield user
+
+
+def export_users(output: Union[str, IO[str]], export_format: Literal['ndjson', 'csv'] = 'ndjson',
+                 time_joined_order: Literal['ASC', 'DESC'] = 'ASC', page_size: Union[int, None] = None,
+                 include_recipe_ids: List[str] = None, pagination_token: Union[str, None] = None,
+                 resume_file: Union[str, None] = None, compress: Union[bool, None] = None) -> int:
+    from supertokens_python.asyncio import export_users
+    return sync(export_users(output, export_format, time_joined_order, page_size, include_recipe_ids,
+                             pagination_token, resume_file, compress))
+
+
+def import_users(input_file: Union[str, IO[str]], input_format: Union[Literal['ndjson', 'csv'], None] = None,
+                 results: Union[str, IO[str], None] = None, checkpoint_file: Union[str, None] = None,
+                 concurrency: int = 10, requests_per_second: Union[float, None] = None,
+                 default_recipe_id: Union[str, None] = None) -> Dict[str, int]:
+    from supertokens_python.asyncio import import_users
+    return sync(import_users(input_file, input_format, results, checkpoint_file, concurrency, requests_per_second,
+                             default_recipe_id))
+
+
 def get_user_count(include_recipe_ids: List[str] = None) -> int:
     return sync(Supertokens.get_instance().get_user_count(include_recipe_ids))
 
 
 def delete_user(user_id: str) -> None:
     return sync(Supertokens.get_instance().delete_user(user_id))
+
+
+def delete_users(user_ids: List[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                 on_progress: Union[Callable[[int, int], None], None] = None) -> BatchResult:
+    return sync(Supertokens.get_instance().delete_users(user_ids, concurrency, on_progress))
+
+
+def shutdown() -> None:
+    return sync(Supertokens.get_instance().shutdown())
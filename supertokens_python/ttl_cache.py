@@ -0,0 +1,65 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Hashable, Union
+
+
+class TTLCache:
+    """
+    A small in-process LRU cache whose entries each expire after their own
+    time to live. It is safe to share between the event loop and the threads
+    used by the syncio functions.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.__entries: OrderedDict = OrderedDict()
+        self.__lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= monotonic():
+                del self.__entries[key]
+                return default
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Union[int, float]) -> None:
+        if ttl_seconds <= 0 or self.max_size <= 0:
+            self.delete(key)
+            return
+        with self.__lock:
+            self.__entries[key] = (value, monotonic() + ttl_seconds)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
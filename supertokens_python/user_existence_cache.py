@@ -0,0 +1,102 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Callable, Hashable, Union
+
+from supertokens_python.sharding import get_shard_key
+from supertokens_python.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    from supertokens_python.framework.request import BaseRequest
+
+DEFAULT_EXISTS_TTL_SECONDS = 60
+DEFAULT_NOT_EXISTS_TTL_SECONDS = 5
+DEFAULT_CACHE_MAX_SIZE = 10000
+DEFAULT_PROBE_WINDOW_SECONDS = 60
+
+
+def normalise_key(key: Hashable) -> Hashable:
+    # emails differing only in case or surrounding spaces are the same user for the core
+    if isinstance(key, tuple) and len(key) == 2 and key[0] == 'email' and isinstance(key[1], str):
+        return 'email', key[1].strip().lower()
+    return key
+
+
+class UserExistenceCacheConfig:
+    """
+    Caches, in this process, whether a user exists for an email or phone number, so that the
+    exists APIs probed by sign up forms do not query the core for every probe. Sign ups and user
+    updates made in the same process invalidate the entries, and users that do not exist are
+    cached for less time since they can sign up from another process. With sharding, the
+    entries are kept per shard key (see core_shard_key), since each shard has its own users.
+
+    If max_probes_per_ip is set, a client can call the exists APIs at most that many times per
+    probe_window_seconds and gets a 429 after that. The client IP comes from
+    AppInfo.get_client_ip.
+    """
+
+    def __init__(self, exists_ttl_seconds: int = DEFAULT_EXISTS_TTL_SECONDS,
+                 not_exists_ttl_seconds: int = DEFAULT_NOT_EXISTS_TTL_SECONDS,
+                 max_size: int = DEFAULT_CACHE_MAX_SIZE,
+                 max_probes_per_ip: Union[int, None] = None,
+                 probe_window_seconds: int = DEFAULT_PROBE_WINDOW_SECONDS):
+        self.exists_ttl_seconds = exists_ttl_seconds
+        self.not_exists_ttl_seconds = not_exists_ttl_seconds
+        self.max_size = max_size
+        self.max_probes_per_ip = max_probes_per_ip
+        self.probe_window_seconds = probe_window_seconds
+
+
+class UserExistenceCache:
+    def __init__(self, config: UserExistenceCacheConfig, get_client_ip: Callable[[BaseRequest], Union[str, None]]):
+        self.config = config
+        self.get_client_ip = get_client_ip
+        self.__exists = TTLCache(config.max_size)
+        self.__probes = None if config.max_probes_per_ip is None else TTLCache(config.max_size)
+        self.__probes_lock = Lock()
+
+    def get(self, key: Hashable) -> Union[bool, None]:
+        return self.__exists.get((get_shard_key(), normalise_key(key)))
+
+    def set(self, key: Hashable, exists: bool) -> None:
+        ttl = self.config.exists_ttl_seconds if exists else self.config.not_exists_ttl_seconds
+        self.__exists.set((get_shard_key(), normalise_key(key)), exists, ttl)
+
+    def clear(self) -> None:
+        self.__exists.clear()
+
+    def is_throttled(self, request: BaseRequest) -> bool:
+        """
+        Counts a probe from the client of the request, and returns whether the client has
+        gone over max_probes_per_ip in the current window.
+        """
+        if self.__probes is None:
+            return False
+        ip = self.get_client_ip(request)
+        if ip is None:
+            return False
+
+        # [count, end of the window]; the window is fixed from the first probe of the client.
+        # The syncio functions can probe from several threads, so the count is taken under a lock
+        with self.__probes_lock:
+            window = self.__probes.get(ip)
+            if window is None or window[1] <= monotonic():
+                self.__probes.set(ip, [1, monotonic() + self.config.probe_window_seconds],
+                                  self.config.probe_window_seconds)
+                return False
+            window[0] += 1
+            return window[0] > self.config.max_probes_per_ip
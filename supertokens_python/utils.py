@@ -14,34 +14,55 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from importlib import import_module
 from re import fullmatch
-from typing import Union, List, Callable, TYPE_CHECKING
-
-from jsonschema import validate
-from jsonschema.exceptions import ValidationError
+from typing import Union, List, Callable, Dict, Tuple, TYPE_CHECKING
 
 from supertokens_python.framework.request import BaseRequest
 from supertokens_python.framework.response import BaseResponse
 
 if TYPE_CHECKING:
-    pass
+    from supertokens_python.framework.types import Framework
 from .constants import RID_KEY_HEADER
 from .exceptions import raise_general_exception, raise_bad_input_exception
 from .constants import ERROR_MESSAGE_KEY
 from time import time
 from base64 import b64encode, b64decode
 
-from supertokens_python.framework.django.framework import DjangoFramework
-from supertokens_python.framework.fastapi.framework import FastapiFramework
-from supertokens_python.framework.flask.framework import FlaskFramework
-from supertokens_python.async_to_sync_wrapper import check_event_loop
-import asyncio
+from supertokens_python.background_tasks import BackgroundTaskSupervisor
+
+
+class LazyFrameworks(Mapping):
+    """
+    Maps a framework name to its adapter, importing the adapter module on first
+    access so that e.g. a FastAPI app never loads the Django / Flask adapters.
+    """
+
+    def __init__(self, modules: Dict[str, Tuple[str, str]]):
+        self.__modules = modules
+        self.__frameworks: Dict[str, Framework] = {}
+
+    def __getitem__(self, name: str) -> Framework:
+        framework = self.__frameworks.get(name)
+        if framework is None:
+            module_name, class_name = self.__modules[name]
+            framework = getattr(import_module(module_name), class_name)()
+            self.__frameworks[name] = framework
+        return framework
+
+    def __iter__(self):
+        return iter(self.__modules)
+
+    def __len__(self):
+        return len(self.__modules)
+
 
-FRAMEWORKS = {
-    'fastapi': FastapiFramework(),
-    'flask': FlaskFramework(),
-    'django': DjangoFramework(),
-}
+FRAMEWORKS = LazyFrameworks({
+    'fastapi': ('supertokens_python.framework.fastapi.framework', 'FastapiFramework'),
+    'flask': ('supertokens_python.framework.flask.framework', 'FlaskFramework'),
+    'django': ('supertokens_python.framework.django.framework', 'DjangoFramework'),
+})
 
 
 def validate_framework(config):
@@ -53,6 +74,8 @@ def validate_framework(config):
 
 def validate_the_structure_of_user_input(
         config, input_schema, config_root, recipe):
+    from jsonschema import validate
+    from jsonschema.exceptions import ValidationError
     try:
         validate(config, input_schema)
     except ValidationError as e:
@@ -155,7 +178,7 @@ def utf_base64encode(s: str) -> str:
 
 
 def utf_base64decode(s: str) -> str:
-    return b64decode(s.encode('utf-8')).decode('utf-8')
+    return b64decode(s).decode('utf-8')
 
 
 def get_filtered_list(func: Callable, given_list: List) -> List:
@@ -171,12 +194,7 @@ def find_first_occurrence_in_list(
 
 
 def execute_in_background(mode, func):
-    if mode == 'wsgi':
-        check_event_loop()
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(func())
-    else:
-        asyncio.create_task(func())
+    BackgroundTaskSupervisor.get_instance().schedule(func, mode)
 
 
 def frontend_has_interceptor(request: BaseRequest) -> bool:
@@ -1,5 +1,24 @@
+from pytest import fixture
+
+
 def pytest_configure():
     import os
     os.environ.setdefault('SUPERTOKENS_ENV', 'testing')
     os.environ.setdefault('SUPERTOKENS_PATH', '../supertokens-root')
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.Django.settings')
+
+
+@fixture
+def core(monkeypatch):
+    """
+    Replaces the connections to the core with a FakeCore for the test.
+    """
+    # imported here since tests.utils needs the environment set by pytest_configure
+    from supertokens_python.background_tasks import BackgroundTaskSupervisor
+    from supertokens_python.querier import Querier
+    from tests.utils import FakeCore
+    fake = FakeCore()
+    monkeypatch.setattr('supertokens_python.core_transport.AsyncClient', fake)
+    yield fake
+    Querier.reset()
+    BackgroundTaskSupervisor.reset()
@@ -0,0 +1,136 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import json
+from base64 import b64encode
+from types import SimpleNamespace
+
+from Crypto.Hash import SHA256
+from Crypto.PublicKey import RSA
+from Crypto.Signature.pkcs1_15 import PKCS115_SigScheme
+from pytest import raises, mark
+
+from supertokens_python.recipe.session import jwt
+from supertokens_python.recipe.session.access_token import get_info_from_access_token, pre_check_access_token, \
+    verify_access_token
+from supertokens_python.recipe.session.exceptions import TryRefreshTokenError
+from supertokens_python.recipe.session.jwt import ParsedJWT, get_payload, get_payload_without_verifying
+from supertokens_python.recipe.session.session_functions import get_session
+from supertokens_python.recipe.session.utils import AccessTokenPreCheckConfig
+from supertokens_python.utils import get_timestamp_ms
+
+key = RSA.generate(2048)
+public_key = ''.join(key.publickey().export_key().decode('utf-8').splitlines()[1:-1])
+
+
+def create_token(payload: dict, header: str = jwt._allowed_headers[0]) -> str:
+    signing_input = header + '.' + b64encode(json.dumps(payload).encode('utf-8')).decode('utf-8')
+    signature = PKCS115_SigScheme(key).sign(SHA256.new(signing_input.encode('utf-8')))
+    return signing_input + '.' + b64encode(signature).decode('utf-8')
+
+
+def access_token_payload() -> dict:
+    return {
+        'sessionHandle': 'handle', 'userId': 'user', 'refreshTokenHash1': 'hash', 'parentRefreshTokenHash1': None,
+        'userData': {'name': 'José'}, 'antiCsrfToken': None, 'expiryTime': get_timestamp_ms() + 60000,
+        'timeCreated': get_timestamp_ms()
+    }
+
+
+def test_that_a_token_is_split_into_slices_of_one_buffer():
+    token = create_token({'a': 1})
+    parsed = ParsedJWT(token)
+
+    assert bytes(parsed.signing_input) == token.rsplit('.', 1)[0].encode('ascii')
+    assert parsed.header.obj is parsed.payload.obj is parsed.signature.obj
+    assert parsed.get_payload() is parsed.get_payload()
+
+
+def test_that_tokens_are_verified_with_a_cached_key():
+    jwt._get_verifier.cache_clear()
+    token = create_token(access_token_payload())
+
+    assert get_payload(token, public_key)['userData'] == {'name': 'José'}
+    assert get_payload(ParsedJWT(token), public_key)['userId'] == 'user'
+    assert jwt._get_verifier.cache_info().misses == 1
+
+    info = get_info_from_access_token(ParsedJWT(token), public_key, False)
+    assert info.session_handle == 'handle'
+
+
+def test_that_invalid_tokens_are_rejected():
+    token = create_token(access_token_payload())
+    header, payload, signature = token.split('.')
+
+    with raises(Exception, match='invalid jwt'):
+        ParsedJWT(header + '.' + payload)
+    with raises(Exception, match='invalid jwt'):
+        ParsedJWT(token + '.extra')
+    with raises(Exception, match='invalid jwt'):
+        ParsedJWT('é.' + payload + '.' + signature)
+    with raises(Exception, match='jwt header mismatch'):
+        get_payload(create_token(access_token_payload(), 'eyJhbGciOiJub25lIn0='), public_key)
+    tampered = header + '.' + b64encode(b'{"userId":"admin"}').decode('utf-8') + '.' + signature
+    with raises(Exception, match='jwt verification failed'):
+        get_payload(tampered, public_key)
+    assert get_payload_without_verifying(tampered) == {'userId': 'admin'}
+    with raises(TryRefreshTokenError):
+        get_info_from_access_token(tampered, public_key, False)
+
+
+def test_that_malformed_oversized_and_expired_tokens_fail_the_pre_check():
+    config = AccessTokenPreCheckConfig()
+    token = create_token(access_token_payload())
+    expired = access_token_payload()
+    expired['expiryTime'] = get_timestamp_ms() - 1
+
+    assert isinstance(pre_check_access_token(token, config), ParsedJWT)
+    assert pre_check_access_token(token + 'A' * 8192, config) == 'Access token is too long'
+    assert pre_check_access_token('junk;cookie', config) == 'Access token contains invalid characters'
+    assert pre_check_access_token('a.b', config) == 'Access token contains invalid characters'
+    assert pre_check_access_token(create_token(access_token_payload(), 'eyJhbGciOiJub25lIn0='),
+                                  config) == 'jwt header mismatch'
+    assert isinstance(pre_check_access_token(jwt._allowed_headers[0] + '.AAAA.AAAA', config), str)
+    assert pre_check_access_token(create_token(expired), config) == 'Access token expired'
+
+    lenient = AccessTokenPreCheckConfig(max_length=None, check_characters=False, check_header=False,
+                                        check_expiry=False)
+    assert isinstance(pre_check_access_token(create_token(expired), lenient), ParsedJWT)
+    assert pre_check_access_token('a.b', lenient) == 'invalid jwt'
+
+
+def test_that_verification_failures_are_returned_instead_of_raised():
+    token = create_token(access_token_payload())
+    header, payload, signature = token.split('.')
+    tampered = header + '.' + b64encode(b'{"userId":"admin"}').decode('utf-8') + '.' + signature
+
+    assert verify_access_token(ParsedJWT(token), public_key, False).user_id == 'user'
+    assert verify_access_token(ParsedJWT(tampered), public_key, False) == 'jwt verification failed'
+    assert verify_access_token(ParsedJWT(create_token({'userId': 'user'})), public_key, False).startswith(
+        'Access token does not contain all the information')
+
+
+@mark.asyncio
+async def test_that_junk_tokens_are_rejected_before_the_handshake():
+    handshakes = []
+
+    async def get_handshake_info():
+        handshakes.append(True)
+
+    recipe_implementation = SimpleNamespace(config=SimpleNamespace(access_token_pre_check=AccessTokenPreCheckConfig()),
+                                            get_handshake_info=get_handshake_info)
+
+    for junk in ['', 'undefined', 'a' * 10000, create_token(access_token_payload(), 'eyJhbGciOiJub25lIn0=')]:
+        with raises(TryRefreshTokenError):
+            await get_session(recipe_implementation, junk, None, False, False)
+    assert handshakes == []
@@ -0,0 +1,126 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+from threading import Event, get_ident
+
+from pytest import mark
+
+from supertokens_python.background_tasks import BackgroundTaskSupervisor
+
+
+def setup_function(f):
+    BackgroundTaskSupervisor.reset()
+
+
+def teardown_function(f):
+    BackgroundTaskSupervisor.reset()
+
+
+def test_that_work_scheduled_without_a_loop_does_not_block_the_caller():
+    supervisor = BackgroundTaskSupervisor.get_instance()
+    started = Event()
+    release = Event()
+    ran_on = []
+
+    async def work():
+        ran_on.append(get_ident())
+        started.set()
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+
+    supervisor.schedule(work)
+    assert started.wait(5)
+    assert supervisor.pending_count() == 1
+    assert ran_on[0] != get_ident()
+
+    release.set()
+    supervisor.drain(5)
+    assert supervisor.pending_count() == 0
+
+
+@mark.asyncio
+async def test_that_tasks_on_the_running_loop_are_bounded_and_drained():
+    supervisor = BackgroundTaskSupervisor(max_concurrency=2)
+    running = 0
+    max_running = 0
+    finished = []
+
+    async def work():
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        finished.append(True)
+
+    for _ in range(6):
+        supervisor.schedule(work)
+    assert supervisor.pending_count() == 6
+
+    await supervisor.shutdown(5)
+
+    assert len(finished) == 6
+    assert max_running == 2
+    assert supervisor.pending_count() == 0
+
+
+@mark.asyncio
+async def test_that_exceptions_in_background_work_are_swallowed():
+    supervisor = BackgroundTaskSupervisor()
+
+    async def work():
+        raise Exception('core is down')
+
+    supervisor.schedule(work)
+    await supervisor.shutdown(5)
+    assert supervisor.pending_count() == 0
+
+
+@mark.asyncio
+async def test_that_shutdown_cancels_work_that_outlives_the_timeout():
+    supervisor = BackgroundTaskSupervisor()
+    cancelled = []
+
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    supervisor.schedule(work)
+    await asyncio.sleep(0)
+    await supervisor.shutdown(0.05)
+    await asyncio.sleep(0)
+
+    assert cancelled == [True]
+
+
+@mark.asyncio
+async def test_that_wsgi_work_runs_on_the_supervisor_thread_even_inside_a_loop():
+    supervisor = BackgroundTaskSupervisor.get_instance()
+    ran = Event()
+    ran_on = []
+
+    async def work():
+        ran_on.append(get_ident())
+        ran.set()
+
+    # e.g. from the sync() loop of a flask request, which stops once the request ends
+    supervisor.schedule(work, 'wsgi')
+
+    assert await asyncio.get_running_loop().run_in_executor(None, ran.wait, 5)
+    assert ran_on[0] != get_ident()
+    await supervisor.shutdown(5)
+    assert supervisor.pending_count() == 0
@@ -0,0 +1,76 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+
+from pytest import mark
+
+from supertokens_python.batch import run_batch
+from supertokens_python.recipe.session import asyncio as session_asyncio
+
+
+@mark.asyncio
+async def test_that_items_are_deduplicated_bounded_and_errors_are_collected():
+    in_flight = 0
+    max_in_flight = 0
+    progress = []
+
+    async def revoke(user_id):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if user_id == 'user3':
+            raise Exception('core is down')
+        return [user_id + '-handle']
+
+    user_ids = ['user' + str(i) for i in range(8)]
+    result = await run_batch(user_ids + user_ids, revoke, 3, lambda done, total: progress.append((done, total)))
+
+    assert max_in_flight == 3
+    assert not result.is_ok
+    assert sorted(result.results) == [u for u in user_ids if u != 'user3']
+    assert result.results['user0'] == ['user0-handle']
+    assert str(result.errors['user3']) == 'core is down'
+    assert progress == [(i, 8) for i in range(1, 9)]
+
+
+@mark.asyncio
+async def test_that_an_empty_batch_is_ok():
+    async def fail(_):
+        raise Exception()
+
+    result = await run_batch([], fail)
+
+    assert result.is_ok
+    assert result.results == {}
+
+
+@mark.asyncio
+async def test_that_the_access_token_payload_is_updated_for_every_session_of_the_user(monkeypatch):
+    updated = {}
+
+    async def get_all_session_handles_for_user(user_id):
+        return [user_id + '-1', user_id + '-2']
+
+    async def update_access_token_payload(session_handle, new_access_token_payload):
+        updated[session_handle] = new_access_token_payload
+
+    monkeypatch.setattr(session_asyncio, 'get_all_session_handles_for_user', get_all_session_handles_for_user)
+    monkeypatch.setattr(session_asyncio, 'update_access_token_payload', update_access_token_payload)
+
+    result = await session_asyncio.update_access_token_payload_for_user('user', {'role': 'admin'})
+
+    assert result.is_ok
+    assert updated == {'user-1': {'role': 'admin'}, 'user-2': {'role': 'admin'}}
@@ -0,0 +1,210 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+import io
+import json
+
+from pytest import mark, raises
+
+from supertokens_python import init, SupertokensConfig, InputAppInfo, Supertokens
+from supertokens_python import bulk_import
+from supertokens_python.recipe import emailpassword, passwordless
+from supertokens_python.recipe.emailpassword import EmailPasswordRecipe
+from supertokens_python.recipe.emailpassword.interfaces import SignUpOkResult, SignUpEmailAlreadyExistsErrorResult
+from supertokens_python.recipe.emailpassword.types import User
+from supertokens_python.recipe.emailverification import EmailVerificationRecipe
+from supertokens_python.recipe.passwordless import PasswordlessRecipe, ContactEmailOrPhoneConfig
+
+
+def reset():
+    Supertokens.reset()
+    EmailPasswordRecipe.reset()
+    EmailVerificationRecipe.reset()
+    PasswordlessRecipe.reset()
+
+
+async def send(*_):
+    pass
+
+
+def setup_function(f):
+    reset()
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name="SuperTokens Demo",
+            api_domain="api.supertokens.io",
+            website_domain="supertokens.io"
+        ),
+        framework='fastapi',
+        recipe_list=[
+            emailpassword.init(),
+            passwordless.init(contact_config=ContactEmailOrPhoneConfig(send, send), flow_type='MAGIC_LINK')
+        ]
+    )
+
+
+def teardown_function(f):
+    reset()
+
+
+def fake_sign_up(monkeypatch, fail_for: str = None, delay: float = 0):
+    calls = []
+    in_flight = 0
+    max_in_flight = 0
+    existing = {'existing@example.com'}
+
+    async def sign_up(email, password):
+        nonlocal in_flight, max_in_flight
+        calls.append(email)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(delay)
+        in_flight -= 1
+        if email == fail_for:
+            raise Exception('core is down')
+        if email in existing:
+            return SignUpEmailAlreadyExistsErrorResult()
+        existing.add(email)
+        return SignUpOkResult(User('id-' + email, email, 0))
+
+    recipe_implementation = EmailPasswordRecipe.get_instance().recipe_implementation
+    monkeypatch.setattr(recipe_implementation, 'sign_up', sign_up)
+    return calls, lambda: max_in_flight
+
+
+def ndjson(*records):
+    return io.StringIO(''.join(json.dumps(record) + '\n' for record in records))
+
+
+@mark.asyncio
+async def test_that_records_are_validated_deduplicated_and_logged(monkeypatch):
+    calls, _ = fake_sign_up(monkeypatch)
+    results = io.StringIO()
+
+    counts = await bulk_import.import_users(ndjson(
+        {'recipeId': 'emailpassword', 'email': ' a@example.com ', 'password': 'password1'},
+        {'recipeId': 'emailpassword', 'email': 'a@example.com', 'password': 'password2'},
+        {'recipeId': 'emailpassword', 'email': 'not an email', 'password': 'password1'},
+        {'recipeId': 'emailpassword', 'email': 'b@example.com', 'password': 'short'},
+        {'recipeId': 'emailpassword', 'email': 'existing@example.com', 'password': 'password1'},
+        {'recipeId': 'thirdparty', 'thirdPartyId': 'google', 'thirdPartyUserId': 'g1', 'email': 'c@example.com'},
+        {'recipeId': 'passwordless', 'email': 'd@example.com', 'phoneNumber': '+14155552671'},
+    ), results=results)
+
+    assert calls == ['a@example.com', 'existing@example.com']
+    assert counts == {'OK': 1, 'ALREADY_EXISTS': 1, 'DUPLICATE': 1, 'INVALID': 4, 'ERROR': 0}
+    logged = sorted((json.loads(line) for line in results.getvalue().splitlines()), key=lambda r: r['index'])
+    assert [r['status'] for r in logged] == ['OK', 'DUPLICATE', 'INVALID', 'INVALID', 'ALREADY_EXISTS', 'INVALID',
+                                             'INVALID']
+    assert logged[0] == {'index': 0, 'status': 'OK', 'recipeId': 'emailpassword', 'email': 'a@example.com',
+                         'userId': 'id-a@example.com'}
+    assert logged[2]['error'] == 'Email is not valid'
+    assert 'thirdparty' in logged[5]['error']
+    assert 'password1' not in results.getvalue()
+
+
+@mark.asyncio
+async def test_that_core_calls_are_bounded_by_the_concurrency(monkeypatch):
+    calls, max_in_flight = fake_sign_up(monkeypatch, delay=0.01)
+    records = io.StringIO('email,password\n' + ''.join('user{}@example.com,password1\n'.format(i)
+                                                       for i in range(20)))
+
+    counts = await bulk_import.import_users(records, 'csv', concurrency=3, default_recipe_id='emailpassword')
+
+    assert counts['OK'] == 20
+    assert len(calls) == 20
+    assert max_in_flight() == 3
+
+
+@mark.asyncio
+async def test_that_a_crashed_import_resumes_from_the_checkpoint(monkeypatch, tmp_path):
+    input_file = str(tmp_path / 'users.ndjson')
+    results = str(tmp_path / 'results.ndjson')
+    checkpoint_file = str(tmp_path / 'import.checkpoint')
+    with open(input_file, 'w') as f:
+        f.writelines(json.dumps({'recipeId': 'emailpassword', 'email': 'user{}@example.com'.format(i),
+                                 'password': 'password1'}) + '\n' for i in range(10))
+
+    fake_sign_up(monkeypatch, fail_for='user6@example.com')
+
+    async def fail(*_):
+        raise KeyboardInterrupt()
+
+    original = bulk_import.RateLimiter.acquire
+    acquired = 0
+
+    async def acquire(self):
+        nonlocal acquired
+        acquired += 1
+        if acquired > 7:
+            await fail()
+        await original(self)
+
+    monkeypatch.setattr(bulk_import.RateLimiter, 'acquire', acquire)
+    with raises(KeyboardInterrupt):
+        await bulk_import.import_users(input_file, results=results, checkpoint_file=checkpoint_file,
+                                       concurrency=1, checkpoint_interval=2)
+    with open(checkpoint_file) as f:
+        assert f.read() == '7'
+
+    monkeypatch.setattr(bulk_import.RateLimiter, 'acquire', original)
+    calls, _ = fake_sign_up(monkeypatch)
+    counts = await bulk_import.import_users(input_file, results=results, checkpoint_file=checkpoint_file)
+
+    assert calls == ['user7@example.com', 'user8@example.com', 'user9@example.com']
+    assert counts['OK'] == 3
+    with open(results) as f:
+        logged = [json.loads(line) for line in f]
+    assert [r['index'] for r in logged] == list(range(10))
+    assert logged[6]['status'] == 'ERROR'
+    assert logged[6]['error'] == 'core is down'
+    assert not (tmp_path / 'import.checkpoint').exists()
+
+
+@mark.asyncio
+async def test_that_passwordless_phone_numbers_are_normalised_before_deduplication(monkeypatch):
+    recipe_implementation = PasswordlessRecipe.get_instance().recipe_implementation
+    created = []
+
+    class Code:
+        pre_auth_session_id = 'pre-auth'
+        link_code = 'link'
+
+    class Consumed:
+        is_ok = True
+        created_new_user = True
+
+        def __init__(self, user_id):
+            self.user = User(user_id, None, 0)
+
+    async def create_code(email=None, phone_number=None, user_input_code=None):
+        created.append(email or phone_number)
+        return Code()
+
+    async def consume_code(pre_auth_session_id, user_input_code=None, device_id=None, link_code=None):
+        return Consumed('user' + str(len(created)))
+
+    monkeypatch.setattr(recipe_implementation, 'create_code', create_code)
+    monkeypatch.setattr(recipe_implementation, 'consume_code', consume_code)
+
+    counts = await bulk_import.import_users(ndjson(
+        {'phoneNumber': '+1 415 555 2671'},
+        {'phoneNumber': '+14155552671'},
+        {'email': 'e@example.com'},
+        {'phoneNumber': '12'},
+    ), default_recipe_id='passwordless')
+
+    assert created == ['+14155552671', 'e@example.com']
+    assert counts == {'OK': 2, 'ALREADY_EXISTS': 0, 'DUPLICATE': 1, 'INVALID': 1, 'ERROR': 0}
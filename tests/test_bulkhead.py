@@ -0,0 +1,116 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+
+from pytest import mark, raises
+
+from supertokens_python.bulkhead import Bulkhead, BulkheadConfig, PRIORITY_CRITICAL, PRIORITY_DEFAULT, \
+    PRIORITY_BULK
+from supertokens_python.exceptions import CoreOverloadedError
+
+
+def test_that_paths_get_their_priority():
+    bulkhead = Bulkhead(BulkheadConfig(priorities={'/recipe/user': PRIORITY_CRITICAL}))
+
+    assert bulkhead.get_priority('/recipe/session/verify') == PRIORITY_CRITICAL
+    assert bulkhead.get_priority('/recipe/user') == PRIORITY_CRITICAL
+    assert bulkhead.get_priority('/users') == PRIORITY_BULK
+    assert bulkhead.get_priority('/recipe/signin') == PRIORITY_DEFAULT
+
+
+@mark.asyncio
+async def test_that_requests_fail_fast_when_the_queue_is_full():
+    bulkhead = Bulkhead(BulkheadConfig(initial_limit=2, min_limit=1, max_queue_size=1, adaptive=False))
+    await bulkhead.acquire()
+    await bulkhead.acquire()
+    queued = asyncio.ensure_future(bulkhead.acquire())
+    await asyncio.sleep(0)
+    assert bulkhead.queued_count() == 1
+
+    with raises(CoreOverloadedError):
+        await bulkhead.acquire()
+
+    bulkhead.release()
+    await queued
+    assert bulkhead.in_flight == 2
+    assert bulkhead.queued_count() == 0
+
+
+@mark.asyncio
+async def test_that_queued_requests_are_admitted_by_priority():
+    bulkhead = Bulkhead(BulkheadConfig(initial_limit=1, min_limit=1, adaptive=False))
+    await bulkhead.acquire()
+    admitted = []
+
+    async def request(priority):
+        await bulkhead.acquire(priority)
+        admitted.append(priority)
+        await asyncio.sleep(0)
+        bulkhead.release()
+
+    requests = [asyncio.ensure_future(request(p)) for p in [PRIORITY_BULK, PRIORITY_DEFAULT, PRIORITY_CRITICAL]]
+    await asyncio.sleep(0)
+    bulkhead.release()
+    await asyncio.gather(*requests)
+
+    assert admitted == [PRIORITY_CRITICAL, PRIORITY_DEFAULT, PRIORITY_BULK]
+    assert bulkhead.in_flight == 0
+
+
+@mark.asyncio
+async def test_that_a_full_queue_sheds_lower_priority_requests():
+    bulkhead = Bulkhead(BulkheadConfig(initial_limit=1, min_limit=1, max_queue_size=1, adaptive=False))
+    await bulkhead.acquire()
+    bulk = asyncio.ensure_future(bulkhead.acquire(PRIORITY_BULK))
+    await asyncio.sleep(0)
+
+    critical = asyncio.ensure_future(bulkhead.acquire(PRIORITY_CRITICAL))
+    with raises(CoreOverloadedError):
+        await bulk
+
+    bulkhead.release()
+    await critical
+    assert bulkhead.in_flight == 1
+
+
+@mark.asyncio
+async def test_that_waiting_times_out():
+    bulkhead = Bulkhead(BulkheadConfig(initial_limit=1, min_limit=1, queue_timeout_seconds=0.01, adaptive=False))
+    await bulkhead.acquire()
+
+    with raises(CoreOverloadedError):
+        await bulkhead.acquire()
+    assert bulkhead.queued_count() == 0
+
+    bulkhead.release()
+    assert bulkhead.in_flight == 0
+
+
+def test_that_the_limit_adapts_to_the_latency_of_the_core():
+    bulkhead = Bulkhead(BulkheadConfig(initial_limit=10, min_limit=2, max_limit=11, latency_threshold_seconds=1,
+                                       backoff_ratio=0.5))
+
+    bulkhead.in_flight = 1
+    bulkhead.release(2)
+    assert bulkhead.limit == 5
+
+    for _ in range(100):
+        bulkhead.in_flight = 1
+        bulkhead.release(0.1)
+    assert bulkhead.limit == 11
+
+    for _ in range(10):
+        bulkhead.in_flight = 1
+        bulkhead.release(2)
+    assert bulkhead.limit == 2
@@ -0,0 +1,95 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from fastapi import Response
+
+from supertokens_python import init, SupertokensConfig, InputAppInfo, Supertokens
+from supertokens_python.framework.fastapi.fastapi_response import FastApiResponse
+from supertokens_python.recipe import session
+from supertokens_python.recipe.session import SessionRecipe
+from supertokens_python.recipe.session.cookie_and_header import clear_cookies
+from supertokens_python.supertokens import manage_cookies_post_response
+from supertokens_python.utils import get_timestamp_ms
+
+
+def setup_function(f):
+    Supertokens.reset()
+    SessionRecipe.reset()
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name="SuperTokens Demo",
+            api_domain="https://api.supertokens.io",
+            website_domain="supertokens.io",
+            api_base_path="/auth"
+        ),
+        framework='fastapi',
+        recipe_list=[session.init(cookie_domain='.supertokens.io')]
+    )
+
+
+def teardown_function(f):
+    Supertokens.reset()
+    SessionRecipe.reset()
+
+
+class SessionStub(dict):
+    def __init__(self, **kwargs):
+        super().__init__(remove_cookies=False, new_access_token_info=None, new_refresh_token_info=None,
+                         new_id_refresh_token_info=None, new_anti_csrf_token=None, user_id='user',
+                         access_token_payload={})
+        self.update(kwargs)
+
+
+def set_cookie_headers(response: FastApiResponse):
+    return [value.decode('latin-1') for key, value in response.response.raw_headers if key == b'set-cookie']
+
+
+def test_that_cookie_attributes_are_built_once_from_the_config():
+    templates = SessionRecipe.get_instance().cookie_templates
+
+    assert templates.access_token_path == {'domain': 'supertokens.io', 'secure': True, 'httponly': True,
+                                           'samesite': 'lax', 'path': '/'}
+    assert templates.refresh_token_path['path'] == '/auth/session/refresh'
+    assert [key for key, _ in templates.clear_cookies] == ['sAccessToken', 'sIdRefreshToken', 'sRefreshToken']
+
+
+def test_that_exposed_headers_are_written_once_per_response():
+    expiry = get_timestamp_ms() + 60000
+    response = FastApiResponse(Response())
+    response.set_header('Access-Control-Expose-Headers', 'x-custom')
+
+    manage_cookies_post_response(SessionStub(
+        new_access_token_info={'token': 'a+b=', 'expiry': expiry},
+        new_refresh_token_info={'token': 'refresh', 'expiry': expiry},
+        new_id_refresh_token_info={'token': 'id', 'expiry': expiry},
+        new_anti_csrf_token='csrf'
+    ), response)
+
+    assert response.get_header('Access-Control-Expose-Headers') == 'x-custom,front-token,id-refresh-token,anti-csrf'
+    cookies = set_cookie_headers(response)
+    assert len(cookies) == 3
+    assert cookies[0].startswith('sAccessToken=a%2Bb%3D;')
+    assert 'Path=/auth/session/refresh' in cookies[1]
+
+
+def test_that_clearing_cookies_expires_all_three():
+    response = FastApiResponse(Response())
+
+    clear_cookies(SessionRecipe.get_instance(), response)
+
+    cookies = set_cookie_headers(response)
+    assert [cookie.split('=', 1)[0] for cookie in cookies] == ['sAccessToken', 'sIdRefreshToken', 'sRefreshToken']
+    assert all('Domain=supertokens.io' in cookie and 'Secure' in cookie for cookie in cookies)
+    assert response.get_header('id-refresh-token') == 'remove'
+    assert response.get_header('Access-Control-Expose-Headers') == 'id-refresh-token'
@@ -0,0 +1,114 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+import json
+from threading import Thread
+
+from pytest import fixture, mark, raises
+
+from supertokens_python.constants import SUPPORTED_CDI_VERSIONS
+from supertokens_python.core_transport import CoreTransports
+from supertokens_python.exceptions import GeneralError
+from supertokens_python.normalised_url_domain import NormalisedURLDomain
+from supertokens_python.normalised_url_path import NormalisedURLPath
+from supertokens_python.querier import Querier
+
+
+@fixture
+def querier():
+    yield
+    Querier.reset()
+
+
+def test_that_unix_sockets_are_only_accepted_as_core_hosts():
+    assert NormalisedURLDomain('unix:///var/run/SuperTokens.sock',
+                               allow_unix_socket=True).get_as_string_dangerous() == 'unix:///var/run/SuperTokens.sock'
+    assert NormalisedURLDomain('http://localhost:3567/', allow_unix_socket=True).get_as_string_dangerous() == \
+        'http://localhost:3567'
+
+    with raises(GeneralError):
+        NormalisedURLDomain('unix://core.sock', allow_unix_socket=True)
+    assert not NormalisedURLDomain('unix:///var/run/core.sock').get_as_string_dangerous().startswith('unix://')
+
+
+@mark.asyncio
+async def test_that_clients_are_pooled_per_host():
+    transports = CoreTransports()
+
+    client = transports.get_client('http://localhost:3567')
+    assert transports.get_client('http://localhost:3567') is client
+    assert transports.get_client('unix:///tmp/core.sock') is not client
+    assert transports.get_url('unix:///tmp/core.sock', '/recipe/user') == 'http://localhost/recipe/user'
+    assert transports.get_url('http://localhost:3567', '/recipe/user') == 'http://localhost:3567/recipe/user'
+
+    await transports.close()
+    assert transports.get_client('http://localhost:3567') is not client
+    await transports.close()
+
+
+@mark.asyncio
+async def test_that_the_clients_of_finished_loops_are_closed(core):
+    transports = CoreTransports()
+
+    def wsgi_request():
+        # like sync(), which leaves the loop of the thread open
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        asyncio.get_event_loop().run_until_complete(get_client())
+
+    async def get_client():
+        transports.get_client('http://localhost:3567')
+
+    for target in [wsgi_request, lambda: asyncio.run(get_client())] * 5:
+        thread = Thread(target=target)
+        thread.start()
+        thread.join()
+        assert transports.loop_count() == 1
+
+    await get_client()
+    assert transports.loop_count() == 1
+    await asyncio.sleep(0.1)
+    assert core.closed == 10
+    await transports.close()
+
+
+@mark.asyncio
+async def test_that_the_core_can_be_reached_over_a_unix_socket(tmp_path, querier):
+    paths = []
+
+    async def handle(reader, writer):
+        while True:
+            request = await reader.readuntil(b'\r\n\r\n')
+            paths.append(request.split(b' ')[1].decode())
+            if paths[-1] == '/apiversion':
+                body = json.dumps({'versions': SUPPORTED_CDI_VERSIONS}).encode()
+            else:
+                body = json.dumps({'status': 'OK'}).encode()
+            writer.write(b'HTTP/1.1 200 OK\r\ncontent-type: application/json\r\ncontent-length: ' +
+                         str(len(body)).encode() + b'\r\n\r\n' + body)
+            await writer.drain()
+
+    socket = str(tmp_path / 'core.sock')
+    server = await asyncio.start_unix_server(handle, path=socket)
+    try:
+        Querier.reset()
+        Querier.init([NormalisedURLDomain('unix://' + socket, allow_unix_socket=True)])
+        querier = Querier.get_instance()
+
+        assert await querier.send_get_request(NormalisedURLPath('/recipe/user'), {}) == {'status': 'OK'}
+        assert await querier.send_get_request(NormalisedURLPath('/recipe/user'), {}) == {'status': 'OK'}
+        assert paths == ['/apiversion', '/recipe/user', '/recipe/user']
+        await Querier.close_connections()
+    finally:
+        server.close()
+        await server.wait_closed()
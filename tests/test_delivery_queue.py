@@ -0,0 +1,188 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+from threading import Event, Thread
+
+from pytest import mark
+
+from supertokens_python.delivery_queue import DeliveryQueue, DeliveryConfig, SQLiteDeliverySpool, deliver
+
+
+def setup_function(f):
+    DeliveryQueue.reset()
+
+
+def teardown_function(f):
+    DeliveryQueue.reset()
+
+
+@mark.asyncio
+async def test_that_deliveries_are_sent_inline_without_a_queue():
+    sent = []
+
+    async def send(payload):
+        sent.append(payload)
+
+    await deliver('emailpassword.password_reset_email', {'email': 'test@example.com'}, send)
+    assert sent == [{'email': 'test@example.com'}]
+
+
+@mark.asyncio
+async def test_that_queued_deliveries_are_retried_with_back_off():
+    queue = DeliveryQueue.init(DeliveryConfig(max_retries=2, initial_backoff_seconds=0.01))
+    attempts = []
+    sent = Event()
+
+    async def send(payload):
+        attempts.append(payload)
+        if len(attempts) < 3:
+            raise Exception('provider is down')
+        sent.set()
+
+    queue.register('emailpassword.password_reset_email', send)
+    queue.start()
+    await deliver('emailpassword.password_reset_email', {'email': 'test@example.com'}, send)
+
+    assert await asyncio.get_running_loop().run_in_executor(None, sent.wait, 5)
+    assert len(attempts) == 3
+    assert queue.drain(5)
+
+
+@mark.asyncio
+async def test_that_deliveries_that_exhaust_their_retries_are_reported():
+    failed = []
+    reported = Event()
+
+    async def send(_):
+        raise Exception('provider is down')
+
+    async def on_failure(kind, payload, error):
+        failed.append((kind, payload, str(error)))
+        reported.set()
+
+    queue = DeliveryQueue.init(DeliveryConfig(max_retries=1, initial_backoff_seconds=0.01, on_failure=on_failure))
+    queue.register('passwordless.email', send)
+    assert queue.enqueue('passwordless.email', {'email': 'test@example.com'})
+
+    assert await asyncio.get_running_loop().run_in_executor(None, reported.wait, 5)
+    assert failed == [('passwordless.email', {'email': 'test@example.com'}, 'provider is down')]
+    assert queue.drain(5)
+
+
+def test_that_concurrent_first_deliveries_are_all_queued():
+    sent = []
+
+    async def send(payload):
+        sent.append(payload)
+
+    queue = DeliveryQueue.init(DeliveryConfig())
+    queue.register('passwordless.email', send)
+    threads = [Thread(target=queue.enqueue, args=('passwordless.email', {'i': i})) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert queue.drain(5)
+    assert sorted(payload['i'] for payload in sent) == list(range(20))
+
+
+@mark.asyncio
+async def test_that_a_full_queue_sends_inline():
+    queue = DeliveryQueue.init(DeliveryConfig(max_queue_size=0))
+    sent = []
+
+    async def send(payload):
+        sent.append(payload)
+
+    queue.register('passwordless.email', send)
+    await deliver('passwordless.email', {'email': 'test@example.com'}, send)
+    assert sent == [{'email': 'test@example.com'}]
+
+
+def test_that_deliveries_of_the_same_kind_are_batched():
+    batches = []
+    release = Event()
+
+    async def send(_):
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+
+    async def send_batch(payloads):
+        batches.append(payloads)
+
+    queue = DeliveryQueue.init(DeliveryConfig(workers=1, batch_size=10,
+                                              send_batch={'passwordless.text_message': send_batch}))
+    queue.register('passwordless.email', send)
+    queue.register('passwordless.text_message', send)
+    queue.start()
+    assert queue.enqueue('passwordless.email', {})
+    for i in range(5):
+        assert queue.enqueue('passwordless.text_message', {'phoneNumber': str(i)})
+    release.set()
+
+    assert queue.drain(5)
+    assert batches == [[{'phoneNumber': str(i)} for i in range(5)]]
+
+
+def test_that_a_batch_does_not_reorder_other_deliveries():
+    sent = []
+    release = Event()
+
+    async def block(_):
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+
+    async def send(payload):
+        sent.append(payload['n'])
+
+    async def send_batch(payloads):
+        sent.append([payload['n'] for payload in payloads])
+
+    queue = DeliveryQueue.init(DeliveryConfig(workers=1, send_batch={'passwordless.text_message': send_batch}))
+    queue.register('emailverification.verification_email', block)
+    queue.register('passwordless.email', send)
+    queue.register('passwordless.text_message', send)
+    assert queue.enqueue('emailverification.verification_email', {})
+    for n, kind in enumerate(['passwordless.text_message', 'passwordless.email', 'passwordless.text_message']):
+        assert queue.enqueue(kind, {'n': n})
+    release.set()
+
+    assert queue.drain(5)
+    assert sent == [[0], 1, [2]]
+
+
+def test_that_spooled_deliveries_survive_a_restart(tmp_path):
+    path = str(tmp_path / 'delivery.sqlite')
+    sent = []
+
+    async def failing_send(_):
+        raise Exception('provider is down')
+
+    async def send(payload):
+        sent.append(payload)
+
+    queue = DeliveryQueue.init(DeliveryConfig(workers=1, initial_backoff_seconds=60,
+                                              spool=SQLiteDeliverySpool(path)))
+    queue.register('emailverification.verification_email', failing_send)
+    assert queue.enqueue('emailverification.verification_email', {'email': 'test@example.com'})
+    assert not queue.drain(0.1)
+    DeliveryQueue.reset()
+
+    queue = DeliveryQueue.init(DeliveryConfig(spool=SQLiteDeliverySpool(path)))
+    queue.register('emailverification.verification_email', send)
+    queue.start()
+    assert queue.drain(5)
+    assert sent == [{'email': 'test@example.com'}]
+    assert SQLiteDeliverySpool(path).get_pending() == []
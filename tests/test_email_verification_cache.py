@@ -0,0 +1,139 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from time import sleep
+
+from pytest import mark
+
+from supertokens_python.recipe.emailverification.recipe_implementation import RecipeImplementation
+from supertokens_python.recipe.emailverification.utils import (
+    IsEmailVerifiedCacheConfig, EmailVerificationConfig, OverrideConfig, is_email_verified_for_session
+)
+from supertokens_python.ttl_cache import TTLCache
+
+
+class DummyQuerier:
+    def __init__(self):
+        self.verified = set()
+        self.calls = []
+
+    async def send_get_request(self, path, params):
+        self.calls.append(path.get_as_string_dangerous())
+        return {'status': 'OK', 'isVerified': (params['userId'], params['email']) in self.verified}
+
+    async def send_post_request(self, path, data):
+        self.calls.append(path.get_as_string_dangerous())
+        if path.get_as_string_dangerous() == '/recipe/user/email/verify':
+            self.verified.add(('userId', 'test@example.com'))
+            return {'status': 'OK', 'userId': 'userId', 'email': 'test@example.com'}
+        self.verified.discard((data['userId'], data['email']))
+        return {'status': 'OK'}
+
+
+class DummySession:
+    def __init__(self):
+        self.access_token_payload = {}
+        self.updates = 0
+
+    def get_user_id(self):
+        return 'userId'
+
+    def get_access_token_payload(self):
+        return self.access_token_payload
+
+    async def update_access_token_payload(self, new_access_token_payload):
+        self.updates += 1
+        self.access_token_payload = new_access_token_payload
+
+
+async def get_email_for_user_id(_):
+    return 'test@example.com'
+
+
+def recipe_implementation_with_cache(cache):
+    config = EmailVerificationConfig(OverrideConfig(), None, None, get_email_for_user_id, cache)
+    querier = DummyQuerier()
+    return RecipeImplementation(querier, config), querier, config
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used_entries():
+    cache = TTLCache(2)
+    cache.set('a', 1, 60)
+    cache.set('b', 2, 0.01)
+    cache.set('c', 3, 60)
+
+    assert cache.get('a') is None
+    assert cache.get('c') == 3
+    sleep(0.02)
+    assert cache.get('b') is None
+    assert cache.get('b', False) is False
+
+
+@mark.asyncio
+async def test_that_is_email_verified_is_cached_and_invalidated():
+    recipe_implementation, querier, _ = recipe_implementation_with_cache(IsEmailVerifiedCacheConfig())
+
+    assert await recipe_implementation.is_email_verified('userId', 'test@example.com') is False
+    assert await recipe_implementation.is_email_verified('userId', 'test@example.com') is False
+    assert querier.calls == ['/recipe/user/email/verify']
+
+    await recipe_implementation.verify_email_using_token('token')
+    assert await recipe_implementation.is_email_verified('userId', 'test@example.com') is True
+    assert querier.calls == ['/recipe/user/email/verify'] * 2
+
+    await recipe_implementation.unverify_email('userId', 'test@example.com')
+    assert await recipe_implementation.is_email_verified('userId', 'test@example.com') is False
+    assert len(querier.calls) == 3
+
+
+@mark.asyncio
+async def test_that_is_email_verified_is_not_cached_by_default():
+    recipe_implementation, querier, _ = recipe_implementation_with_cache(None)
+
+    await recipe_implementation.is_email_verified('userId', 'test@example.com')
+    await recipe_implementation.is_email_verified('userId', 'test@example.com')
+    assert len(querier.calls) == 2
+
+
+@mark.asyncio
+async def test_that_the_access_token_claim_skips_the_lookup():
+    recipe_implementation, querier, config = recipe_implementation_with_cache(
+        IsEmailVerifiedCacheConfig(verified_ttl_seconds=0, access_token_claim='st-ev'))
+    querier.verified.add(('userId', 'test@example.com'))
+    session = DummySession()
+
+    assert await is_email_verified_for_session(recipe_implementation, config, session) is True
+    assert session.access_token_payload['st-ev']['email'] == 'test@example.com'
+    assert await is_email_verified_for_session(recipe_implementation, config, session) is True
+    assert len(querier.calls) == 2
+    assert session.updates == 2
+
+    config.cache.verified_ttl_seconds = 60
+    await is_email_verified_for_session(recipe_implementation, config, session)
+    await is_email_verified_for_session(recipe_implementation, config, session)
+    assert len(querier.calls) == 3
+    assert session.updates == 3
+
+
+@mark.asyncio
+async def test_that_unverify_email_invalidates_the_access_token_claim():
+    recipe_implementation, querier, config = recipe_implementation_with_cache(
+        IsEmailVerifiedCacheConfig(access_token_claim='st-ev'))
+    querier.verified.add(('userId', 'test@example.com'))
+    session = DummySession()
+
+    assert await is_email_verified_for_session(recipe_implementation, config, session) is True
+    sleep(0.002)
+    await recipe_implementation.unverify_email('userId', 'test@example.com')
+
+    assert await is_email_verified_for_session(recipe_implementation, config, session) is False
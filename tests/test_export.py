@@ -0,0 +1,95 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import csv
+import gzip
+import io
+import json
+
+from pytest import mark, raises
+
+from supertokens_python import export
+from supertokens_python.supertokens import Supertokens
+
+
+def fake_core(monkeypatch, number_of_pages: int, fail_at: int = None):
+    requested_tokens = []
+
+    async def get_users_json(time_joined_order, limit=None, pagination_token=None, include_recipe_ids=None):
+        requested_tokens.append(pagination_token)
+        index = 0 if pagination_token is None else int(pagination_token)
+        if index == fail_at:
+            raise Exception('core is down')
+        users = [{
+            'recipeId': 'thirdparty' if index % 2 else 'emailpassword',
+            'user': {
+                'id': 'user' + str(index),
+                'email': 'user' + str(index) + '@example.com',
+                'timeJoined': index,
+                **({'thirdParty': {'id': 'google', 'userId': 'g' + str(index)}} if index % 2 else {})
+            }
+        }]
+        response = {'status': 'OK', 'users': users}
+        if index + 1 < number_of_pages:
+            response['nextPaginationToken'] = str(index + 1)
+        return response
+
+    monkeypatch.setattr(Supertokens, 'get_users_json', get_users_json)
+    return requested_tokens
+
+
+@mark.asyncio
+async def test_that_users_are_exported_as_ndjson(monkeypatch):
+    fake_core(monkeypatch, 3)
+    output = io.StringIO()
+
+    assert await export.export_users(output) == 3
+
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [row['userId'] for row in rows] == ['user0', 'user1', 'user2']
+    assert rows[1]['thirdPartyId'] == 'google'
+    assert rows[0]['thirdPartyId'] is None
+
+
+@mark.asyncio
+async def test_that_an_interrupted_gzipped_csv_export_resumes(monkeypatch, tmp_path):
+    output = str(tmp_path / 'users.csv.gz')
+    resume_file = str(tmp_path / 'users.resume')
+
+    fake_core(monkeypatch, 4, fail_at=2)
+    with raises(Exception, match='core is down'):
+        await export.export_users(output, 'csv', resume_file=resume_file)
+    with open(resume_file) as f:
+        assert f.read().splitlines()[-1] == '2'
+    # a page written (partly) after the last resume point, e.g. just before a crash
+    with open(output, 'ab') as f:
+        f.write(gzip.compress(b'user2,')[:10])
+
+    requested_tokens = fake_core(monkeypatch, 4)
+    assert await export.export_users(output, 'csv', resume_file=resume_file) == 2
+    assert requested_tokens == ['2', '3']
+
+    with gzip.open(output, 'rt', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['userId'] for row in rows] == ['user0', 'user1', 'user2', 'user3']
+    assert not (tmp_path / 'users.resume').exists()
+
+
+def test_the_command_line_entry_point(monkeypatch, tmp_path):
+    fake_core(monkeypatch, 2)
+    output = str(tmp_path / 'users.ndjson')
+
+    assert export.main(['--connection-uri', 'http://localhost:3567', '--output', output, '--page-size', '1']) == 2
+
+    with open(output) as f:
+        assert len(f.readlines()) == 2
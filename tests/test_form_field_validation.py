@@ -0,0 +1,61 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+
+from pytest import mark, raises
+
+from supertokens_python.recipe.emailpassword.api.utils import validate_form_or_throw_error
+from supertokens_python.recipe.emailpassword.exceptions import FieldError
+from supertokens_python.recipe.emailpassword.types import FormField, NormalisedFormField
+from supertokens_python.recipe.passwordless.utils import default_validate_phone_number, normalise_phone_number, \
+    _parse_phone_number
+
+
+@mark.asyncio
+async def test_that_field_validators_run_concurrently_and_report_errors_in_order():
+    started = asyncio.Event()
+
+    async def wait_for_the_other_validator(_):
+        await asyncio.wait_for(started.wait(), 1)
+        return 'first is invalid'
+
+    async def start(_):
+        started.set()
+        return 'second is invalid'
+
+    fields = [
+        NormalisedFormField('first', wait_for_the_other_validator, False),
+        NormalisedFormField('missing', start, False),
+        NormalisedFormField('second', start, False)
+    ]
+    inputs = [FormField('second', 'b'), FormField('first', 'a'), FormField('other', '')]
+
+    with raises(FieldError) as e:
+        await validate_form_or_throw_error(inputs, fields)
+
+    assert [(error.id, error.error) for error in e.value.form_fields] == [
+        ('first', 'first is invalid'), ('missing', 'Field is not optional'), ('second', 'second is invalid')]
+
+
+@mark.asyncio
+async def test_that_parsed_phone_numbers_are_cached():
+    _parse_phone_number.cache_clear()
+
+    assert await default_validate_phone_number('+1 650-555-1234') is None
+    assert normalise_phone_number('+1 650-555-1234') == '+16505551234'
+    assert _parse_phone_number.cache_info().hits == 1
+
+    assert await default_validate_phone_number('+1 123') == 'Phone number is invalid'
+    assert await default_validate_phone_number({'junk': True}) == 'Phone number is invalid'
+    assert normalise_phone_number(' not a number ') == 'not a number'
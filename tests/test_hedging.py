@@ -0,0 +1,126 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+
+import httpx
+from pytest import mark, raises
+
+from supertokens_python.hedging import Hedger, HedgingConfig
+from supertokens_python.normalised_url_path import NormalisedURLPath
+from tests.utils import HOST, init_querier
+
+
+class Hosts:
+    """
+    Answers the n-th call after delays[n] seconds (with an error if it is an exception).
+    """
+
+    def __init__(self, *delays):
+        self.delays = list(delays)
+        self.calls = 0
+        self.cancelled = []
+
+    async def send(self):
+        n = self.calls
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delays[n][0] if isinstance(self.delays[n], tuple) else self.delays[n])
+        except asyncio.CancelledError:
+            self.cancelled.append(n)
+            raise
+        if isinstance(self.delays[n], tuple):
+            raise self.delays[n][1]
+        return n
+
+
+def test_that_only_gets_to_the_configured_paths_are_hedged():
+    hedger = Hedger(HedgingConfig())
+
+    assert hedger.should_hedge('GET', '/recipe/user')
+    assert hedger.should_hedge('GET', '/recipe/jwt/jwks')
+    assert not hedger.should_hedge('POST', '/recipe/user')
+    assert not hedger.should_hedge('GET', '/recipe/users')
+
+
+def test_that_the_delay_follows_the_percentile_of_recent_latencies():
+    hedger = Hedger(HedgingConfig(percentile=90, initial_delay_seconds=0.5, min_samples=10, window_size=100))
+    assert hedger.get_delay() == 0.5
+
+    for i in range(100):
+        hedger.record(i / 1000)
+    assert hedger.get_delay() == 0.09
+
+
+@mark.asyncio
+async def test_that_a_slow_request_is_hedged_and_the_loser_cancelled():
+    hedger = Hedger(HedgingConfig(initial_delay_seconds=0.01, max_hedge_ratio=1))
+    hosts = Hosts(1, 0)
+
+    assert await hedger.run(hosts.send) == 1
+    await asyncio.sleep(0)
+    assert hosts.cancelled == [0]
+
+
+@mark.asyncio
+async def test_that_fast_requests_and_errors_are_not_hedged():
+    hedger = Hedger(HedgingConfig(initial_delay_seconds=0.05, max_hedge_ratio=1))
+    hosts = Hosts(0, (0, Exception('not found')))
+
+    assert await hedger.run(hosts.send) == 0
+    with raises(Exception, match='not found'):
+        await hedger.run(hosts.send)
+    assert hosts.calls == 2
+
+
+@mark.asyncio
+async def test_that_the_hedge_answers_when_the_first_request_fails():
+    hedger = Hedger(HedgingConfig(initial_delay_seconds=0.01, max_hedge_ratio=1))
+    hosts = Hosts((0.05, Exception('timed out')), 0.1)
+
+    assert await hedger.run(hosts.send) == 1
+
+    hosts = Hosts((0.05, Exception('timed out')), (0, Exception('down')))
+    with raises(Exception, match='timed out'):
+        await hedger.run(hosts.send)
+
+
+@mark.asyncio
+async def test_that_hedges_are_capped_to_a_ratio_of_the_requests():
+    hedger = Hedger(HedgingConfig(initial_delay_seconds=0, min_delay_seconds=0, max_hedge_ratio=0.25))
+    hosts = Hosts(*[0.01] * 20)
+
+    for _ in range(8):
+        await hedger.run(hosts.send)
+
+    assert hosts.calls == 10
+
+
+@mark.asyncio
+async def test_that_the_querier_hedges_reads_to_another_host(core):
+    querier = init_querier(hosts=[HOST, 'http://localhost:3568'],
+                           hedging=HedgingConfig(initial_delay_seconds=0.01, max_hedge_ratio=1))
+
+    async def slow():
+        await asyncio.sleep(1)
+        return httpx.Response(200, json={'status': 'OK', 'host': 'slow'})
+
+    core.outcomes = [slow, httpx.Response(200, json={'status': 'OK', 'host': 'fast'})]
+    response = await querier.send_get_request(NormalisedURLPath('/recipe/user'), {'userId': 'userId'})
+
+    assert response['host'] == 'fast'
+    assert len({url for _, url, _ in core.calls}) == 2
+
+    core.outcomes = [httpx.Response(200, json={'status': 'OK'})]
+    await querier.send_post_request(NormalisedURLPath('/recipe/user'), {})
+    assert len(core.calls) == 3
@@ -0,0 +1,137 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+from os import utime
+from threading import current_thread
+
+import httpx
+from pytest import mark, raises
+
+from supertokens_python.background_tasks import BackgroundTaskSupervisor
+from supertokens_python.exceptions import GeneralError
+from supertokens_python.host_discovery import DNSHostProvider, FileHostProvider, HostProvider
+from supertokens_python.normalised_url_path import NormalisedURLPath
+from supertokens_python.querier import Querier
+from tests.utils import init_querier
+
+
+class ListHostProvider(HostProvider):
+    def __init__(self, *hosts):
+        self.hosts = list(hosts)
+        self.ttl_seconds = 0
+        self.drain_seconds = 0
+
+    async def get_hosts(self):
+        return self.hosts
+
+
+@mark.asyncio
+async def test_that_the_file_is_read_again_when_it_changes(tmp_path):
+    path = tmp_path / 'hosts'
+    path.write_text('http://core-1:3567;http://core-2:3567\n')
+    provider = FileHostProvider(str(path))
+    assert await provider.get_hosts() == ['http://core-1:3567', 'http://core-2:3567']
+
+    path.write_text('http://core-1:3567\nhttp://core-3:3567\n')
+    utime(path, ns=(1, 1))
+    assert await provider.get_hosts() == ['http://core-1:3567', 'http://core-3:3567']
+
+
+@mark.asyncio
+async def test_that_dns_names_are_resolved_to_their_addresses():
+    hosts = await DNSHostProvider('localhost', 3567).get_hosts()
+
+    assert len(hosts) != 0
+    assert all(host in ('http://127.0.0.1:3567', 'http://[::1]:3567') for host in hosts)
+
+
+def test_that_https_needs_srv_records():
+    with raises(GeneralError):
+        DNSHostProvider('localhost', 3567, scheme='https')
+
+
+@mark.asyncio
+async def test_that_the_querier_follows_the_hosts_of_the_provider(core):
+    provider = ListHostProvider('http://core-1:3567')
+    querier = init_querier(hosts=[], host_provider=provider)
+    ok = httpx.Response(200, json={'status': 'OK'})
+
+    core.outcomes = [ok]
+    await querier.send_get_request(NormalisedURLPath('/recipe/user'), {})
+    assert core.calls[-1][1] == 'http://core-1:3567/recipe/user'
+
+    provider.hosts = ['http://core-2:3567']
+    core.outcomes = [ok, ok]
+    await querier.send_get_request(NormalisedURLPath('/recipe/user'), {})
+    await BackgroundTaskSupervisor.get_instance().shutdown(5)
+    await querier.send_get_request(NormalisedURLPath('/recipe/user'), {})
+
+    assert core.calls[-1][1] == 'http://core-2:3567/recipe/user'
+    assert 'http://core-2:3567/hello' in core.warmed_up
+
+
+@mark.asyncio
+async def test_that_the_hosts_are_kept_when_the_provider_fails(core):
+    provider = ListHostProvider('http://core-1:3567')
+    querier = init_querier(hosts=[], host_provider=provider)
+    await Querier.refresh_hosts()
+
+    async def fail():
+        raise Exception('dns is down')
+
+    provider.get_hosts = fail
+    await Querier.refresh_hosts()
+    provider.hosts = []
+    del provider.get_hosts
+    await Querier.refresh_hosts()
+
+    core.outcomes = [httpx.Response(200, json={'status': 'OK'})]
+    await querier.send_get_request(NormalisedURLPath('/recipe/user'), {})
+    assert core.calls[-1][1] == 'http://core-1:3567/recipe/user'
+
+
+@mark.asyncio
+async def test_that_wsgi_apps_refresh_the_hosts_on_the_supervisor_thread(core):
+    provider = ListHostProvider('http://core-1:3567')
+    querier = init_querier(hosts=[], host_provider=provider, mode='wsgi')
+    threads = []
+
+    async def get_hosts():
+        threads.append(current_thread().name)
+        return ['http://core-1:3567']
+
+    await Querier.refresh_hosts()
+    provider.get_hosts = get_hosts
+    core.outcomes = [httpx.Response(200, json={'status': 'OK'})]
+    await querier.send_get_request(NormalisedURLPath('/recipe/user'), {})
+    cluster = Querier.get_cluster()
+    for _ in range(100):
+        if not cluster.hosts_refreshing:
+            break
+        await asyncio.sleep(0.01)
+
+    assert threads == ['supertokens-background-tasks']
+    assert not cluster.hosts_refreshing
+
+
+@mark.asyncio
+async def test_that_a_refresh_that_never_runs_can_be_retried(core):
+    provider = ListHostProvider('http://core-1:3567')
+    init_querier(hosts=[], host_provider=provider)
+    await Querier.refresh_hosts()
+    BackgroundTaskSupervisor.get_instance().drain(0)
+
+    cluster = Querier.get_cluster()
+    await cluster.refresh_hosts_if_due('asgi')
+    assert not cluster.hosts_refreshing
@@ -0,0 +1,70 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import sys
+from subprocess import run, PIPE
+from typing import Dict
+
+from pytest import mark
+
+
+def import_times(statement: str) -> Dict[str, int]:
+    # runs the statement in a fresh interpreter and returns the cumulative import
+    # time (in microseconds) of every module it loaded, as reported by -X importtime.
+    # Modules loaded through importlib are not reported by -X importtime, so they
+    # are added (with an unknown time of -1) from sys.modules at exit.
+    script = statement + '\nimport sys\nprint("\\n".join(sys.modules))'
+    result = run([sys.executable, '-X', 'importtime', '-c', script], stdout=PIPE, stderr=PIPE, check=True,
+                 universal_newlines=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    for name in result.stdout.splitlines():
+        times.setdefault(name, -1)
+    return times
+
+
+@mark.parametrize('statement', [
+    'import supertokens_python',
+    'from supertokens_python.recipe import session',
+    'from supertokens_python.recipe.session.asyncio import get_session',
+    'from supertokens_python.framework.fastapi import Middleware',
+])
+def test_that_unused_framework_adapters_and_recipes_are_not_imported(statement):
+    modules = import_times(statement)
+
+    assert not any(name.startswith('supertokens_python.framework.django') for name in modules)
+    assert not any(name.startswith('supertokens_python.framework.flask') for name in modules)
+    assert not any(name.startswith('supertokens_python.recipe.openid') for name in modules)
+    assert not any(name.startswith('supertokens_python.recipe.jwt') for name in modules)
+    assert 'django' not in modules
+    assert 'flask' not in modules
+    assert 'jwt' not in modules
+    assert 'jsonschema' not in modules
+
+
+def test_that_framework_adapters_are_imported_on_first_use():
+    modules = import_times('from supertokens_python.utils import FRAMEWORKS; FRAMEWORKS["flask"]')
+
+    assert 'supertokens_python.framework.flask.framework' in modules
+    assert 'supertokens_python.framework.django.framework' not in modules
+    assert 'supertokens_python.framework.fastapi.framework' not in modules
+
+
+def test_that_the_jwt_feature_still_resolves_lazily():
+    modules = import_times('from supertokens_python.recipe.session import OpenIdInputOverrideConfig')
+
+    assert 'supertokens_python.recipe.openid' in modules
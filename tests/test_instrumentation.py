@@ -0,0 +1,92 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from importlib.util import find_spec
+
+import httpx
+from pytest import mark, raises
+
+from supertokens_python.exceptions import GeneralError
+from supertokens_python.instrumentation import Instrumentation, PrometheusInstrumentation, \
+    OpenTelemetryInstrumentation
+from supertokens_python.normalised_url_path import NormalisedURLPath
+from tests.utils import HOST, read_timeout, init_querier
+
+
+class RecordingInstrumentation(Instrumentation):
+    def __init__(self):
+        self.started = []
+        self.calls = []
+
+    def before_call(self, call):
+        self.started.append((call.path, call.method, call.host, call.attempt))
+
+    def after_call(self, call):
+        self.calls.append(call)
+
+
+@mark.asyncio
+async def test_that_every_attempt_is_reported(core):
+    instrumentation = RecordingInstrumentation()
+    querier = init_querier(instrumentation=instrumentation)
+    core.outcomes = [httpx.Response(503, content=b'busy'), read_timeout(), httpx.Response(200, json={'status': 'OK'})]
+
+    await querier.send_get_request(NormalisedURLPath('/recipe/user'), {})
+
+    calls = [call for call in instrumentation.calls if call.path == '/recipe/user']
+    assert [(call.attempt, call.status_code, call.outcome) for call in calls] == [
+        (1, 503, 'http_error'), (2, None, 'timeout'), (3, 200, 'ok')]
+    assert all(call.duration_seconds >= 0 and call.host == HOST and call.method == 'GET' for call in calls)
+    assert ('/apiversion', 'GET', HOST, 1) in instrumentation.started
+
+
+@mark.asyncio
+async def test_that_failovers_are_reported_with_their_host(core):
+    instrumentation = RecordingInstrumentation()
+    querier = init_querier(hosts=[HOST, 'http://localhost:3568'], instrumentation=instrumentation)
+    core.outcomes = [httpx.ConnectError('refused', request=httpx.Request('POST', HOST)),
+                     httpx.Response(400, content=b'bad request')]
+
+    with raises(GeneralError):
+        await querier.send_post_request(NormalisedURLPath('/recipe/signup'), {})
+
+    calls = [call for call in instrumentation.calls if call.path == '/recipe/signup']
+    assert [(call.attempt, call.outcome) for call in calls] == [(1, 'connection_error'), (2, 'http_error')]
+    assert calls[0].host != calls[1].host
+
+
+@mark.asyncio
+async def test_that_errors_of_the_hooks_are_ignored(core):
+    class BrokenInstrumentation(Instrumentation):
+        def before_call(self, call):
+            raise Exception('broken')
+
+        def after_call(self, call):
+            raise Exception('broken')
+
+    querier = init_querier(instrumentation=BrokenInstrumentation())
+    core.outcomes = [httpx.Response(200, json={'status': 'OK'})]
+
+    assert await querier.send_get_request(NormalisedURLPath('/recipe/user'), {}) == {'status': 'OK'}
+
+
+@mark.skipif(find_spec('prometheus_client') is not None, reason='prometheus_client is installed')
+def test_that_the_prometheus_adapter_needs_prometheus_client():
+    with raises(GeneralError):
+        PrometheusInstrumentation()
+
+
+@mark.skipif(find_spec('opentelemetry') is not None, reason='opentelemetry is installed')
+def test_that_the_opentelemetry_adapter_needs_opentelemetry():
+    with raises(GeneralError):
+        OpenTelemetryInstrumentation()
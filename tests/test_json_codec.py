@@ -0,0 +1,113 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import json
+from base64 import b64decode
+
+from fastapi import Response
+from pytest import mark, importorskip, raises
+
+from supertokens_python import init, SupertokensConfig, InputAppInfo, Supertokens
+from supertokens_python.exceptions import GeneralError
+from supertokens_python.framework.fastapi.fastapi_response import FastApiResponse
+from supertokens_python.json_codec import JSON, StdlibJSONCodec, create_json_codec, json_dumps, json_loads
+from supertokens_python.recipe import session
+from supertokens_python.recipe.session import SessionRecipe
+from supertokens_python.recipe.session.cookie_and_header import set_front_token_in_headers
+
+
+def setup_function(f):
+    Supertokens.reset()
+    SessionRecipe.reset()
+
+
+def teardown_function(f):
+    Supertokens.reset()
+    SessionRecipe.reset()
+
+
+def init_with_codec(json_codec):
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name="SuperTokens Demo",
+            api_domain="api.supertokens.io",
+            website_domain="supertokens.io"
+        ),
+        framework='fastapi',
+        recipe_list=[session.init()],
+        json_codec=json_codec
+    )
+
+
+@mark.parametrize('name', ['stdlib', 'orjson', 'ujson'])
+def test_that_every_codec_encodes_compact_utf8_bytes(name):
+    importorskip(name if name != 'stdlib' else 'json')
+    codec = create_json_codec(name)
+    obj = {'b': 'é', 'a': [1, None, True], 'c': {'url': 'https://a/b'}}
+
+    encoded = codec.dumps(obj, sort_keys=True)
+
+    assert encoded == json.dumps(obj, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    assert codec.loads(encoded) == obj
+    assert codec.loads(encoded.decode('utf-8')) == obj
+
+
+@mark.parametrize('name', ['stdlib', 'orjson', 'ujson'])
+def test_that_every_codec_encodes_non_str_keys_as_strings(name):
+    importorskip(name if name != 'stdlib' else 'json')
+    codec = create_json_codec(name)
+
+    assert codec.dumps({'up': {1: 'a', 'b': 2}}) == b'{"up":{"1":"a","b":2}}'
+
+
+def test_that_the_codec_is_configured_at_init_and_reset():
+    importorskip('orjson')
+    init_with_codec('orjson')
+    assert type(JSON.get_codec()).__name__ == 'OrjsonJSONCodec'
+
+    Supertokens.reset()
+    assert isinstance(JSON.get_codec(), StdlibJSONCodec)
+
+
+def test_that_a_custom_codec_is_used_everywhere():
+    calls = []
+
+    class CountingCodec(StdlibJSONCodec):
+        def dumps(self, obj, sort_keys=False):
+            calls.append('dumps')
+            return super().dumps(obj, sort_keys)
+
+    init_with_codec(CountingCodec())
+    response = FastApiResponse(Response())
+    response.set_json_content({'status': 'OK'})
+    set_front_token_in_headers(SessionRecipe.get_instance(), response, 'user', 1, {'name': 'José'})
+
+    assert calls == ['dumps']
+    assert json_loads(response.response.body) == {'status': 'OK'}
+
+
+def test_that_the_front_token_stays_ascii_escaped():
+    init_with_codec('stdlib')
+    response = FastApiResponse(Response())
+    set_front_token_in_headers(SessionRecipe.get_instance(), response, 'user', 1, {'name': 'Zoë'})
+
+    front_token = b64decode(response.get_header('front-token'))
+    assert front_token == b'{"ate":1,"uid":"user","up":{"name":"Zo\\u00eb"}}'
+    assert json.loads(front_token) == {'uid': 'user', 'ate': 1, 'up': {'name': 'Zoë'}}
+
+
+def test_that_unknown_codecs_are_rejected():
+    with raises(GeneralError):
+        create_json_codec('simplejson')
+    assert json_dumps({'a': 1}) == b'{"a":1}'
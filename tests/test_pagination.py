@@ -0,0 +1,101 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+from threading import get_ident
+
+import httpx
+from pytest import mark, raises
+
+from supertokens_python.normalised_url_path import NormalisedURLPath
+from supertokens_python.pagination import iter_pages, sync_iter_pages
+from supertokens_python.types import UsersResponse
+from tests.utils import init_querier
+
+
+def fake_pages(number_of_pages: int, fetched: list, fail_at: int = None):
+    async def get_page(pagination_token):
+        index = 0 if pagination_token is None else int(pagination_token)
+        fetched.append((index, get_ident()))
+        if index == fail_at:
+            raise Exception('core is down')
+        await asyncio.sleep(0.01)
+        next_token = str(index + 1) if index + 1 < number_of_pages else None
+        return UsersResponse([index], next_token)
+
+    return get_page
+
+
+@mark.asyncio
+async def test_that_pages_are_prefetched_while_the_caller_processes_a_page():
+    fetched = []
+    seen = []
+    async for page in iter_pages(fake_pages(4, fetched), buffer_size=2):
+        if page.users == [0]:
+            await asyncio.sleep(0.1)
+            assert len(fetched) == 4
+        seen.extend(page.users)
+
+    assert seen == [0, 1, 2, 3]
+
+
+@mark.asyncio
+async def test_that_the_buffer_bounds_prefetching():
+    fetched = []
+    async for page in iter_pages(fake_pages(10, fetched), buffer_size=1):
+        await asyncio.sleep(0.1)
+        # the page being processed, one buffered page and the one being fetched
+        assert len(fetched) <= page.users[0] + 3
+        if page.users == [2]:
+            break
+    await asyncio.sleep(0.05)
+    assert len(fetched) <= 5
+
+
+@mark.asyncio
+async def test_that_errors_are_raised_when_their_page_is_reached():
+    seen = []
+    with raises(Exception, match='core is down'):
+        async for page in iter_pages(fake_pages(4, [], fail_at=2)):
+            seen.extend(page.users)
+    assert seen == [0, 1]
+
+
+def test_that_sync_pages_are_fetched_on_another_thread():
+    fetched = []
+    seen = []
+    for page in sync_iter_pages(fake_pages(3, fetched)):
+        seen.extend(page.users)
+
+    assert seen == [0, 1, 2]
+    assert all(thread != get_ident() for _, thread in fetched)
+
+
+def test_that_sync_errors_are_raised_when_their_page_is_reached():
+    seen = []
+    with raises(Exception, match='core is down'):
+        for page in sync_iter_pages(fake_pages(4, [], fail_at=1)):
+            seen.extend(page.users)
+    assert seen == [0]
+
+
+def test_that_sync_pages_close_the_connections_of_their_thread(core):
+    core.outcomes = [httpx.Response(200, json={})]
+    querier = init_querier()
+
+    async def get_page(_):
+        await querier.send_get_request(NormalisedURLPath('/recipe/users'), {})
+        return UsersResponse([], None)
+
+    assert len(list(sync_iter_pages(get_page))) == 1
+    assert core.closed == 1
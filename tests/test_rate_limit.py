@@ -0,0 +1,158 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+import sqlite3
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pytest import mark
+
+from supertokens_python import init, SupertokensConfig, InputAppInfo, Supertokens, RateLimitConfig, RateLimitRule, \
+    InMemoryRateLimitStore, SQLiteRateLimitStore
+from supertokens_python.framework.fastapi import Middleware
+from supertokens_python.recipe import emailpassword, session
+from supertokens_python.recipe.emailpassword import EmailPasswordRecipe, InputOverrideConfig
+from supertokens_python.recipe.emailpassword.interfaces import SignInPostWrongCredentialsErrorResponse, \
+    EmailExistsGetOkResponse
+from supertokens_python.recipe.emailverification import EmailVerificationRecipe
+from supertokens_python.recipe.session import SessionRecipe
+from supertokens_python.user_existence_cache import UserExistenceCacheConfig
+
+
+def setup_function(f):
+    Supertokens.reset()
+    SessionRecipe.reset()
+    EmailPasswordRecipe.reset()
+    EmailVerificationRecipe.reset()
+
+
+def teardown_function(f):
+    Supertokens.reset()
+    SessionRecipe.reset()
+    EmailPasswordRecipe.reset()
+    EmailVerificationRecipe.reset()
+
+
+@mark.asyncio
+async def test_that_buckets_refill_at_their_rate():
+    store = InMemoryRateLimitStore(shards=2, max_keys_per_shard=1)
+
+    assert [await store.take('a', 2, 0.5) for _ in range(2)] == [0, 0]
+    assert 1.9 < await store.take('a', 2, 0.5) <= 2
+    assert await store.take('b', 2, 0.5) == 0
+
+
+@mark.asyncio
+async def test_that_the_sqlite_store_is_shared(tmp_path):
+    first = SQLiteRateLimitStore(str(tmp_path / 'rate_limit.db'))
+    second = SQLiteRateLimitStore(str(tmp_path / 'rate_limit.db'))
+
+    assert await first.take('a', 1, 1) == 0
+    assert await second.take('a', 1, 1) > 0
+    assert await second.take('b', 1, 1) == 0
+
+
+@mark.asyncio
+async def test_that_the_sqlite_store_prunes_full_buckets(tmp_path):
+    path = str(tmp_path / 'rate_limit.db')
+    store = SQLiteRateLimitStore(path, prune_interval_seconds=0)
+
+    for i in range(10):
+        await store.take('fast' + str(i), 1, 1000)
+    await asyncio.sleep(0.01)
+    await store.take('slow', 1, 0.001)
+
+    assert sqlite3.connect(path).execute('SELECT key FROM supertokens_rate_limit_buckets').fetchall() == [('slow',)]
+    assert await store.take('slow', 1, 0.001) > 0
+
+
+def test_that_requests_over_the_limit_get_a_429_before_the_api_runs():
+    calls = []
+
+    def apis(original_implementation):
+        async def sign_in_post(form_fields, api_options):
+            calls.append(form_fields[0].value)
+            return SignInPostWrongCredentialsErrorResponse()
+        original_implementation.sign_in_post = sign_in_post
+        return original_implementation
+
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name="SuperTokens Demo",
+            api_domain="api.supertokens.io",
+            website_domain="supertokens.io"
+        ),
+        framework='fastapi',
+        recipe_list=[session.init(), emailpassword.init(override=InputOverrideConfig(apis=apis))],
+        rate_limit=RateLimitConfig([RateLimitRule('email', 2, 0.01, ['signin']),
+                                    RateLimitRule('ip', 100, 1)])
+    )
+    app = FastAPI()
+    app.add_middleware(Middleware)
+    client = TestClient(app)
+
+    def sign_in(email):
+        return client.post('/auth/signin', json={'formFields': [{'id': 'email', 'value': email},
+                                                                {'id': 'password', 'value': 'password1'}]})
+
+    assert [sign_in('a@b.com').status_code for _ in range(3)] == [200, 200, 429]
+    response = sign_in('A@b.com')
+    assert response.status_code == 429
+    assert response.json() == {'message': 'Too many requests'}
+    assert int(response.headers['Retry-After']) > 0
+    assert sign_in('c@d.com').status_code == 200
+    assert calls == ['a@b.com', 'a@b.com', 'c@d.com']
+
+
+def test_that_the_client_ip_of_the_app_info_is_used_by_every_limit():
+    def apis(original_implementation):
+        async def sign_in_post(form_fields, api_options):
+            return SignInPostWrongCredentialsErrorResponse()
+
+        async def email_exists_get(email, api_options):
+            return EmailExistsGetOkResponse(False)
+        original_implementation.sign_in_post = sign_in_post
+        original_implementation.email_exists_get = email_exists_get
+        return original_implementation
+
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name="SuperTokens Demo",
+            api_domain="api.supertokens.io",
+            website_domain="supertokens.io",
+            get_client_ip=lambda request: request.get_header('x-forwarded-for')
+        ),
+        framework='fastapi',
+        recipe_list=[session.init(), emailpassword.init(
+            override=InputOverrideConfig(apis=apis),
+            user_existence_cache=UserExistenceCacheConfig(max_probes_per_ip=1))],
+        rate_limit=RateLimitConfig([RateLimitRule('ip', 1, 0.01)])
+    )
+    app = FastAPI()
+    app.add_middleware(Middleware)
+    client = TestClient(app)
+
+    def sign_in(ip):
+        return client.post('/auth/signin', headers={'X-Forwarded-For': ip},
+                           json={'formFields': [{'id': 'email', 'value': 'a@b.com'},
+                                                {'id': 'password', 'value': 'password1'}]}).status_code
+
+    def email_exists(ip):
+        return client.get('/auth/signup/email/exists', params={'email': 'a@b.com'},
+                          headers={'X-Forwarded-For': ip}).status_code
+
+    assert [sign_in('10.0.0.1'), sign_in('10.0.0.1'), sign_in('10.0.0.2')] == [200, 429, 200]
+    assert [email_exists('10.0.0.1'), email_exists('10.0.0.1'), email_exists('10.0.0.2')] == [200, 429, 200]
@@ -0,0 +1,135 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from typing import Union
+
+from pytest import mark
+
+from supertokens_python import init, SupertokensConfig, InputAppInfo
+from supertokens_python.framework.request import BaseRequest
+from supertokens_python.recipe import session
+from supertokens_python.recipe.session import SessionRecipe, session_functions
+from tests.utils import reset
+
+
+class DummyRequest(BaseRequest):
+
+    def __init__(self, method: str, cookies: dict, headers: Union[dict, None] = None):
+        super().__init__()
+        self.__method = method
+        self.__cookies = cookies
+        self.__headers = {} if headers is None else headers
+        self.__session = None
+
+    def get_query_param(self, key, default=None):
+        return default
+
+    async def json(self):
+        return {}
+
+    async def form_data(self):
+        return {}
+
+    def method(self) -> str:
+        return self.__method
+
+    def get_cookie(self, key: str) -> Union[str, None]:
+        return self.__cookies.get(key)
+
+    def get_header(self, key: str) -> Union[str, None]:
+        return self.__headers.get(key)
+
+    def url(self):
+        return ''
+
+    def get_session(self):
+        return self.__session
+
+    def set_session(self, session):
+        self.__session = session
+
+    def get_path(self) -> str:
+        return '/'
+
+
+def setup_function(f):
+    reset()
+
+
+def teardown_function(f):
+    reset()
+
+
+def init_session_recipe(monkeypatch):
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name='SuperTokens Demo',
+            api_domain='https://api.supertokens.io',
+            website_domain='supertokens.io'
+        ),
+        framework='fastapi',
+        recipe_list=[session.init(anti_csrf='VIA_CUSTOM_HEADER')]
+    )
+    calls = []
+
+    async def get_session(recipe_implementation, access_token, anti_csrf_token, do_anti_csrf_check,
+                          contains_custom_header):
+        calls.append((access_token, do_anti_csrf_check))
+        return {'session': {'handle': 'handle', 'userId': 'userId', 'userDataInJWT': {}}}
+
+    monkeypatch.setattr(session_functions, 'get_session', get_session)
+    return SessionRecipe.get_instance().recipe_implementation, calls
+
+
+def session_cookies(access_token: str = 'accessToken'):
+    return {'sAccessToken': access_token, 'sIdRefreshToken': 'idRefreshToken'}
+
+
+@mark.asyncio
+async def test_that_get_session_reuses_the_session_verified_earlier_in_the_request(monkeypatch):
+    recipe_implementation, calls = init_session_recipe(monkeypatch)
+    request = DummyRequest('get', session_cookies())
+
+    first = await recipe_implementation.get_session(request)
+    second = await recipe_implementation.get_session(request)
+
+    assert second is first
+    assert calls == [('accessToken', False)]
+
+
+@mark.asyncio
+async def test_that_a_stricter_anti_csrf_check_verifies_again(monkeypatch):
+    recipe_implementation, calls = init_session_recipe(monkeypatch)
+    request = DummyRequest('get', session_cookies(), {'rid': 'session'})
+
+    first = await recipe_implementation.get_session(request, anti_csrf_check=False)
+    second = await recipe_implementation.get_session(request, anti_csrf_check=True)
+    third = await recipe_implementation.get_session(request, anti_csrf_check=False)
+
+    assert second is not first
+    assert third is second
+    assert calls == [('accessToken', False), ('accessToken', True)]
+
+
+@mark.asyncio
+async def test_that_sessions_are_not_shared_across_requests_or_revoked_sessions(monkeypatch):
+    recipe_implementation, calls = init_session_recipe(monkeypatch)
+    request = DummyRequest('get', session_cookies())
+
+    first = await recipe_implementation.get_session(request)
+    await recipe_implementation.get_session(DummyRequest('get', session_cookies()))
+    first.remove_cookies = True
+    await recipe_implementation.get_session(request)
+
+    assert len(calls) == 3
@@ -0,0 +1,114 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+
+import httpx
+from pytest import mark, raises
+
+from supertokens_python.constants import USERS
+from supertokens_python.exceptions import CoreTimeoutError, GeneralError
+from supertokens_python.normalised_url_path import NormalisedURLPath
+from supertokens_python.retry_policy import TimeoutConfig, RetryConfig, core_deadline, get_remaining_budget
+from tests.utils import HOST, read_timeout, init_querier
+
+
+@mark.asyncio
+async def test_that_every_attempt_gets_the_timeout_of_its_path(core):
+    querier = init_querier(TimeoutConfig(default_seconds=4, paths={'/recipe/user': 7}, deadline_seconds=None))
+    core.outcomes = [httpx.Response(200, json={'status': 'OK'})] * 3
+
+    await querier.send_post_request(NormalisedURLPath('/recipe/session/verify'), {})
+    await querier.send_get_request(NormalisedURLPath('/recipe/user'), {})
+    await querier.send_get_request(NormalisedURLPath('/recipe/jwt/jwks'), {})
+
+    assert [timeout for _, _, timeout in core.calls] == [2, 7, 4]
+
+
+@mark.asyncio
+async def test_that_the_default_deadline_leaves_user_listings_their_whole_timeout(core):
+    querier = init_querier(TimeoutConfig())
+    core.outcomes = [httpx.Response(200, json={'status': 'OK'})] * 2
+
+    await querier.send_get_request(NormalisedURLPath(USERS), {})
+    await querier.send_get_request(NormalisedURLPath('/recipe/user'), {})
+
+    assert [timeout for _, _, timeout in core.calls] == [30, 5]
+    assert TimeoutConfig().get_deadline(USERS) == 60
+    assert TimeoutConfig(deadline_seconds=1).get_deadline(USERS) == 60
+    assert TimeoutConfig(paths={'/recipe/user': 20}).get_deadline('/recipe/user') == 20
+
+
+@mark.asyncio
+async def test_that_idempotent_requests_are_retried_on_5xx_and_timeouts(core):
+    querier = init_querier()
+    core.outcomes = [httpx.Response(503, content=b'busy'), read_timeout(), httpx.Response(200, json={'status': 'OK'})]
+
+    assert await querier.send_get_request(NormalisedURLPath('/recipe/user'), {}) == {'status': 'OK'}
+    assert len(core.calls) == 3
+
+
+@mark.asyncio
+async def test_that_retries_stop_after_max_attempts(core):
+    querier = init_querier(retry=RetryConfig(max_attempts=2, base_delay_seconds=0))
+    core.outcomes = [read_timeout(), read_timeout(), httpx.Response(200, json={'status': 'OK'})]
+
+    with raises(CoreTimeoutError):
+        await querier.send_get_request(NormalisedURLPath('/recipe/user'), {})
+    assert len(core.calls) == 2
+
+
+@mark.asyncio
+async def test_that_unsafe_posts_are_not_retried(core):
+    querier = init_querier()
+    core.outcomes = [httpx.Response(503, content=b'busy'), httpx.Response(200, json={'status': 'OK'})]
+
+    with raises(GeneralError):
+        await querier.send_post_request(NormalisedURLPath('/recipe/session/refresh'), {})
+    assert len(core.calls) == 1
+
+    core.outcomes = [read_timeout(), httpx.Response(200, json={'status': 'OK'})]
+    with raises(CoreTimeoutError):
+        await querier.send_post_request(NormalisedURLPath('/recipe/signup'), {})
+    assert len(core.calls) == 2
+
+
+@mark.asyncio
+async def test_that_connection_errors_move_on_to_the_next_host(core):
+    querier = init_querier(hosts=[HOST, 'http://localhost:3568'])
+    core.outcomes = [httpx.ConnectError('refused', request=httpx.Request('POST', HOST)),
+                     httpx.Response(200, json={'status': 'OK'})]
+
+    assert await querier.send_post_request(NormalisedURLPath('/recipe/signup'), {}) == {'status': 'OK'}
+    assert {url for _, url, _ in core.calls} == {HOST + '/recipe/signup', 'http://localhost:3568/recipe/signup'}
+
+
+@mark.asyncio
+async def test_that_the_deadline_bounds_the_attempts_and_retries(core):
+    querier = init_querier(TimeoutConfig(default_seconds=5, deadline_seconds=None),
+                           RetryConfig(max_attempts=5, base_delay_seconds=0))
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        raise read_timeout()
+
+    core.outcomes = [slow] * 5
+    with core_deadline(0.05):
+        with core_deadline(10):
+            assert get_remaining_budget() <= 0.05
+        with raises(CoreTimeoutError):
+            await querier.send_get_request(NormalisedURLPath('/recipe/user'), {})
+
+    assert len(core.calls) < 5
+    assert all(timeout <= 0.05 for _, _, timeout in core.calls)
+    assert get_remaining_budget() is None
@@ -0,0 +1,91 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import tracemalloc
+
+from pytest import mark
+
+from supertokens_python.recipe.session import Session
+from supertokens_python.recipe.session.access_token import AccessTokenInfo
+from supertokens_python.recipe.session.recipe_implementation import HandshakeInfo
+from supertokens_python.recipe.session.with_jwt.recipe_implementation import RecipeImplementationWithJWT
+from supertokens_python.recipe.session.with_jwt.session_class import SessionWithJWT
+from supertokens_python.recipe_module import APIHandled
+
+
+class DictSession:
+    # the shape Session had before it used __slots__
+    def __init__(self, recipe_implementation, access_token, session_handle, user_id, access_token_payload):
+        self.recipe_implementation = recipe_implementation
+        self.access_token = access_token
+        self.session_handle = session_handle
+        self.access_token_payload = access_token_payload
+        self.user_id = user_id
+        self.new_access_token_info = None
+        self.new_refresh_token_info = None
+        self.new_id_refresh_token_info = None
+        self.new_anti_csrf_token = None
+        self.remove_cookies = False
+        self.verified_tokens = None
+
+
+def allocated_bytes(create, count=1000) -> int:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [create() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(objects) == count
+    return (after - before) // count
+
+
+def test_that_a_session_allocates_less_than_a_dict_based_one():
+    payload = {}
+
+    slotted = allocated_bytes(lambda: Session(None, 'token', 'handle', 'user', payload))
+    with_dict = allocated_bytes(lambda: DictSession(None, 'token', 'handle', 'user', payload))
+
+    assert slotted < with_dict
+
+
+def test_that_access_token_info_allocates_less_than_a_dict():
+    slotted = allocated_bytes(lambda: AccessTokenInfo('handle', 'user', 'hash', None, {}, None, 1, 1))
+    as_dict = allocated_bytes(lambda: {
+        'sessionHandle': 'handle', 'userId': 'user', 'refreshTokenHash1': 'hash', 'parentRefreshTokenHash1': None,
+        'userData': {}, 'antiCsrfToken': None, 'expiryTime': 1, 'timeCreated': 1
+    })
+
+    assert slotted < as_dict
+
+
+@mark.parametrize('obj', [
+    lambda: Session(None, 'token', 'handle', 'user', {}),
+    lambda: HandshakeInfo({'accessTokenBlacklistingEnabled': False, 'antiCsrf': 'NONE', 'accessTokenValidity': 1,
+                           'refreshTokenValidity': 1}),
+    lambda: AccessTokenInfo('handle', 'user', 'hash', None, {}, None, 1, 1),
+    lambda: APIHandled(None, 'post', 'id', False),
+])
+def test_that_hot_path_objects_have_no_instance_dict(obj):
+    assert not hasattr(obj(), '__dict__')
+
+
+def test_that_the_jwt_recipe_creates_jwt_sessions_without_per_request_closures():
+    class RecipeImplementation:
+        openid_recipe_implementation = None
+
+    session = SessionWithJWT(RecipeImplementation(), 'token', 'handle', 'user', {})
+
+    assert RecipeImplementationWithJWT.session_class is SessionWithJWT
+    assert not hasattr(session, '__dict__')
@@ -0,0 +1,131 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+
+from pytest import mark
+
+from supertokens_python import init, SupertokensConfig, InputAppInfo, Supertokens
+from supertokens_python.recipe import session
+from supertokens_python.recipe.session import SessionRecipe, session_functions
+from supertokens_python.recipe.session.asyncio import get_sessions_information, revoke_session
+from supertokens_python.recipe.session.exceptions import raise_unauthorised_exception
+from supertokens_python.recipe.session.session_class import Session
+
+
+def setup_function(f):
+    Supertokens.reset()
+    SessionRecipe.reset()
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name="SuperTokens Demo",
+            api_domain="api.supertokens.io",
+            website_domain="supertokens.io"
+        ),
+        framework='fastapi',
+        recipe_list=[session.init()]
+    )
+
+
+def teardown_function(f):
+    Supertokens.reset()
+    SessionRecipe.reset()
+
+
+def fake_core(monkeypatch):
+    fetched = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def get_session_information(_, session_handle):
+        nonlocal in_flight, max_in_flight
+        fetched.append(session_handle)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if session_handle == 'revoked':
+            raise_unauthorised_exception('Session does not exist.')
+        return {'sessionHandle': session_handle, 'userId': 'user'}
+
+    async def revoke(_, session_handle):
+        return True
+
+    monkeypatch.setattr(session_functions, 'get_session_information', get_session_information)
+    monkeypatch.setattr(session_functions, 'revoke_session', revoke)
+    return fetched, lambda: max_in_flight
+
+
+@mark.asyncio
+async def test_that_sessions_are_fetched_concurrently_and_deduplicated(monkeypatch):
+    fetched, max_in_flight = fake_core(monkeypatch)
+    handles = ['h' + str(i) for i in range(6)]
+
+    information = await get_sessions_information(handles + ['revoked', 'h0'], concurrency=2)
+
+    assert list(information) == handles + ['revoked']
+    assert information['h1'] == {'sessionHandle': 'h1', 'userId': 'user'}
+    assert information['revoked'] is None
+    assert sorted(fetched) == sorted(handles + ['revoked'])
+    assert max_in_flight() == 2
+
+
+@mark.asyncio
+async def test_that_cached_information_is_reused_until_the_session_changes(monkeypatch):
+    fetched, _ = fake_core(monkeypatch)
+
+    await get_sessions_information(['h0', 'h1'], cache_ttl_seconds=60)
+    await get_sessions_information(['h0', 'h1', 'h2'], cache_ttl_seconds=60)
+    assert fetched == ['h0', 'h1', 'h2']
+
+    await revoke_session('h0')
+    await get_sessions_information(['h0', 'h1'], cache_ttl_seconds=60)
+    assert fetched == ['h0', 'h1', 'h2', 'h0']
+
+    await get_sessions_information(['h1'])
+    assert fetched == ['h0', 'h1', 'h2', 'h0', 'h1']
+
+
+@mark.asyncio
+async def test_that_signing_out_drops_the_cached_information(monkeypatch):
+    fetched, _ = fake_core(monkeypatch)
+
+    async def update_session_data(*_):
+        pass
+
+    monkeypatch.setattr(session_functions, 'update_session_data', update_session_data)
+    recipe_implementation = SessionRecipe.get_instance().recipe_implementation
+
+    await get_sessions_information(['h0', 'h1'], cache_ttl_seconds=60)
+    await Session(recipe_implementation, 'token', 'h0', 'user', {}).revoke_session()
+    await Session(recipe_implementation, 'token', 'h1', 'user', {}).update_session_data({'key': 'value'})
+    await get_sessions_information(['h0', 'h1'], cache_ttl_seconds=60)
+
+    assert fetched == ['h0', 'h1', 'h0', 'h1']
+
+
+@mark.asyncio
+async def test_that_information_cached_during_a_revocation_is_dropped(monkeypatch):
+    fetched, _ = fake_core(monkeypatch)
+
+    async def revoke(_, session_handle):
+        # a concurrent read while the core revokes the session
+        await get_sessions_information([session_handle], cache_ttl_seconds=60)
+        return True
+
+    monkeypatch.setattr(session_functions, 'revoke_session', revoke)
+
+    await revoke_session('h0')
+    await get_sessions_information(['h0'], cache_ttl_seconds=60)
+    assert fetched == ['h0', 'h0']
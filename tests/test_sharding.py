@@ -0,0 +1,94 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+import asyncio
+
+import httpx
+from pytest import mark
+
+from supertokens_python import SupertokensConfig
+from supertokens_python.normalised_url_domain import NormalisedURLDomain
+from supertokens_python.normalised_url_path import NormalisedURLPath
+from supertokens_python.querier import Querier, CoreCluster
+from supertokens_python.sharding import HashShardRouter, MappedShardRouter, core_shard_key, get_shard_key
+from tests.utils import HOST, init_querier
+
+OK = httpx.Response(200, json={'status': 'OK'})
+
+
+def init_sharded_querier(router):
+    shards = {
+        'eu': CoreCluster.from_config(SupertokensConfig('http://core-eu:3567', api_key='eu-key')),
+        'us': CoreCluster.from_config(SupertokensConfig('http://core-us:3567;http://core-us-2:3567')),
+    }
+    return init_querier(shards=shards, router=router)
+
+
+def test_that_the_hash_router_spreads_keys_and_only_moves_those_of_new_shards():
+    router = HashShardRouter()
+    keys = ['tenant-' + str(i) for i in range(1000)]
+
+    before = {key: router.get_shard(key, ['a', 'b', 'c']) for key in keys}
+    after = {key: router.get_shard(key, ['a', 'b', 'c', 'd']) for key in keys}
+
+    assert all(list(before.values()).count(shard) > 250 for shard in ['a', 'b', 'c'])
+    assert all(after[key] in (before[key], 'd') for key in keys)
+
+
+@mark.asyncio
+async def test_that_requests_go_to_the_shard_of_their_key(core):
+    querier = init_sharded_querier(MappedShardRouter({'tenant-eu': 'eu'}, 'us'))
+
+    core.outcomes = [OK] * 3
+    await querier.send_get_request(NormalisedURLPath('/recipe/user'), {})
+    with core_shard_key('tenant-eu'):
+        await querier.send_get_request(NormalisedURLPath('/recipe/user'), {})
+        with core_shard_key('tenant-us'):
+            await querier.send_post_request(NormalisedURLPath('/recipe/signup'), {})
+        assert get_shard_key() == 'tenant-eu'
+    assert get_shard_key() is None
+
+    assert [url for _, url, _ in core.calls][:2] == [HOST + '/recipe/user', 'http://core-eu:3567/recipe/user']
+    assert core.calls[2][1] in ('http://core-us:3567/recipe/signup', 'http://core-us-2:3567/recipe/signup')
+    assert Querier.get_cluster('eu').api_key == 'eu-key'
+    assert Querier.get_cluster('eu').api_version is not None
+    assert Querier.get_cluster('us').api_version is not None
+
+
+@mark.asyncio
+async def test_that_the_shard_key_follows_concurrent_tasks(core):
+    querier = init_sharded_querier(MappedShardRouter({'tenant-eu': 'eu'}, 'us'))
+    core.outcomes = [OK] * 4
+
+    async def request(tenant):
+        with core_shard_key(tenant):
+            await asyncio.sleep(0)
+            await querier.send_get_request(NormalisedURLPath('/recipe/user'), {'tenant': tenant})
+
+    await asyncio.gather(request('tenant-eu'), request('tenant-us'), request('tenant-eu'), request('tenant-us'))
+
+    hosts = sorted(url.split('/recipe')[0] for _, url, _ in core.calls)
+    assert hosts.count('http://core-eu:3567') == 2
+
+
+@mark.asyncio
+async def test_that_a_querier_can_be_pinned_to_a_cluster(core):
+    init_sharded_querier(HashShardRouter())
+    cluster = CoreCluster([NormalisedURLDomain('http://other-core:3567')])
+    querier = Querier(cluster)
+
+    core.outcomes = [OK]
+    with core_shard_key('tenant-eu'):
+        await querier.send_get_request(NormalisedURLPath('/recipe/user'), {})
+
+    assert core.calls[-1][1] == 'http://other-core:3567/recipe/user'
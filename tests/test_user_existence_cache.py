@@ -0,0 +1,136 @@
+# Copyright (c) 2021, VRAI Labs and/or its affiliates. All rights reserved.
+#
+# This software is licensed under the Apache License, Version 2.0 (the
+# "License") as published by the Apache Software Foundation.
+#
+# You may not use this file except in compliance with the License. You may
+# obtain a copy of the License at http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from pytest import mark
+
+from supertokens_python import init, SupertokensConfig, InputAppInfo, Supertokens
+from supertokens_python.recipe import emailpassword, session
+from supertokens_python.recipe.emailpassword import EmailPasswordRecipe, InputOverrideConfig, \
+    UserExistenceCacheConfig
+from supertokens_python.recipe.emailpassword.interfaces import APIOptions
+from supertokens_python.recipe.emailpassword.recipe_implementation import RecipeImplementation
+from supertokens_python.recipe.emailpassword.types import User
+from supertokens_python.recipe.session import SessionRecipe
+from supertokens_python.recipe.emailverification import EmailVerificationRecipe
+from supertokens_python.sharding import core_shard_key
+from supertokens_python.user_existence_cache import UserExistenceCache
+
+
+def setup_function(f):
+    Supertokens.reset()
+    SessionRecipe.reset()
+    EmailPasswordRecipe.reset()
+    EmailVerificationRecipe.reset()
+
+
+def teardown_function(f):
+    Supertokens.reset()
+    SessionRecipe.reset()
+    EmailPasswordRecipe.reset()
+    EmailVerificationRecipe.reset()
+
+
+@mark.asyncio
+async def test_that_email_exists_probes_are_cached():
+    lookups = []
+
+    def functions(original_implementation):
+        async def get_user_by_email(email):
+            lookups.append(email)
+            return User('id', email, 0) if email == 'a@b.com' else None
+        original_implementation.get_user_by_email = get_user_by_email
+        return original_implementation
+
+    init(
+        supertokens_config=SupertokensConfig('http://localhost:3567'),
+        app_info=InputAppInfo(
+            app_name="SuperTokens Demo",
+            api_domain="api.supertokens.io",
+            website_domain="supertokens.io"
+        ),
+        framework='fastapi',
+        recipe_list=[session.init(), emailpassword.init(override=InputOverrideConfig(functions=functions),
+                                                        user_existence_cache=UserExistenceCacheConfig())]
+    )
+    recipe = EmailPasswordRecipe.get_instance()
+    api_options = APIOptions(None, None, recipe.get_recipe_id(), recipe.config, recipe.recipe_implementation)
+
+    for _ in range(3):
+        assert (await recipe.api_implementation.email_exists_get('a@b.com', api_options)).exists
+        assert not (await recipe.api_implementation.email_exists_get('c@d.com', api_options)).exists
+
+    assert lookups == ['a@b.com', 'c@d.com']
+
+
+@mark.asyncio
+async def test_that_sign_up_and_updates_invalidate_the_cache():
+    async def send_post_request(path, data):
+        return {'status': 'OK', 'user': {'id': 'id', 'email': data['email'], 'timeJoined': 0}}
+
+    async def send_put_request(path, data):
+        return {'status': 'OK'}
+
+    cache = UserExistenceCache(UserExistenceCacheConfig(), lambda request: request.get_client_ip())
+    recipe_implementation = RecipeImplementation(
+        SimpleNamespace(send_post_request=send_post_request, send_put_request=send_put_request), cache)
+    cache.set(('email', 'new@b.com'), False)
+
+    await recipe_implementation.sign_up('new@b.com', 'password1')
+    assert cache.get(('email', 'new@b.com')) is True
+
+    await recipe_implementation.update_email_or_password('id', email='other@b.com')
+    assert cache.get(('email', 'new@b.com')) is None
+
+
+def test_that_probes_are_throttled_per_client_ip():
+    cache = UserExistenceCache(UserExistenceCacheConfig(max_probes_per_ip=2), lambda request: request.get_client_ip())
+    client = SimpleNamespace(get_client_ip=lambda: '10.0.0.1')
+    other_client = SimpleNamespace(get_client_ip=lambda: '10.0.0.2')
+    unknown_client = SimpleNamespace(get_client_ip=lambda: None)
+
+    assert [cache.is_throttled(client) for _ in range(3)] == [False, False, True]
+    assert not cache.is_throttled(other_client)
+    assert not any(cache.is_throttled(unknown_client) for _ in range(3))
+
+
+def test_that_concurrent_probes_are_all_counted():
+    cache = UserExistenceCache(UserExistenceCacheConfig(max_probes_per_ip=100), lambda request: request.get_client_ip())
+    client = SimpleNamespace(get_client_ip=lambda: '10.0.0.1')
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        throttled = list(executor.map(lambda _: cache.is_throttled(client), range(200)))
+
+    assert throttled.count(False) == 100
+
+
+def test_that_emails_are_normalised():
+    cache = UserExistenceCache(UserExistenceCacheConfig(), lambda request: request.get_client_ip())
+    cache.set(('email', ' A@B.com '), True)
+
+    assert cache.get(('email', 'a@b.com')) is True
+    assert cache.get(('phoneNumber', '+14155552671')) is None
+
+
+def test_that_entries_are_kept_per_shard_key():
+    cache = UserExistenceCache(UserExistenceCacheConfig(), lambda request: request.get_client_ip())
+    with core_shard_key('tenant1'):
+        cache.set(('email', 'a@b.com'), True)
+
+    assert cache.get(('email', 'a@b.com')) is None
+    with core_shard_key('tenant2'):
+        assert cache.get(('email', 'a@b.com')) is None
+    with core_shard_key('tenant1'):
+        assert cache.get(('email', 'a@b.com')) is True
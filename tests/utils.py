@@ -19,6 +19,7 @@ from signal import SIGTERM
 from subprocess import run, DEVNULL
 from time import sleep
 
+import httpx
 from requests.models import Response
 
 from supertokens_python.recipe.emailpassword import EmailPasswordRecipe
@@ -28,6 +29,10 @@ from supertokens_python.recipe.session import SessionRecipe
 from yaml import dump, load, FullLoader
 
 from supertokens_python import Supertokens
+from supertokens_python.constants import SUPPORTED_CDI_VERSIONS
+from supertokens_python.normalised_url_domain import NormalisedURLDomain
+from supertokens_python.querier import Querier
+from supertokens_python.retry_policy import RetryConfig
 from supertokens_python.process_state import ProcessState
 from supertokens_python.recipe.thirdparty import ThirdPartyRecipe
 from supertokens_python.recipe.thirdpartyemailpassword import ThirdPartyEmailPasswordRecipe
@@ -248,3 +253,60 @@ def email_verify_token_request(
             'sIdRefreshToken': idRefreshTokenFromCookie,
         },
         data=str.encode(userId))
+
+
+HOST = 'http://localhost:3567'
+
+
+class FakeCore:
+    """
+    Stands in for httpx.AsyncClient: answers /apiversion and /hello and plays `outcomes`
+    (responses, exceptions or coroutine functions) for the other requests.
+    """
+
+    def __init__(self):
+        self.outcomes = []
+        self.calls = []
+        self.warmed_up = []
+        self.closed = 0
+
+    def __call__(self, **kwargs):
+        return self
+
+    async def __request(self, method, url, timeout):
+        if url.endswith('/apiversion'):
+            return httpx.Response(200, json={'versions': SUPPORTED_CDI_VERSIONS})
+        if url.endswith('/hello'):
+            self.warmed_up.append(url)
+            return httpx.Response(200, content=b'Hello')
+        self.calls.append((method, url, timeout))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        if callable(outcome):
+            return await outcome()
+        return outcome
+
+    async def get(self, url, params=None, headers=None, timeout=None):
+        return await self.__request('GET', url, timeout)
+
+    async def post(self, url, content=None, headers=None, timeout=None):
+        return await self.__request('POST', url, timeout)
+
+    async def aclose(self):
+        self.closed += 1
+
+
+def read_timeout():
+    return httpx.ReadTimeout('timed out', request=httpx.Request('GET', HOST))
+
+
+def init_querier(timeouts=None, retry=None, hosts=None, hedging=None, host_provider=None, shards=None, router=None,
+                 instrumentation=None, mode=None):
+    Querier.reset()
+    hosts = [HOST] if hosts is None else hosts
+    Querier.init([NormalisedURLDomain(host) for host in hosts], timeouts=timeouts,
+                 retry=RetryConfig(base_delay_seconds=0) if retry is None else retry, hedging=hedging,
+                 host_provider=host_provider, shards=shards, router=router, instrumentation=instrumentation,
+                 mode=mode)
+    return Querier.get_instance()